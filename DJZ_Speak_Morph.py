@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+import torch
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any
+
+from .DJZ_Speak_v1 import DJZSpeak_v1
+from .djz_cache import linked_inputs_fingerprint, synthesis_fingerprint
+from .djz_engine import get_engine, render_cached
+from .djz_governor import get_governor
+from .djz_morph import CURVES, crossfade_join, morph_points, segment_positions, split_segments
+from .djz_text import normalize_text
+
+
+class DJZSpeak_Morph:
+    # Same preset table as the v1 node
+    VOICE_PRESETS = DJZSpeak_v1.VOICE_PRESETS
+
+    def __init__(self):
+        self.type = "DJZSpeak_Morph"
+        self.output_type = "AUDIO"
+        self.output_dims = 1
+        self.compatible_decorators = []
+        self.required_extensions = []
+        self.category = "Text-to-Speech"
+        self.name = "DJZ-Speak Voice Morph"
+        self.description = "Robotic text-to-speech that glides between two voice presets across the text."
+
+        self.voice_presets = self.VOICE_PRESETS
+
+        # Find eSpeak-NG executable
+        self.espeak_path = DJZSpeak_v1._find_espeak_executable()
+        self.engine = get_engine(self.espeak_path)
+        if not self.engine.available:
+            print("WARNING: eSpeak-NG not found. Please install eSpeak-NG for DJZ-Speak to work.")
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        voices = DJZSpeak_v1.INPUT_TYPES()["required"]["voice"]
+        return {
+            "required": {
+                "text": ("STRING", {"default": "I am becoming a different machine", "multiline": True}),
+                "voice_from": voices,
+                "voice_to": voices,
+                "segments": ("INT", {"default": 8, "min": 1, "max": 64, "step": 1}),
+                "curve": (list(CURVES),),
+                "morph_by": (["words", "sentences"],)
+            },
+            "optional": {
+                "crossfade_ms": ("FLOAT", {"default": 30.0, "min": 0.0, "max": 200.0, "step": 1.0}),
+                "steps": ("INT", {"default": 16, "min": 2, "max": 128, "step": 1})
+            }
+        }
+
+    RETURN_TYPES = ("AUDIO",)
+    RETURN_NAMES = ("audio",)
+    FUNCTION = "morph"
+
+    @classmethod
+    def IS_CHANGED(cls, **inputs):
+        # Inputs fed by other nodes are left out of the call
+        linked = linked_inputs_fingerprint("DJZSpeak_Morph", cls.INPUT_TYPES()["required"], inputs)
+        if linked is not None:
+            return linked
+        return cls._changed(**inputs)
+
+    @classmethod
+    def _changed(cls, text, voice_from, voice_to, segments, curve, morph_by, crossfade_ms=30.0, steps=16):
+        settings = {
+            "voice_from": voice_from, "voice_to": voice_to, "segments": segments, "curve": curve,
+            "morph_by": morph_by, "crossfade_ms": crossfade_ms, "steps": steps
+        }
+        engine = get_engine(DJZSpeak_v1._find_espeak_executable())
+        return synthesis_fingerprint("DJZSpeak_Morph", cls._spoken_text(text, voice_from), settings, None, engine.version())
+
+    @classmethod
+    def _spoken_text(cls, text, voice_from) -> str:
+        """Text as rendered: normalized with the source preset's rules (used for the fingerprint too)."""
+        source = cls.VOICE_PRESETS.get(voice_from, cls.VOICE_PRESETS["classic_robot"])
+        return normalize_text(text, source.get("text_rules"))
+
+    def morph(self, text, voice_from, voice_to, segments, curve, morph_by, crossfade_ms=30.0, steps=16):
+        print(f"DJZ-Speak morphing {voice_from} -> {voice_to}: {text[:50]}{'...' if len(text) > 50 else ''}")
+
+        if not self.engine.available:
+            raise ValueError("eSpeak-NG not found. Please install eSpeak-NG to use DJZ-Speak.")
+
+        if not text or not text.strip():
+            raise ValueError("Empty text provided for synthesis")
+
+        source = self.voice_presets.get(voice_from, self.voice_presets["classic_robot"])
+        target = self.voice_presets.get(voice_to, self.voice_presets["classic_robot"])
+
+        parts = split_segments(self._spoken_text(text, voice_from), segments, morph_by)
+        points = morph_points(source, target, segment_positions(len(parts), curve), steps)
+
+        try:
+            # Render segments concurrently; the governor still caps eSpeak-NG processes
+            with ThreadPoolExecutor(max_workers=min(len(parts), get_governor().max_concurrent)) as pool:
+                rendered = list(pool.map(self._render_point, parts, points))
+
+            # Sample rate from eSpeak-NG (typically 22050)
+            sample_rate = 22050
+            audio_data = crossfade_join(rendered, int(sample_rate * crossfade_ms / 1000.0))
+
+            audio_tensor = torch.from_numpy(audio_data).float().unsqueeze(0).unsqueeze(0)
+            result = {
+                "waveform": audio_tensor.contiguous().detach(),
+                "sample_rate": sample_rate,
+                "path": None
+            }
+
+            print(f"DJZ-Speak morph complete ({len(parts)} segments).")
+            return (result,)
+
+        except Exception as e:
+            raise ValueError(f"Voice morph failed: {str(e)}")
+
+    def _render_point(self, text: str, point: Dict[str, Any]) -> np.ndarray:
+        """Render one segment at one interpolated parameter point, reusing cached audio."""
+        cache_key = synthesis_fingerprint("DJZSpeak_Morph", text, point, None, self.engine.version())
+        return render_cached(self.engine, cache_key, point, text, label="DJZ-Speak morph")
+
+
+NODE_CLASS_MAPPINGS = {
+    "DJZSpeak_Morph": DJZSpeak_Morph
+}
+
+NODE_DISPLAY_NAME_MAPPINGS = {
+    "DJZSpeak_Morph": "DJZ-Speak Voice Morph"
+}
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+import torch
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+from .DJZ_Speak_v1 import DJZSpeak_v1
+from .djz_cache import linked_inputs_fingerprint, synthesis_fingerprint
+from .djz_engine import get_engine, render_cached
+from .djz_governor import get_governor
+from .djz_spatial import CHANNEL_LAYOUTS, channel_count, pan_gains, parse_scene, place, scene_offsets
+from .djz_text import normalize_text
+
+
+class DJZSpeak_Scene:
+    # Same preset table as the v1 node
+    VOICE_PRESETS = DJZSpeak_v1.VOICE_PRESETS
+
+    def __init__(self):
+        self.type = "DJZSpeak_Scene"
+        self.output_type = "AUDIO"
+        self.output_dims = 1
+        self.compatible_decorators = []
+        self.required_extensions = []
+        self.category = "Text-to-Speech"
+        self.name = "DJZ-Speak Scene"
+        self.description = "Multi-speaker robotic dialogue with each voice placed in a stereo or 5.1 field."
+
+        self.voice_presets = self.VOICE_PRESETS
+
+        # Find eSpeak-NG executable (DJZ_SPEAK_ENGINE=fake swaps in the offline fake engine)
+        self.espeak_path = DJZSpeak_v1._find_espeak_executable()
+        self.engine = get_engine(self.espeak_path)
+        if not self.engine.available:
+            print("WARNING: eSpeak-NG not found. Please install eSpeak-NG for DJZ-Speak to work.")
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        voices = DJZSpeak_v1.INPUT_TYPES()["required"]["voice"]
+        return {
+            "required": {
+                "script": ("STRING", {"default": "hal9000 @ -45: I'm sorry Dave.\nc3po @ 45: Oh my, that is most irregular.",
+                                      "multiline": True}),
+                "default_voice": voices,
+                "channel_layout": (list(CHANNEL_LAYOUTS), {"default": "stereo"})
+            },
+            "optional": {
+                "gap_ms": ("FLOAT", {"default": 250.0, "min": -1000.0, "max": 5000.0, "step": 10.0})
+            }
+        }
+
+    RETURN_TYPES = ("AUDIO",)
+    RETURN_NAMES = ("audio",)
+    FUNCTION = "render_scene"
+
+    @classmethod
+    def IS_CHANGED(cls, **inputs):
+        # Inputs fed by other nodes are left out of the call
+        linked = linked_inputs_fingerprint("DJZSpeak_Scene", cls.INPUT_TYPES()["required"], inputs)
+        if linked is not None:
+            return linked
+        return cls._changed(**inputs)
+
+    @classmethod
+    def _changed(cls, script, default_voice, channel_layout, gap_ms=250.0):
+        # Keyed on the parsed lines: line breaks separate speakers, so the script is never normalized as a whole
+        lines = [(voice, azimuth, normalize_text(text, cls.VOICE_PRESETS[voice].get("text_rules")))
+                 for voice, azimuth, text in parse_scene(script, cls.VOICE_PRESETS, default_voice)]
+        settings = {"lines": lines, "channel_layout": channel_layout, "gap_ms": gap_ms}
+        engine = get_engine(DJZSpeak_v1._find_espeak_executable())
+        return synthesis_fingerprint("DJZSpeak_Scene", "", settings, None, engine.version())
+
+    def render_scene(self, script, default_voice, channel_layout, gap_ms=250.0):
+        lines = parse_scene(script, self.voice_presets, default_voice)
+        print(f"DJZ-Speak scene: {len(lines)} lines, {channel_layout}")
+
+        if not self.engine.available:
+            raise ValueError("eSpeak-NG not found. Please install eSpeak-NG to use DJZ-Speak.")
+
+        if not lines:
+            raise ValueError("Empty script provided for synthesis")
+
+        try:
+            # Render lines concurrently; the governor still caps eSpeak-NG processes
+            with ThreadPoolExecutor(max_workers=min(len(lines), get_governor().max_concurrent)) as pool:
+                rendered = list(pool.map(self._render_line, [voice for voice, _, _ in lines], [text for _, _, text in lines]))
+
+            # Sample rate from eSpeak-NG (typically 22050)
+            sample_rate = 22050
+            offsets = scene_offsets([len(audio) for audio in rendered], int(sample_rate * gap_ms / 1000.0))
+            length = max(offset + len(audio) for offset, audio in zip(offsets, rendered))
+
+            # Every voice is mixed straight into the channel rows of the output tensor's storage
+            audio_tensor = torch.zeros((1, channel_count(channel_layout), length), dtype=torch.float32)
+            mix = audio_tensor[0].numpy()
+            for (_, azimuth, _), offset, audio in zip(lines, offsets, rendered):
+                place(mix, audio, pan_gains(channel_layout, azimuth), offset)
+
+            # Overlapping lines can sum past full scale
+            peak = float(np.max(np.abs(mix))) if mix.size else 0.0
+            if peak > 1.0:
+                mix *= np.float32(0.99 / peak)
+
+            result = {
+                "waveform": audio_tensor.contiguous().detach(),
+                "sample_rate": sample_rate,
+                "path": None
+            }
+
+            print(f"DJZ-Speak scene complete ({len(lines)} lines).")
+            return (result,)
+
+        except Exception as e:
+            raise ValueError(f"Scene synthesis failed: {str(e)}")
+
+    def _render_line(self, voice: str, text: str) -> np.ndarray:
+        """Render one line at its preset speed and pitch, sharing cache entries with the v1 node."""
+        voice_config = self.voice_presets[voice]
+        speed, pitch = voice_config["speed"], voice_config["pitch"]
+        return render_cached(self.engine, DJZSpeak_v1._fingerprint(self.engine, text, voice, speed, pitch),
+                             DJZSpeak_v1._voice_settings(voice, speed, pitch),
+                             normalize_text(text, voice_config.get("text_rules")), label="DJZ-Speak scene")
+
+
+NODE_CLASS_MAPPINGS = {
+    "DJZSpeak_Scene": DJZSpeak_Scene
+}
+
+NODE_DISPLAY_NAME_MAPPINGS = {
+    "DJZSpeak_Scene": "DJZ-Speak Scene"
+}
@@ -8,8 +8,256 @@ import logging
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+from .djz_cache import linked_inputs_fingerprint, synthesis_fingerprint
+from .djz_concurrency import freeze
+from .djz_engine import get_engine, render_cached
+from .djz_features import FEATURE_TYPES, extract_feature
+from .djz_server import get_client
+from .djz_text import normalize_text
+from .djz_wav import decode_wav
+
 
 class DJZSpeak_v1:
+    # Voice configurations hardcoded from DJZ-Speak (frozen: shared read-only by every thread)
+    VOICE_PRESETS = freeze({
+        "classic_robot": {
+            "name": "Classic Robot",
+            "espeak_voice": "en",
+            "speed": 140,
+            "pitch": 35,
+            "amplitude": 100,
+            "gap": 8,
+            "variant": "m3"
+        },
+        "dectalk": {
+            "name": "DECtalk Style",
+            "espeak_voice": "en",
+            "speed": 120,
+            "pitch": 25,
+            "amplitude": 95,
+            "gap": 10,
+            "variant": "m1"
+        },
+        "sbaitso": {
+            "name": "Dr. Sbaitso",
+            "espeak_voice": "en",
+            "speed": 160,
+            "pitch": 45,
+            "amplitude": 110,
+            "gap": 6,
+            "variant": "m2"
+        },
+        "hal9000": {
+            "name": "HAL 9000",
+            "espeak_voice": "en",
+            "speed": 100,
+            "pitch": 20,
+            "amplitude": 85,
+            "gap": 15,
+            "variant": "m1"
+        },
+        "c3po": {
+            "name": "C-3PO Style",
+            "espeak_voice": "en",
+            "speed": 150,
+            "pitch": 55,
+            "amplitude": 105,
+            "gap": 5,
+            "variant": "m4"
+        },
+        "vintage_computer": {
+            "name": "Vintage Computer",
+            "espeak_voice": "en",
+            "speed": 130,
+            "pitch": 40,
+            "amplitude": 100,
+            "gap": 12,
+            "variant": "m3"
+        },
+        "modern_ai": {
+            "name": "Modern AI",
+            "espeak_voice": "en",
+            "speed": 160,
+            "pitch": 42,
+            "amplitude": 95,
+            "gap": 4,
+            "variant": "m2"
+        },
+        "robotic_female": {
+            "name": "Robotic Female",
+            "espeak_voice": "en",
+            "speed": 145,
+            "pitch": 65,
+            "amplitude": 100,
+            "gap": 7,
+            "variant": "f3"
+        },
+        "terminator": {
+            "name": "Terminator",
+            "espeak_voice": "en",
+            "speed": 110,
+            "pitch": 18,
+            "amplitude": 90,
+            "gap": 12,
+            "variant": "m1"
+        },
+        "glados": {
+            "name": "GLaDOS",
+            "espeak_voice": "en",
+            "speed": 135,
+            "pitch": 50,
+            "amplitude": 95,
+            "gap": 8,
+            "variant": "f2"
+        },
+        "jarvis": {
+            "name": "JARVIS",
+            "espeak_voice": "en",
+            "speed": 155,
+            "pitch": 38,
+            "amplitude": 100,
+            "gap": 4,
+            "variant": "m2"
+        },
+        "robocop": {
+            "name": "RoboCop",
+            "espeak_voice": "en",
+            "speed": 125,
+            "pitch": 30,
+            "amplitude": 105,
+            "gap": 10,
+            "variant": "m3"
+        },
+        "wall_e": {
+            "name": "WALL-E",
+            "espeak_voice": "en",
+            "speed": 140,
+            "pitch": 60,
+            "amplitude": 110,
+            "gap": 6,
+            "variant": "m4"
+        },
+        "computer_alert": {
+            "name": "Computer Alert",
+            "espeak_voice": "en",
+            "speed": 170,
+            "pitch": 45,
+            "amplitude": 115,
+            "gap": 3,
+            "variant": "f1"
+        },
+        "navigation_system": {
+            "name": "Navigation System",
+            "espeak_voice": "en",
+            "speed": 150,
+            "pitch": 42,
+            "amplitude": 100,
+            "gap": 5,
+            "variant": "f2"
+        },
+        "diagnostics": {
+            "name": "Medical Scanner",
+            "espeak_voice": "en",
+            "speed": 130,
+            "pitch": 40,
+            "amplitude": 95,
+            "gap": 7,
+            "variant": "m2"
+        },
+        "countdown": {
+            "name": "Mission Control",
+            "espeak_voice": "en",
+            "speed": 120,
+            "pitch": 35,
+            "amplitude": 105,
+            "gap": 15,
+            "variant": "m1",
+            "text_rules": ["digits_individual"]
+        },
+        "atari_sam": {
+            "name": "Atari SAM",
+            "espeak_voice": "en",
+            "speed": 140,
+            "pitch": 50,
+            "amplitude": 110,
+            "gap": 8,
+            "variant": "m3"
+        },
+        "amiga_narrator": {
+            "name": "Amiga Narrator",
+            "espeak_voice": "en",
+            "speed": 135,
+            "pitch": 48,
+            "amplitude": 105,
+            "gap": 9,
+            "variant": "m2"
+        },
+        "apple_ii": {
+            "name": "Apple II",
+            "espeak_voice": "en",
+            "speed": 125,
+            "pitch": 45,
+            "amplitude": 100,
+            "gap": 12,
+            "variant": "m3"
+        },
+        "robotic_child": {
+            "name": "Robotic Child",
+            "espeak_voice": "en",
+            "speed": 160,
+            "pitch": 75,
+            "amplitude": 105,
+            "gap": 5,
+            "variant": "f4"
+        },
+        "robotic_elder": {
+            "name": "Robotic Elder",
+            "espeak_voice": "en",
+            "speed": 105,
+            "pitch": 28,
+            "amplitude": 90,
+            "gap": 18,
+            "variant": "m1"
+        },
+        "binary_whisper": {
+            "name": "Binary Whisper",
+            "espeak_voice": "en",
+            "speed": 180,
+            "pitch": 55,
+            "amplitude": 70,
+            "gap": 3,
+            "variant": "f3"
+        },
+        "heavy_metal": {
+            "name": "Heavy Metal",
+            "espeak_voice": "en",
+            "speed": 145,
+            "pitch": 22,
+            "amplitude": 120,
+            "gap": 6,
+            "variant": "m1"
+        },
+        "british_android": {
+            "name": "British Android",
+            "espeak_voice": "en-gb",
+            "speed": 145,
+            "pitch": 40,
+            "amplitude": 100,
+            "gap": 6,
+            "variant": "m3"
+        },
+        "space_station": {
+            "name": "Space Station",
+            "espeak_voice": "en",
+            "speed": 140,
+            "pitch": 38,
+            "amplitude": 95,
+            "gap": 8,
+            "variant": "m2"
+        }
+    })
+    
+
     def __init__(self):
         self.type = "DJZSpeak_v1"
         self.output_type = "AUDIO"
@@ -30,250 +278,17 @@ class DJZSpeak_v1:
             "binary_whisper", "heavy_metal", "british_android", "space_station"
         ]
         
-        # Voice configurations hardcoded from DJZ-Speak
-        self.voice_presets = {
-            "classic_robot": {
-                "name": "Classic Robot",
-                "espeak_voice": "en",
-                "speed": 140,
-                "pitch": 35,
-                "amplitude": 100,
-                "gap": 8,
-                "variant": "m3"
-            },
-            "dectalk": {
-                "name": "DECtalk Style",
-                "espeak_voice": "en",
-                "speed": 120,
-                "pitch": 25,
-                "amplitude": 95,
-                "gap": 10,
-                "variant": "m1"
-            },
-            "sbaitso": {
-                "name": "Dr. Sbaitso",
-                "espeak_voice": "en",
-                "speed": 160,
-                "pitch": 45,
-                "amplitude": 110,
-                "gap": 6,
-                "variant": "m2"
-            },
-            "hal9000": {
-                "name": "HAL 9000",
-                "espeak_voice": "en",
-                "speed": 100,
-                "pitch": 20,
-                "amplitude": 85,
-                "gap": 15,
-                "variant": "m1"
-            },
-            "c3po": {
-                "name": "C-3PO Style",
-                "espeak_voice": "en",
-                "speed": 150,
-                "pitch": 55,
-                "amplitude": 105,
-                "gap": 5,
-                "variant": "m4"
-            },
-            "vintage_computer": {
-                "name": "Vintage Computer",
-                "espeak_voice": "en",
-                "speed": 130,
-                "pitch": 40,
-                "amplitude": 100,
-                "gap": 12,
-                "variant": "m3"
-            },
-            "modern_ai": {
-                "name": "Modern AI",
-                "espeak_voice": "en",
-                "speed": 160,
-                "pitch": 42,
-                "amplitude": 95,
-                "gap": 4,
-                "variant": "m2"
-            },
-            "robotic_female": {
-                "name": "Robotic Female",
-                "espeak_voice": "en",
-                "speed": 145,
-                "pitch": 65,
-                "amplitude": 100,
-                "gap": 7,
-                "variant": "f3"
-            },
-            "terminator": {
-                "name": "Terminator",
-                "espeak_voice": "en",
-                "speed": 110,
-                "pitch": 18,
-                "amplitude": 90,
-                "gap": 12,
-                "variant": "m1"
-            },
-            "glados": {
-                "name": "GLaDOS",
-                "espeak_voice": "en",
-                "speed": 135,
-                "pitch": 50,
-                "amplitude": 95,
-                "gap": 8,
-                "variant": "f2"
-            },
-            "jarvis": {
-                "name": "JARVIS",
-                "espeak_voice": "en",
-                "speed": 155,
-                "pitch": 38,
-                "amplitude": 100,
-                "gap": 4,
-                "variant": "m2"
-            },
-            "robocop": {
-                "name": "RoboCop",
-                "espeak_voice": "en",
-                "speed": 125,
-                "pitch": 30,
-                "amplitude": 105,
-                "gap": 10,
-                "variant": "m3"
-            },
-            "wall_e": {
-                "name": "WALL-E",
-                "espeak_voice": "en",
-                "speed": 140,
-                "pitch": 60,
-                "amplitude": 110,
-                "gap": 6,
-                "variant": "m4"
-            },
-            "computer_alert": {
-                "name": "Computer Alert",
-                "espeak_voice": "en",
-                "speed": 170,
-                "pitch": 45,
-                "amplitude": 115,
-                "gap": 3,
-                "variant": "f1"
-            },
-            "navigation_system": {
-                "name": "Navigation System",
-                "espeak_voice": "en",
-                "speed": 150,
-                "pitch": 42,
-                "amplitude": 100,
-                "gap": 5,
-                "variant": "f2"
-            },
-            "diagnostics": {
-                "name": "Medical Scanner",
-                "espeak_voice": "en",
-                "speed": 130,
-                "pitch": 40,
-                "amplitude": 95,
-                "gap": 7,
-                "variant": "m2"
-            },
-            "countdown": {
-                "name": "Mission Control",
-                "espeak_voice": "en",
-                "speed": 120,
-                "pitch": 35,
-                "amplitude": 105,
-                "gap": 15,
-                "variant": "m1"
-            },
-            "atari_sam": {
-                "name": "Atari SAM",
-                "espeak_voice": "en",
-                "speed": 140,
-                "pitch": 50,
-                "amplitude": 110,
-                "gap": 8,
-                "variant": "m3"
-            },
-            "amiga_narrator": {
-                "name": "Amiga Narrator",
-                "espeak_voice": "en",
-                "speed": 135,
-                "pitch": 48,
-                "amplitude": 105,
-                "gap": 9,
-                "variant": "m2"
-            },
-            "apple_ii": {
-                "name": "Apple II",
-                "espeak_voice": "en",
-                "speed": 125,
-                "pitch": 45,
-                "amplitude": 100,
-                "gap": 12,
-                "variant": "m3"
-            },
-            "robotic_child": {
-                "name": "Robotic Child",
-                "espeak_voice": "en",
-                "speed": 160,
-                "pitch": 75,
-                "amplitude": 105,
-                "gap": 5,
-                "variant": "f4"
-            },
-            "robotic_elder": {
-                "name": "Robotic Elder",
-                "espeak_voice": "en",
-                "speed": 105,
-                "pitch": 28,
-                "amplitude": 90,
-                "gap": 18,
-                "variant": "m1"
-            },
-            "binary_whisper": {
-                "name": "Binary Whisper",
-                "espeak_voice": "en",
-                "speed": 180,
-                "pitch": 55,
-                "amplitude": 70,
-                "gap": 3,
-                "variant": "f3"
-            },
-            "heavy_metal": {
-                "name": "Heavy Metal",
-                "espeak_voice": "en",
-                "speed": 145,
-                "pitch": 22,
-                "amplitude": 120,
-                "gap": 6,
-                "variant": "m1"
-            },
-            "british_android": {
-                "name": "British Android",
-                "espeak_voice": "en-gb",
-                "speed": 145,
-                "pitch": 40,
-                "amplitude": 100,
-                "gap": 6,
-                "variant": "m3"
-            },
-            "space_station": {
-                "name": "Space Station",
-                "espeak_voice": "en",
-                "speed": 140,
-                "pitch": 38,
-                "amplitude": 95,
-                "gap": 8,
-                "variant": "m2"
-            }
-        }
+        # Voice configurations are shared at class level so IS_CHANGED can resolve presets
+        self.voice_presets = self.VOICE_PRESETS
         
-        # Find eSpeak-NG executable
+        # Find eSpeak-NG executable (DJZ_SPEAK_ENGINE=fake swaps in the offline fake engine)
         self.espeak_path = self._find_espeak_executable()
-        if not self.espeak_path:
+        self.engine = get_engine(self.espeak_path)
+        if not self.engine.available:
             print("WARNING: eSpeak-NG not found. Please install eSpeak-NG for DJZ-Speak to work.")
 
-    def _find_espeak_executable(self) -> Optional[str]:
+    @staticmethod
+    def _find_espeak_executable() -> Optional[str]:
         """Find eSpeak-NG executable."""
         import shutil
         
@@ -314,18 +329,58 @@ class DJZSpeak_v1:
                           "binary_whisper", "heavy_metal", "british_android", "space_station"],),
                 "speed": ("INT", {"default": 140, "min": 80, "max": 300, "step": 1}),
                 "pitch": ("INT", {"default": 35, "min": 0, "max": 99, "step": 1})
+            },
+            "optional": {
+                "feature_type": (FEATURE_TYPES,),
+                "feature_fps": ("FLOAT", {"default": 30.0, "min": 1.0, "max": 120.0, "step": 1.0}),
+                "feature_frames": ("INT", {"default": 0, "min": 0, "max": 100000, "step": 1}),
+                "feature_width": ("INT", {"default": 512, "min": 64, "max": 4096, "step": 8}),
+                "feature_height": ("INT", {"default": 512, "min": 64, "max": 4096, "step": 8})
             }
         }
 
-    RETURN_TYPES = ("AUDIO",)
-    RETURN_NAMES = ("audio",)
+    RETURN_TYPES = ("AUDIO", "FEATURE", "INT")
+    RETURN_NAMES = ("audio", "feature", "frame_count")
     FUNCTION = "synthesize"
 
-    def synthesize(self, text, voice, speed, pitch):
+    @classmethod
+    def IS_CHANGED(cls, **inputs):
+        # Inputs fed by other nodes are left out of the call
+        linked = linked_inputs_fingerprint("DJZSpeak_v1", cls.INPUT_TYPES()["required"], inputs)
+        if linked is not None:
+            return linked
+        return cls._changed(**inputs)
+
+    @classmethod
+    def _changed(cls, text, voice, speed, pitch, **kwargs):
+        return cls._fingerprint(get_engine(cls._find_espeak_executable()), text, voice, speed, pitch)
+
+    @classmethod
+    def _voice_settings(cls, voice, speed, pitch) -> Dict[str, Any]:
+        """Engine parameters for a preset with the user's speed and pitch."""
+        voice_config = cls.VOICE_PRESETS.get(voice, cls.VOICE_PRESETS["classic_robot"])
+        return {
+            "espeak_voice": voice_config['espeak_voice'],
+            "variant": voice_config['variant'],
+            "amplitude": voice_config['amplitude'],
+            "gap": voice_config['gap'],
+            "speed": speed,
+            "pitch": pitch
+        }
+
+    @classmethod
+    def _fingerprint(cls, engine, text, voice, speed, pitch) -> str:
+        """Stable cache key from normalized text, resolved preset values and the engine version."""
+        voice_config = cls.VOICE_PRESETS.get(voice, cls.VOICE_PRESETS["classic_robot"])
+        return synthesis_fingerprint("DJZSpeak_v1", normalize_text(text, voice_config.get("text_rules")),
+                                     cls._voice_settings(voice, speed, pitch), None, engine.version())
+
+    def synthesize(self, text, voice, speed, pitch, feature_type="rms_energy", feature_fps=30.0, feature_frames=0, feature_width=512, feature_height=512):
         print(f"DJZ-Speak synthesizing: {text[:50]}{'...' if len(text) > 50 else ''}")
         print(f"Using voice: {voice} at speed: {speed}, pitch: {pitch}")
         
-        if not self.espeak_path:
+        # A configured synthesis service can render without a local eSpeak-NG
+        if not self.engine.available and get_client() is None:
             raise ValueError("eSpeak-NG not found. Please install eSpeak-NG to use DJZ-Speak.")
         
         if not text or not text.strip():
@@ -334,39 +389,21 @@ class DJZSpeak_v1:
         # Get voice configuration
         voice_config = self.voice_presets.get(voice, self.voice_presets["classic_robot"])
         
-        # Override speed and pitch with user parameters
-        actual_speed = speed
-        actual_pitch = pitch
+        client = get_client()
         
         try:
-            # Build eSpeak-NG command
-            cmd = [
-                self.espeak_path,
-                '-v', f"{voice_config['espeak_voice']}+{voice_config['variant']}",
-                '-s', str(actual_speed),
-                '-p', str(actual_pitch),
-                '-a', str(voice_config['amplitude']),
-                '-g', str(voice_config['gap']),
-                '--stdout'
-            ]
-            
-            # Add text as argument
-            cmd.append(text.strip())
-            
-            # Execute eSpeak-NG
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                timeout=30,
-                check=True
+            # Reuse audio rendered by an earlier prompt (or an earlier server run), else delegate
+            # to the shared synthesis service, falling back to local eSpeak-NG if it is down
+            audio_data = render_cached(
+                self.engine,
+                self._fingerprint(self.engine, text, voice, speed, pitch),
+                self._voice_settings(voice, speed, pitch),
+                normalize_text(text, voice_config.get("text_rules")),
+                remote=(lambda: self._synthesize_remote(client, text, voice, speed, pitch)) if client is not None else None,
+                decode=self._wav_bytes_to_numpy,
+                writable=True
             )
             
-            if not result.stdout:
-                raise ValueError("eSpeak-NG produced no audio output")
-            
-            # Convert WAV bytes to numpy array
-            audio_data = self._wav_bytes_to_numpy(result.stdout)
-            
             # Convert to torch tensor with ComfyUI format
             if audio_data.ndim == 1:
                 # Mono audio - add batch and channel dimensions
@@ -384,8 +421,12 @@ class DJZSpeak_v1:
                 "path": None
             }
             
+            # Per-video-frame envelope for animation nodes, taken from the final waveform
+            feature = extract_feature(audio_data, sample_rate, feature_type, feature_fps, feature_frames,
+                                      feature_width, feature_height)
+            
             print("DJZ-Speak synthesis complete.")
-            return (result,)
+            return (result, feature, feature.frame_count)
             
         except subprocess.TimeoutExpired:
             raise ValueError("eSpeak-NG synthesis timed out")
@@ -397,57 +438,31 @@ class DJZSpeak_v1:
         except Exception as e:
             raise ValueError(f"TTS synthesis failed: {str(e)}")
 
+    def _synthesize_remote(self, client, text, voice, speed, pitch) -> Optional[np.ndarray]:
+        """Render on the DJZ-Speak service, or None if it cannot be reached."""
+        try:
+            audio, _ = client.synthesize("v1", text=text, voice=voice, speed=speed, pitch=pitch)
+        except ConnectionError as e:
+            print(f"Warning: {e}, synthesizing locally")
+            return None
+        return np.array(audio[0] if audio.shape[0] == 1 else audio)
+
     def _wav_bytes_to_numpy(self, wav_bytes: bytes) -> np.ndarray:
         """Convert WAV bytes to numpy array."""
         try:
-            import io
-            import wave
-            
-            # Create a BytesIO object from the WAV bytes
-            wav_io = io.BytesIO(wav_bytes)
+            # Parse the header in place and convert the PCM view to float32 in one pass
+            return decode_wav(wav_bytes)
             
-            # Open as WAV file
-            with wave.open(wav_io, 'rb') as wav_file:
-                # Get audio parameters
-                frames = wav_file.getnframes()
-                sample_width = wav_file.getsampwidth()
-                channels = wav_file.getnchannels()
-                
-                # Read audio data
-                audio_bytes = wav_file.readframes(frames)
-                
-                # Convert to numpy array based on sample width
-                if sample_width == 1:
-                    # 8-bit audio
-                    audio_array = np.frombuffer(audio_bytes, dtype=np.uint8)
-                    audio_array = (audio_array.astype(np.float32) - 128) / 128.0
-                elif sample_width == 2:
-                    # 16-bit audio
-                    audio_array = np.frombuffer(audio_bytes, dtype=np.int16)
-                    audio_array = audio_array.astype(np.float32) / 32768.0
-                elif sample_width == 4:
-                    # 32-bit audio
-                    audio_array = np.frombuffer(audio_bytes, dtype=np.int32)
-                    audio_array = audio_array.astype(np.float32) / 2147483648.0
-                else:
-                    raise ValueError(f"Unsupported sample width: {sample_width}")
-                
-                # Reshape for multi-channel audio
-                if channels > 1:
-                    audio_array = audio_array.reshape(-1, channels)
-                    # Convert to mono by averaging channels
-                    audio_array = np.mean(audio_array, axis=1)
-                
-                return audio_array
-                
-        except Exception as e:
-            # Fallback: try using soundfile if available
+        except ValueError as e:
+            # Fallback for sample formats the header parser does not handle
             try:
                 import soundfile as sf
                 import io
                 
-                audio_array, _ = sf.read(io.BytesIO(wav_bytes))
-                return audio_array.astype(np.float32)
+                audio_array, _ = sf.read(io.BytesIO(wav_bytes), dtype='float32')
+                if audio_array.ndim > 1:
+                    audio_array = np.mean(audio_array, axis=1)
+                return audio_array
             except ImportError:
                 raise ValueError(f"Failed to decode WAV audio: {e}. Please install soundfile: pip install soundfile")
             except Exception as e2:
@@ -8,8 +8,267 @@ import logging
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+from .djz_cache import linked_inputs_fingerprint, synthesis_fingerprint
+from .djz_concurrency import freeze
+from .djz_effects import effect_plan
+from .djz_engine import get_engine, render_cached
+from .djz_features import FEATURE_TYPES, EnvelopeTracker, envelope_tracker, extract_feature
+from .djz_server import get_client
+from .djz_spatial import CHANNEL_LAYOUTS, channel_count, spatialize
+from .djz_text import normalize_text
+from .djz_wav import decode_wav
+
 
 class DJZSpeak_v2:
+    # Voice configurations hardcoded from DJZ-Speak (frozen: shared read-only by every thread)
+    VOICE_PRESETS = freeze({
+        "classic_robot": {
+            "name": "Classic Robot",
+            "espeak_voice": "en",
+            "speed": 140,
+            "pitch": 35,
+            "amplitude": 100,
+            "gap": 8,
+            "variant": "m3"
+        },
+        "dectalk": {
+            "name": "DECtalk Style",
+            "espeak_voice": "en",
+            "speed": 120,
+            "pitch": 25,
+            "amplitude": 95,
+            "gap": 10,
+            "variant": "m1"
+        },
+        "sbaitso": {
+            "name": "Dr. Sbaitso",
+            "espeak_voice": "en",
+            "speed": 160,
+            "pitch": 45,
+            "amplitude": 110,
+            "gap": 6,
+            "variant": "m2",
+            "filter_profile": {"bands": [(400, 3400, 1.0)], "taps": 255}
+        },
+        "hal9000": {
+            "name": "HAL 9000",
+            "espeak_voice": "en",
+            "speed": 100,
+            "pitch": 20,
+            "amplitude": 85,
+            "gap": 15,
+            "variant": "m1",
+            "filter_profile": {"bands": [(80, 6000, 1.0)], "taps": 511}
+        },
+        "c3po": {
+            "name": "C-3PO Style",
+            "espeak_voice": "en",
+            "speed": 150,
+            "pitch": 55,
+            "amplitude": 105,
+            "gap": 5,
+            "variant": "m4"
+        },
+        "vintage_computer": {
+            "name": "Vintage Computer",
+            "espeak_voice": "en",
+            "speed": 130,
+            "pitch": 40,
+            "amplitude": 100,
+            "gap": 12,
+            "variant": "m3",
+            "filter_profile": {"bands": [(300, 3000, 1.0)], "taps": 255}
+        },
+        "modern_ai": {
+            "name": "Modern AI",
+            "espeak_voice": "en",
+            "speed": 160,
+            "pitch": 42,
+            "amplitude": 95,
+            "gap": 4,
+            "variant": "m2"
+        },
+        "robotic_female": {
+            "name": "Robotic Female",
+            "espeak_voice": "en",
+            "speed": 145,
+            "pitch": 65,
+            "amplitude": 100,
+            "gap": 7,
+            "variant": "f3"
+        },
+        "terminator": {
+            "name": "Terminator",
+            "espeak_voice": "en",
+            "speed": 110,
+            "pitch": 18,
+            "amplitude": 90,
+            "gap": 12,
+            "variant": "m1"
+        },
+        "glados": {
+            "name": "GLaDOS",
+            "espeak_voice": "en",
+            "speed": 135,
+            "pitch": 50,
+            "amplitude": 95,
+            "gap": 8,
+            "variant": "f2"
+        },
+        "jarvis": {
+            "name": "JARVIS",
+            "espeak_voice": "en",
+            "speed": 155,
+            "pitch": 38,
+            "amplitude": 100,
+            "gap": 4,
+            "variant": "m2"
+        },
+        "robocop": {
+            "name": "RoboCop",
+            "espeak_voice": "en",
+            "speed": 125,
+            "pitch": 30,
+            "amplitude": 105,
+            "gap": 10,
+            "variant": "m3"
+        },
+        "wall_e": {
+            "name": "WALL-E",
+            "espeak_voice": "en",
+            "speed": 140,
+            "pitch": 60,
+            "amplitude": 110,
+            "gap": 6,
+            "variant": "m4"
+        },
+        "computer_alert": {
+            "name": "Computer Alert",
+            "espeak_voice": "en",
+            "speed": 170,
+            "pitch": 45,
+            "amplitude": 115,
+            "gap": 3,
+            "variant": "f1"
+        },
+        "navigation_system": {
+            "name": "Navigation System",
+            "espeak_voice": "en",
+            "speed": 150,
+            "pitch": 42,
+            "amplitude": 100,
+            "gap": 5,
+            "variant": "f2"
+        },
+        "diagnostics": {
+            "name": "Medical Scanner",
+            "espeak_voice": "en",
+            "speed": 130,
+            "pitch": 40,
+            "amplitude": 95,
+            "gap": 7,
+            "variant": "m2"
+        },
+        "countdown": {
+            "name": "Mission Control",
+            "espeak_voice": "en",
+            "speed": 120,
+            "pitch": 35,
+            "amplitude": 105,
+            "gap": 15,
+            "variant": "m1",
+            "text_rules": ["digits_individual"]
+        },
+        "atari_sam": {
+            "name": "Atari SAM",
+            "espeak_voice": "en",
+            "speed": 140,
+            "pitch": 50,
+            "amplitude": 110,
+            "gap": 8,
+            "variant": "m3",
+            "filter_profile": {"bands": [(400, 2800, 1.0), (1800, 2600, 0.5)], "taps": 255}
+        },
+        "amiga_narrator": {
+            "name": "Amiga Narrator",
+            "espeak_voice": "en",
+            "speed": 135,
+            "pitch": 48,
+            "amplitude": 105,
+            "gap": 9,
+            "variant": "m2",
+            "filter_profile": {"bands": [(200, 4000, 1.0)], "taps": 255}
+        },
+        "apple_ii": {
+            "name": "Apple II",
+            "espeak_voice": "en",
+            "speed": 125,
+            "pitch": 45,
+            "amplitude": 100,
+            "gap": 12,
+            "variant": "m3",
+            "filter_profile": {"bands": [(500, 2500, 1.0)], "taps": 255}
+        },
+        "robotic_child": {
+            "name": "Robotic Child",
+            "espeak_voice": "en",
+            "speed": 160,
+            "pitch": 75,
+            "amplitude": 105,
+            "gap": 5,
+            "variant": "f4"
+        },
+        "robotic_elder": {
+            "name": "Robotic Elder",
+            "espeak_voice": "en",
+            "speed": 105,
+            "pitch": 28,
+            "amplitude": 90,
+            "gap": 18,
+            "variant": "m1"
+        },
+        "binary_whisper": {
+            "name": "Binary Whisper",
+            "espeak_voice": "en",
+            "speed": 180,
+            "pitch": 55,
+            "amplitude": 70,
+            "gap": 3,
+            "variant": "f3",
+            "filter_profile": {"bands": [(1000, 7000, 1.0)], "taps": 255}
+        },
+        "heavy_metal": {
+            "name": "Heavy Metal",
+            "espeak_voice": "en",
+            "speed": 145,
+            "pitch": 22,
+            "amplitude": 120,
+            "gap": 6,
+            "variant": "m1",
+            "filter_profile": {"bands": [(120, 2500, 1.0), (600, 1200, 0.6)], "taps": 511}
+        },
+        "british_android": {
+            "name": "British Android",
+            "espeak_voice": "en-gb",
+            "speed": 145,
+            "pitch": 40,
+            "amplitude": 100,
+            "gap": 6,
+            "variant": "m3"
+        },
+        "space_station": {
+            "name": "Space Station",
+            "espeak_voice": "en",
+            "speed": 140,
+            "pitch": 38,
+            "amplitude": 95,
+            "gap": 8,
+            "variant": "m2",
+            "filter_profile": {"bands": [(250, 3400, 1.0)], "taps": 255}
+        }
+    })
+    
+
     def __init__(self):
         self.type = "DJZSpeak_v2"
         self.output_type = "AUDIO"
@@ -30,250 +289,17 @@ class DJZSpeak_v2:
             "binary_whisper", "heavy_metal", "british_android", "space_station"
         ]
         
-        # Voice configurations hardcoded from DJZ-Speak
-        self.voice_presets = {
-            "classic_robot": {
-                "name": "Classic Robot",
-                "espeak_voice": "en",
-                "speed": 140,
-                "pitch": 35,
-                "amplitude": 100,
-                "gap": 8,
-                "variant": "m3"
-            },
-            "dectalk": {
-                "name": "DECtalk Style",
-                "espeak_voice": "en",
-                "speed": 120,
-                "pitch": 25,
-                "amplitude": 95,
-                "gap": 10,
-                "variant": "m1"
-            },
-            "sbaitso": {
-                "name": "Dr. Sbaitso",
-                "espeak_voice": "en",
-                "speed": 160,
-                "pitch": 45,
-                "amplitude": 110,
-                "gap": 6,
-                "variant": "m2"
-            },
-            "hal9000": {
-                "name": "HAL 9000",
-                "espeak_voice": "en",
-                "speed": 100,
-                "pitch": 20,
-                "amplitude": 85,
-                "gap": 15,
-                "variant": "m1"
-            },
-            "c3po": {
-                "name": "C-3PO Style",
-                "espeak_voice": "en",
-                "speed": 150,
-                "pitch": 55,
-                "amplitude": 105,
-                "gap": 5,
-                "variant": "m4"
-            },
-            "vintage_computer": {
-                "name": "Vintage Computer",
-                "espeak_voice": "en",
-                "speed": 130,
-                "pitch": 40,
-                "amplitude": 100,
-                "gap": 12,
-                "variant": "m3"
-            },
-            "modern_ai": {
-                "name": "Modern AI",
-                "espeak_voice": "en",
-                "speed": 160,
-                "pitch": 42,
-                "amplitude": 95,
-                "gap": 4,
-                "variant": "m2"
-            },
-            "robotic_female": {
-                "name": "Robotic Female",
-                "espeak_voice": "en",
-                "speed": 145,
-                "pitch": 65,
-                "amplitude": 100,
-                "gap": 7,
-                "variant": "f3"
-            },
-            "terminator": {
-                "name": "Terminator",
-                "espeak_voice": "en",
-                "speed": 110,
-                "pitch": 18,
-                "amplitude": 90,
-                "gap": 12,
-                "variant": "m1"
-            },
-            "glados": {
-                "name": "GLaDOS",
-                "espeak_voice": "en",
-                "speed": 135,
-                "pitch": 50,
-                "amplitude": 95,
-                "gap": 8,
-                "variant": "f2"
-            },
-            "jarvis": {
-                "name": "JARVIS",
-                "espeak_voice": "en",
-                "speed": 155,
-                "pitch": 38,
-                "amplitude": 100,
-                "gap": 4,
-                "variant": "m2"
-            },
-            "robocop": {
-                "name": "RoboCop",
-                "espeak_voice": "en",
-                "speed": 125,
-                "pitch": 30,
-                "amplitude": 105,
-                "gap": 10,
-                "variant": "m3"
-            },
-            "wall_e": {
-                "name": "WALL-E",
-                "espeak_voice": "en",
-                "speed": 140,
-                "pitch": 60,
-                "amplitude": 110,
-                "gap": 6,
-                "variant": "m4"
-            },
-            "computer_alert": {
-                "name": "Computer Alert",
-                "espeak_voice": "en",
-                "speed": 170,
-                "pitch": 45,
-                "amplitude": 115,
-                "gap": 3,
-                "variant": "f1"
-            },
-            "navigation_system": {
-                "name": "Navigation System",
-                "espeak_voice": "en",
-                "speed": 150,
-                "pitch": 42,
-                "amplitude": 100,
-                "gap": 5,
-                "variant": "f2"
-            },
-            "diagnostics": {
-                "name": "Medical Scanner",
-                "espeak_voice": "en",
-                "speed": 130,
-                "pitch": 40,
-                "amplitude": 95,
-                "gap": 7,
-                "variant": "m2"
-            },
-            "countdown": {
-                "name": "Mission Control",
-                "espeak_voice": "en",
-                "speed": 120,
-                "pitch": 35,
-                "amplitude": 105,
-                "gap": 15,
-                "variant": "m1"
-            },
-            "atari_sam": {
-                "name": "Atari SAM",
-                "espeak_voice": "en",
-                "speed": 140,
-                "pitch": 50,
-                "amplitude": 110,
-                "gap": 8,
-                "variant": "m3"
-            },
-            "amiga_narrator": {
-                "name": "Amiga Narrator",
-                "espeak_voice": "en",
-                "speed": 135,
-                "pitch": 48,
-                "amplitude": 105,
-                "gap": 9,
-                "variant": "m2"
-            },
-            "apple_ii": {
-                "name": "Apple II",
-                "espeak_voice": "en",
-                "speed": 125,
-                "pitch": 45,
-                "amplitude": 100,
-                "gap": 12,
-                "variant": "m3"
-            },
-            "robotic_child": {
-                "name": "Robotic Child",
-                "espeak_voice": "en",
-                "speed": 160,
-                "pitch": 75,
-                "amplitude": 105,
-                "gap": 5,
-                "variant": "f4"
-            },
-            "robotic_elder": {
-                "name": "Robotic Elder",
-                "espeak_voice": "en",
-                "speed": 105,
-                "pitch": 28,
-                "amplitude": 90,
-                "gap": 18,
-                "variant": "m1"
-            },
-            "binary_whisper": {
-                "name": "Binary Whisper",
-                "espeak_voice": "en",
-                "speed": 180,
-                "pitch": 55,
-                "amplitude": 70,
-                "gap": 3,
-                "variant": "f3"
-            },
-            "heavy_metal": {
-                "name": "Heavy Metal",
-                "espeak_voice": "en",
-                "speed": 145,
-                "pitch": 22,
-                "amplitude": 120,
-                "gap": 6,
-                "variant": "m1"
-            },
-            "british_android": {
-                "name": "British Android",
-                "espeak_voice": "en-gb",
-                "speed": 145,
-                "pitch": 40,
-                "amplitude": 100,
-                "gap": 6,
-                "variant": "m3"
-            },
-            "space_station": {
-                "name": "Space Station",
-                "espeak_voice": "en",
-                "speed": 140,
-                "pitch": 38,
-                "amplitude": 95,
-                "gap": 8,
-                "variant": "m2"
-            }
-        }
+        # Voice configurations are shared at class level so IS_CHANGED can resolve presets
+        self.voice_presets = self.VOICE_PRESETS
         
-        # Find eSpeak-NG executable
+        # Find eSpeak-NG executable (DJZ_SPEAK_ENGINE=fake swaps in the offline fake engine)
         self.espeak_path = self._find_espeak_executable()
-        if not self.espeak_path:
+        self.engine = get_engine(self.espeak_path)
+        if not self.engine.available:
             print("WARNING: eSpeak-NG not found. Please install eSpeak-NG for DJZ-Speak to work.")
 
-    def _find_espeak_executable(self) -> Optional[str]:
+    @staticmethod
+    def _find_espeak_executable() -> Optional[str]:
         """Find eSpeak-NG executable."""
         import shutil
         
@@ -319,21 +345,80 @@ class DJZSpeak_v2:
             "optional": {
                 "effect_intensity": ("FLOAT", {"default": 1.0, "min": 0.5, "max": 2.0, "step": 0.1}),
                 "frequency_filter": ("BOOLEAN", {"default": True}),
-                "harmonic_boost": ("FLOAT", {"default": 1.2, "min": 1.0, "max": 2.0, "step": 0.1})
+                "harmonic_boost": ("FLOAT", {"default": 1.2, "min": 1.0, "max": 2.0, "step": 0.1}),
+                "target_loudness": ("FLOAT", {"default": -20.0, "min": -36.0, "max": -10.0, "step": 0.5}),
+                "channel_layout": (list(CHANNEL_LAYOUTS),),
+                "pan": ("FLOAT", {"default": 0.0, "min": -180.0, "max": 180.0, "step": 1.0}),
+                "feature_type": (FEATURE_TYPES,),
+                "feature_fps": ("FLOAT", {"default": 30.0, "min": 1.0, "max": 120.0, "step": 1.0}),
+                "feature_frames": ("INT", {"default": 0, "min": 0, "max": 100000, "step": 1}),
+                "feature_width": ("INT", {"default": 512, "min": 64, "max": 4096, "step": 8}),
+                "feature_height": ("INT", {"default": 512, "min": 64, "max": 4096, "step": 8})
             }
         }
 
-    RETURN_TYPES = ("AUDIO",)
-    RETURN_NAMES = ("audio",)
+    RETURN_TYPES = ("AUDIO", "FEATURE", "INT")
+    RETURN_NAMES = ("audio", "feature", "frame_count")
     FUNCTION = "synthesize"
 
-    def synthesize(self, text, voice, speed, pitch, effects, effect_intensity=1.0, frequency_filter=True, harmonic_boost=1.2):
+    @classmethod
+    def IS_CHANGED(cls, **inputs):
+        # Inputs fed by other nodes are left out of the call
+        linked = linked_inputs_fingerprint("DJZSpeak_v2", cls.INPUT_TYPES()["required"], inputs)
+        if linked is not None:
+            return linked
+        return cls._changed(**inputs)
+
+    @classmethod
+    def _changed(cls, text, voice, speed, pitch, effects, effect_intensity=1.0, frequency_filter=True, harmonic_boost=1.2,
+                 target_loudness=-20.0, channel_layout="mono", pan=0.0, **kwargs):
+        fingerprint = cls._fingerprint(get_engine(cls._find_espeak_executable()), text, voice, speed, pitch, effects,
+                                       effect_intensity, frequency_filter, harmonic_boost, target_loudness)
+        # Panning happens after the cache (which holds the mono voice), so it only tags the result
+        if channel_layout != "mono":
+            fingerprint += f":{channel_layout}@{float(pan):g}"
+        return fingerprint
+
+    @classmethod
+    def _voice_settings(cls, voice, speed, pitch) -> Dict[str, Any]:
+        """Engine parameters for a preset with the user's speed and pitch."""
+        voice_config = cls.VOICE_PRESETS.get(voice, cls.VOICE_PRESETS["classic_robot"])
+        return {
+            "espeak_voice": voice_config['espeak_voice'],
+            "variant": voice_config['variant'],
+            "amplitude": voice_config['amplitude'],
+            "gap": voice_config['gap'],
+            "speed": speed,
+            "pitch": pitch
+        }
+
+    @classmethod
+    def _fingerprint(cls, engine, text, voice, speed, pitch, effects, effect_intensity, frequency_filter,
+                     harmonic_boost, target_loudness) -> str:
+        """Stable cache key from normalized text, resolved preset values, effect settings and the engine version."""
+        voice_config = cls.VOICE_PRESETS.get(voice, cls.VOICE_PRESETS["classic_robot"])
+        voice_settings = cls._voice_settings(voice, speed, pitch)
+        effect_settings = None
+        if effects:
+            effect_settings = {
+                "intensity": round(float(effect_intensity), 4),
+                "frequency_filter": bool(frequency_filter),
+                "filter_profile": voice_config.get("filter_profile") if frequency_filter else None,
+                "harmonic_boost": round(float(harmonic_boost), 4),
+                "target_loudness": round(float(target_loudness), 4)
+            }
+        return synthesis_fingerprint("DJZSpeak_v2", normalize_text(text, voice_config.get("text_rules")), voice_settings, effect_settings,
+                                     engine.version())
+
+    def synthesize(self, text, voice, speed, pitch, effects, effect_intensity=1.0, frequency_filter=True, harmonic_boost=1.2, target_loudness=-20.0,
+                   channel_layout="mono", pan=0.0, feature_type="rms_energy", feature_fps=30.0, feature_frames=0, feature_width=512, feature_height=512):
         print(f"DJZ-Speak v2 synthesizing: {text[:50]}{'...' if len(text) > 50 else ''}")
         print(f"Using voice: {voice} at speed: {speed}, pitch: {pitch}")
         if effects:
             print(f"Effects enabled - intensity: {effect_intensity}, filter: {frequency_filter}, harmonic: {harmonic_boost}")
         
-        if not self.espeak_path:
+        # A configured synthesis service can render without a local eSpeak-NG
+        if not self.engine.available and get_client() is None:
             raise ValueError("eSpeak-NG not found. Please install eSpeak-NG to use DJZ-Speak.")
         
         if not text or not text.strip():
@@ -342,50 +427,52 @@ class DJZSpeak_v2:
         # Get voice configuration
         voice_config = self.voice_presets.get(voice, self.voice_presets["classic_robot"])
         
-        # Override speed and pitch with user parameters
-        actual_speed = speed
-        actual_pitch = pitch
+        client = get_client()
+        tracker = None
+        
+        def add_effects(audio_data):
+            # Cheap feature envelopes are collected block by block inside the effects pass
+            nonlocal tracker
+            tracker = envelope_tracker(feature_type, len(audio_data), 22050, feature_fps, feature_frames)
+            processed = self._apply_robotic_effects(
+                audio_data, 
+                effect_intensity, 
+                frequency_filter, 
+                harmonic_boost,
+                target_loudness,
+                filter_profile=voice_config.get("filter_profile"),
+                tracker=tracker
+            )
+            # A failed effects pass hands back the dry input, which must not be cached as effects output
+            return processed, processed is not audio_data
+        
+        def remote():
+            return self._synthesize_remote(client, text, voice, speed, pitch, effects, effect_intensity,
+                                           frequency_filter, harmonic_boost, target_loudness)
         
         try:
-            # Build eSpeak-NG command
-            cmd = [
-                self.espeak_path,
-                '-v', f"{voice_config['espeak_voice']}+{voice_config['variant']}",
-                '-s', str(actual_speed),
-                '-p', str(actual_pitch),
-                '-a', str(voice_config['amplitude']),
-                '-g', str(voice_config['gap']),
-                '--stdout'
-            ]
-            
-            # Add text as argument
-            cmd.append(text.strip())
-            
-            # Execute eSpeak-NG
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                timeout=30,
-                check=True
+            # Reuse audio rendered by an earlier prompt (or an earlier server run), else delegate
+            # to the shared synthesis service, falling back to local eSpeak-NG if it is down
+            audio_data = render_cached(
+                self.engine,
+                self._fingerprint(self.engine, text, voice, speed, pitch, effects,
+                                  effect_intensity, frequency_filter, harmonic_boost, target_loudness),
+                self._voice_settings(voice, speed, pitch),
+                normalize_text(text, voice_config.get("text_rules")),
+                effects,
+                remote=remote if client is not None else None,
+                process=add_effects if effects else None,
+                decode=self._wav_bytes_to_numpy,
+                writable=True,
+                label="DJZ-Speak v2"
             )
             
-            if not result.stdout:
-                raise ValueError("eSpeak-NG produced no audio output")
-            
-            # Convert WAV bytes to numpy array
-            audio_data = self._wav_bytes_to_numpy(result.stdout)
-            
-            # Apply robotic effects if requested
-            if effects:
-                audio_data = self._apply_robotic_effects(
-                    audio_data, 
-                    effect_intensity, 
-                    frequency_filter, 
-                    harmonic_boost
-                )
-            
             # Convert to torch tensor with ComfyUI format
-            if audio_data.ndim == 1:
+            if channel_layout != "mono":
+                # Pan straight into the channel rows of the output tensor's storage
+                audio_tensor = torch.zeros((1, channel_count(channel_layout), len(audio_data)), dtype=torch.float32)
+                spatialize(audio_data, channel_layout, pan, out=audio_tensor[0].numpy())
+            elif audio_data.ndim == 1:
                 # Mono audio - add batch and channel dimensions
                 audio_tensor = torch.from_numpy(audio_data).float().unsqueeze(0).unsqueeze(0)
             else:
@@ -401,8 +488,14 @@ class DJZSpeak_v2:
                 "path": None
             }
             
+            # Per-video-frame envelope for animation nodes, taken from the final waveform
+            # (computed on first use unless the effects pass already produced it)
+            envelope = tracker.values if tracker is not None and tracker.complete else None
+            feature = extract_feature(audio_data, sample_rate, feature_type, feature_fps, feature_frames,
+                                      feature_width, feature_height, envelope=envelope)
+            
             print("DJZ-Speak v2 synthesis complete.")
-            return (result,)
+            return (result, feature, feature.frame_count)
             
         except subprocess.TimeoutExpired:
             raise ValueError("eSpeak-NG synthesis timed out")
@@ -414,167 +507,58 @@ class DJZSpeak_v2:
         except Exception as e:
             raise ValueError(f"TTS synthesis failed: {str(e)}")
 
+    def _synthesize_remote(self, client, text, voice, speed, pitch, effects, effect_intensity, frequency_filter,
+                           harmonic_boost, target_loudness) -> Optional[np.ndarray]:
+        """Render on the DJZ-Speak service, or None if it cannot be reached."""
+        try:
+            audio, _ = client.synthesize(
+                "v2", text=text, voice=voice, speed=speed, pitch=pitch, effects=effects,
+                effect_intensity=effect_intensity, frequency_filter=frequency_filter,
+                harmonic_boost=harmonic_boost, target_loudness=target_loudness
+            )
+        except ConnectionError as e:
+            print(f"Warning: {e}, synthesizing locally")
+            return None
+        return np.array(audio[0] if audio.shape[0] == 1 else audio)
+
     def _wav_bytes_to_numpy(self, wav_bytes: bytes) -> np.ndarray:
         """Convert WAV bytes to numpy array."""
         try:
-            import io
-            import wave
-            
-            # Create a BytesIO object from the WAV bytes
-            wav_io = io.BytesIO(wav_bytes)
+            # Parse the header in place and convert the PCM view to float32 in one pass
+            return decode_wav(wav_bytes)
             
-            # Open as WAV file
-            with wave.open(wav_io, 'rb') as wav_file:
-                # Get audio parameters
-                frames = wav_file.getnframes()
-                sample_width = wav_file.getsampwidth()
-                channels = wav_file.getnchannels()
-                
-                # Read audio data
-                audio_bytes = wav_file.readframes(frames)
-                
-                # Convert to numpy array based on sample width
-                if sample_width == 1:
-                    # 8-bit audio
-                    audio_array = np.frombuffer(audio_bytes, dtype=np.uint8)
-                    audio_array = (audio_array.astype(np.float32) - 128) / 128.0
-                elif sample_width == 2:
-                    # 16-bit audio
-                    audio_array = np.frombuffer(audio_bytes, dtype=np.int16)
-                    audio_array = audio_array.astype(np.float32) / 32768.0
-                elif sample_width == 4:
-                    # 32-bit audio
-                    audio_array = np.frombuffer(audio_bytes, dtype=np.int32)
-                    audio_array = audio_array.astype(np.float32) / 2147483648.0
-                else:
-                    raise ValueError(f"Unsupported sample width: {sample_width}")
-                
-                # Reshape for multi-channel audio
-                if channels > 1:
-                    audio_array = audio_array.reshape(-1, channels)
-                    # Convert to mono by averaging channels
-                    audio_array = np.mean(audio_array, axis=1)
-                
-                return audio_array
-                
-        except Exception as e:
-            # Fallback: try using soundfile if available
+        except ValueError as e:
+            # Fallback for sample formats the header parser does not handle
             try:
                 import soundfile as sf
                 import io
                 
-                audio_array, _ = sf.read(io.BytesIO(wav_bytes))
-                return audio_array.astype(np.float32)
+                audio_array, _ = sf.read(io.BytesIO(wav_bytes), dtype='float32')
+                if audio_array.ndim > 1:
+                    audio_array = np.mean(audio_array, axis=1)
+                return audio_array
             except ImportError:
                 raise ValueError(f"Failed to decode WAV audio: {e}. Please install soundfile: pip install soundfile")
             except Exception as e2:
                 raise ValueError(f"Failed to decode WAV audio: {e2}")
 
-    def _apply_robotic_effects(self, audio_data: np.ndarray, intensity: float, frequency_filter: bool, harmonic_boost: float) -> np.ndarray:
+    def _apply_robotic_effects(self, audio_data: np.ndarray, intensity: float, frequency_filter: bool, harmonic_boost: float,
+                               target_loudness: float = -20.0, sample_rate: int = 22050,
+                               filter_profile: Optional[Dict[str, Any]] = None,
+                               tracker: Optional[EnvelopeTracker] = None) -> np.ndarray:
         """Apply robotic effects to audio data."""
         try:
             print(f"Applying robotic effects - intensity: {intensity:.1f}")
             
-            # Work with a copy to avoid modifying original
-            processed_audio = audio_data.copy()
-            
-            # Apply frequency filtering for vintage computer sound
-            if frequency_filter:
-                processed_audio = self._apply_frequency_filter(processed_audio, intensity)
-            
-            # Apply harmonic enhancement for metallic sound
-            if harmonic_boost > 1.0:
-                processed_audio = self._apply_harmonic_enhancement(processed_audio, harmonic_boost * intensity)
-            
-            # Apply mechanical artifacts for digital robotic character
-            processed_audio = self._apply_mechanical_artifacts(processed_audio, intensity)
-            
-            # Normalize to prevent clipping
-            max_val = np.max(np.abs(processed_audio))
-            if max_val > 0.95:
-                processed_audio = processed_audio * (0.95 / max_val)
-            
-            return processed_audio
+            # The chain is compiled once per (sample rate, settings) and shared with every other
+            # caller: loudness gain, filter bank, harmonics and quantization, look-ahead limiter
+            plan = effect_plan(sample_rate, intensity, frequency_filter, harmonic_boost, target_loudness, filter_profile)
+            return plan.apply(audio_data, tracker)
             
         except Exception as e:
             print(f"Warning: Effects processing failed: {e}")
             return audio_data  # Return original audio if effects fail
 
-    def _apply_frequency_filter(self, audio: np.ndarray, intensity: float) -> np.ndarray:
-        """Apply frequency filtering for robotic sound (simplified implementation)."""
-        try:
-            # Simple frequency filtering using numpy
-            # This is a basic implementation - for full filtering, scipy would be needed
-            
-            # Apply a simple high-frequency emphasis to simulate filtering
-            # Create a simple difference filter to emphasize mid-frequencies
-            if len(audio) > 1:
-                # Simple high-pass effect by emphasizing differences
-                diff_audio = np.diff(audio, prepend=audio[0])
-                filtered = audio + (diff_audio * 0.3 * intensity)
-                
-                # Simple low-pass effect by smoothing
-                if len(filtered) > 2:
-                    smoothed = np.convolve(filtered, [0.25, 0.5, 0.25], mode='same')
-                    return smoothed
-            
-            return audio
-            
-        except Exception as e:
-            print(f"Warning: Frequency filtering failed: {e}")
-            return audio
-
-    def _apply_harmonic_enhancement(self, audio: np.ndarray, factor: float) -> np.ndarray:
-        """Apply harmonic enhancement for metallic sound."""
-        try:
-            # Normalize input to prevent extreme values
-            max_val = np.max(np.abs(audio))
-            if max_val > 0:
-                normalized = audio / max_val
-                
-                # Apply controlled distortion using tanh for harmonic content
-                enhanced = np.tanh(normalized * factor)
-                
-                # Scale back and mix with original
-                enhanced = enhanced * max_val * 0.8
-                
-                # Mix enhanced signal with original (blend for natural sound)
-                mixed = audio * 0.6 + enhanced * 0.4
-                
-                return mixed.astype(np.float32)
-            
-            return audio
-            
-        except Exception as e:
-            print(f"Warning: Harmonic enhancement failed: {e}")
-            return audio
-
-    def _apply_mechanical_artifacts(self, audio: np.ndarray, intensity: float) -> np.ndarray:
-        """Apply mechanical artifacts for robotic sound."""
-        try:
-            # Quantization effect - reduce bit depth temporarily
-            # Scale intensity to control the effect strength
-            quantization_levels = int(256 / (intensity + 0.5))  # More intensity = more quantization
-            quantization_levels = max(16, min(256, quantization_levels))  # Clamp to reasonable range
-            
-            # Apply quantization
-            # Scale to quantization range
-            scaled = audio * quantization_levels
-            # Quantize by rounding
-            quantized = np.round(scaled)
-            # Scale back
-            quantized_audio = quantized / quantization_levels
-            
-            # Mix with original for subtle effect
-            artifact_strength = min(0.3 * intensity, 0.6)  # Limit artifact strength
-            mixed = audio * (1.0 - artifact_strength) + quantized_audio * artifact_strength
-            
-            return mixed.astype(np.float32)
-            
-        except Exception as e:
-            print(f"Warning: Mechanical artifacts failed: {e}")
-            return audio
-
 
 NODE_CLASS_MAPPINGS = {
     "DJZSpeak_v2": DJZSpeak_v2
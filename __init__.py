@@ -9,6 +9,12 @@ from .DJZ_Speak_v1 import NODE_DISPLAY_NAME_MAPPINGS as DJZ_SPEAK_V1_DISPLAY_MAP
 from .DJZ_Speak_v2 import NODE_CLASS_MAPPINGS as DJZ_SPEAK_V2_MAPPINGS
 from .DJZ_Speak_v2 import NODE_DISPLAY_NAME_MAPPINGS as DJZ_SPEAK_V2_DISPLAY_MAPPINGS
 
+from .DJZ_Speak_Morph import NODE_CLASS_MAPPINGS as DJZ_SPEAK_MORPH_MAPPINGS
+from .DJZ_Speak_Morph import NODE_DISPLAY_NAME_MAPPINGS as DJZ_SPEAK_MORPH_DISPLAY_MAPPINGS
+
+from .DJZ_Speak_Scene import NODE_CLASS_MAPPINGS as DJZ_SPEAK_SCENE_MAPPINGS
+from .DJZ_Speak_Scene import NODE_DISPLAY_NAME_MAPPINGS as DJZ_SPEAK_SCENE_DISPLAY_MAPPINGS
+
 NODE_CLASS_MAPPINGS = {}
 NODE_DISPLAY_NAME_MAPPINGS = {}
 
@@ -20,4 +26,12 @@ NODE_DISPLAY_NAME_MAPPINGS.update(DJZ_SPEAK_V1_DISPLAY_MAPPINGS)
 NODE_CLASS_MAPPINGS.update(DJZ_SPEAK_V2_MAPPINGS)
 NODE_DISPLAY_NAME_MAPPINGS.update(DJZ_SPEAK_V2_DISPLAY_MAPPINGS)
 
+# Register DJZ-Speak voice morph node
+NODE_CLASS_MAPPINGS.update(DJZ_SPEAK_MORPH_MAPPINGS)
+NODE_DISPLAY_NAME_MAPPINGS.update(DJZ_SPEAK_MORPH_DISPLAY_MAPPINGS)
+
+# Register DJZ-Speak scene node
+NODE_CLASS_MAPPINGS.update(DJZ_SPEAK_SCENE_MAPPINGS)
+NODE_DISPLAY_NAME_MAPPINGS.update(DJZ_SPEAK_SCENE_DISPLAY_MAPPINGS)
+
 __all__ = ['NODE_CLASS_MAPPINGS', 'NODE_DISPLAY_NAME_MAPPINGS']
@@ -0,0 +1,189 @@
+"""
+DJZ-Speak synthesis cache
+Stable fingerprints for synthesis requests and a node-level audio cache that
+persists across prompt executions and ComfyUI restarts (on disk through the
+packed, size-bounded ``djz_store.AudioStore``).
+"""
+
+import os
+import json
+import hashlib
+import subprocess
+import threading
+import numpy as np
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+from .djz_store import AudioStore
+
+# Bump when synthesis or effects output changes so stale audio is never reused
+CACHE_FORMAT_VERSION = 5
+
+DEFAULT_CACHE_DIR = Path(__file__).parent / "cache"
+
+
+@lru_cache(maxsize=8)
+def get_espeak_version(espeak_path: Optional[str]) -> str:
+    """Version banner of the eSpeak-NG executable (memoized per path)."""
+    if not espeak_path:
+        return "missing"
+    try:
+        result = subprocess.run([espeak_path, '--version'], capture_output=True, timeout=10)
+        banner = result.stdout.decode('utf-8', errors='ignore').strip().splitlines()
+        return banner[0] if banner else "unknown"
+    except Exception:
+        return "unknown"
+
+
+def _json_default(value: Any) -> Any:
+    # Frozen preset tables hold read-only mappings; hash them like the dicts they were
+    return dict(value) if isinstance(value, Mapping) else str(value)
+
+
+def synthesis_fingerprint(node_type: str, text: str, voice_settings: Dict[str, Any],
+                          effect_settings: Optional[Dict[str, Any]], espeak_version: str) -> str:
+    """Stable hex digest identifying the audio a synthesis request will produce."""
+    payload = {
+        "format": CACHE_FORMAT_VERSION,
+        "node": node_type,
+        "text": text,
+        "voice": voice_settings,
+        "effects": effect_settings,
+        "espeak": espeak_version
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=_json_default)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def linked_inputs_fingerprint(node_type: str, required: Iterable[str], inputs: Mapping[str, Any]) -> Optional[str]:
+    """Stable ``IS_CHANGED`` value when linked inputs are missing from the call, else None.
+
+    ComfyUI passes only constant widget values to ``IS_CHANGED``; the values
+    of linked inputs are already part of its own input signature, so the
+    widgets that were given are all this key needs to cover.
+    """
+    if all(name in inputs for name in required):
+        return None
+    return synthesis_fingerprint(node_type, "", dict(inputs), None, "linked")
+
+
+class SynthesisCache:
+    """In-memory LRU of rendered audio backed by the on-disk audio store."""
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_entries: int = 256, persist: bool = True,
+                 max_bytes: int = 2 * 1024 ** 3):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_entries = max_entries
+        self.persist = persist and self.cache_dir is not None
+        self.store = AudioStore(self.cache_dir / "store", max_bytes) if self.persist else None
+        # Lookups go through a plain dict, whose single-key operations are atomic with or without
+        # the GIL; recency order and eviction are kept separately and only touched under the lock
+        self._memory: Dict[str, np.ndarray] = {}
+        self._recency = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _legacy_path(self, key: str) -> Path:
+        # One .npy file per entry, as written before the packed store
+        return self.cache_dir / key[:2] / f"{key}.npy"
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Cached audio for a fingerprint, or None."""
+        # Lock-free hit path: entries are read-only and never mutated after insertion,
+        # and LRU recency is only refreshed when nobody else holds the lock
+        audio = self._memory.get(key)
+        if audio is not None:
+            if self._lock.acquire(blocking=False):
+                try:
+                    self._recency.move_to_end(key)
+                except KeyError:
+                    pass  # evicted meanwhile - the array itself is still valid
+                finally:
+                    self._lock.release()
+            return audio
+
+        if not self.persist:
+            return None
+        try:
+            # Read-only view of the memory-mapped segment
+            audio = self.store.get(key)
+        except Exception as e:
+            print(f"Warning: Audio store lookup failed: {e}")
+            return None
+        if audio is None:
+            audio = self._migrate(key)
+            if audio is None:
+                return None
+        self._remember(key, audio)
+        return audio
+
+    def _migrate(self, key: str) -> Optional[np.ndarray]:
+        """Move a legacy ``.npy`` entry into the store."""
+        path = self._legacy_path(key)
+        if not path.exists():
+            return None
+        try:
+            audio = np.load(path, allow_pickle=False)
+            self.store.put(key, audio)
+        except Exception as e:
+            print(f"Warning: Discarding unreadable cache entry {path.name}: {e}")
+            audio = None
+        path.unlink(missing_ok=True)
+        if audio is not None:
+            audio.setflags(write=False)
+        return audio
+
+    def put(self, key: str, audio: np.ndarray):
+        """Store rendered audio under a fingerprint."""
+        # Private read-only copy; callers copy again before handing audio downstream
+        audio = np.array(audio, dtype=np.float32, order='C', copy=True)
+        audio.setflags(write=False)
+        self._remember(key, audio)
+
+        if not self.persist:
+            return
+        try:
+            self.store.put(key, audio)
+        except Exception as e:
+            print(f"Warning: Failed to persist cache entry: {e}")
+
+    def clear(self):
+        """Drop the in-memory entries (persisted files are kept)."""
+        with self._lock:
+            self._memory.clear()
+            self._recency.clear()
+
+    def _remember(self, key: str, audio: np.ndarray):
+        with self._lock:
+            self._memory[key] = audio
+            self._recency[key] = None
+            self._recency.move_to_end(key)
+            while len(self._recency) > self.max_entries:
+                del self._memory[self._recency.popitem(last=False)[0]]
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_synthesis_cache() -> SynthesisCache:
+    """Process-wide cache shared by all node instances.
+
+    ``DJZ_SPEAK_CACHE_DIR`` overrides the on-disk location,
+    ``DJZ_SPEAK_CACHE_MAX_MB`` bounds its size (default 2048) and
+    ``DJZ_SPEAK_CACHE=0`` keeps the cache in memory only.
+    """
+    global _shared_cache
+    if _shared_cache is not None:
+        return _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            cache_dir = Path(os.environ.get("DJZ_SPEAK_CACHE_DIR", DEFAULT_CACHE_DIR))
+            persist = os.environ.get("DJZ_SPEAK_CACHE", "1") != "0"
+            try:
+                max_mb = float(os.environ.get("DJZ_SPEAK_CACHE_MAX_MB", 2048))
+            except ValueError:
+                max_mb = 2048
+            _shared_cache = SynthesisCache(cache_dir, persist=persist, max_bytes=int(max_mb * 1024 * 1024))
+        return _shared_cache
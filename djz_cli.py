@@ -0,0 +1,344 @@
+#!/usr/bin/env python
+"""
+DJZ-Speak headless command line
+Renders CSV/JSONL manifests through the DJZSpeak_v1/v2 node classes without
+launching ComfyUI. Run from the node folder:
+
+    python -m djz_cli render lines.csv --out renders --node v2 --workers 4
+    python -m djz_cli serve --port 8765
+    python -m djz_cli selfcheck
+    python -m djz_cli stress --calls 400
+    python -m djz_cli cache stats|verify|compact
+
+Each manifest row needs ``text`` and may set ``id``, ``voice``, ``speed``,
+``pitch`` and the v2 effect columns (``effects``, ``effect_intensity``,
+``frequency_filter``, ``harmonic_boost``, ``target_loudness``,
+``channel_layout``, ``pan``). Completed rows are appended to a progress
+file in the output folder so an interrupted run resumes where it stopped;
+rendered audio is also reused from the shared synthesis cache.
+"""
+
+import argparse
+import contextlib
+import csv
+import importlib
+import importlib.util
+import json
+import os
+import sys
+import threading
+import time
+import wave
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+PROGRESS_FILE = ".djz_progress.jsonl"
+WRITE_BLOCK_FRAMES = 65536
+
+V2_FLOAT_FIELDS = ("effect_intensity", "harmonic_boost", "target_loudness", "pan")
+V2_BOOL_FIELDS = ("effects", "frequency_filter")
+
+
+def load_package():
+    """Import the node package even though its folder name is not a valid module name."""
+    if __package__:
+        return importlib.import_module(__package__)
+    if "djz_speak" in sys.modules:
+        return sys.modules["djz_speak"]
+    package_dir = Path(__file__).resolve().parent
+    spec = importlib.util.spec_from_file_location(
+        "djz_speak", package_dir / "__init__.py", submodule_search_locations=[str(package_dir)]
+    )
+    package = importlib.util.module_from_spec(spec)
+    sys.modules["djz_speak"] = package
+    spec.loader.exec_module(package)
+    return package
+
+
+def read_manifest(path: Path) -> Iterator[Dict[str, Any]]:
+    """Rows of a CSV (with header) or JSONL manifest, each with an ``id``."""
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.suffix.lower() in ('.jsonl', '.ndjson'):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = csv.DictReader(f)
+        for index, row in enumerate(rows, start=1):
+            row = {k: v for k, v in row.items() if v not in (None, "")}
+            row.setdefault("id", f"{index:06d}")
+            yield row
+
+
+def _parse_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return bool(value)
+
+
+class StreamingWriter:
+    """Writes float audio in blocks as WAV, FLAC/OGG (soundfile) or raw float32."""
+
+    def __init__(self, path: Path, audio_format: str, sample_rate: int, channels: int):
+        self.audio_format = audio_format
+        if audio_format == "wav":
+            self._file = wave.open(str(path), 'wb')
+            self._file.setnchannels(channels)
+            self._file.setsampwidth(2)
+            self._file.setframerate(sample_rate)
+        elif audio_format == "raw":
+            self._file = open(path, 'wb')
+        else:
+            try:
+                import soundfile as sf
+            except ImportError:
+                raise ValueError(f"Writing {audio_format} requires soundfile: pip install soundfile")
+            self._file = sf.SoundFile(str(path), 'w', samplerate=sample_rate, channels=channels, format=audio_format.upper())
+
+    def write(self, frames: np.ndarray):
+        """Write a [frames, channels] float32 block."""
+        if self.audio_format == "wav":
+            pcm = (np.clip(frames, -1.0, 1.0) * 32767.0).astype('<i2')
+            self._file.writeframesraw(pcm.tobytes())
+        elif self.audio_format == "raw":
+            self._file.write(np.ascontiguousarray(frames, dtype='<f4').tobytes())
+        else:
+            self._file.write(frames)
+
+    def close(self):
+        self._file.close()
+
+
+def write_audio(path: Path, audio: np.ndarray, sample_rate: int, audio_format: str):
+    """Stream a [channels, samples] array to disk block by block via a temporary file."""
+    tmp_path = path.with_name(path.name + ".part")
+    writer = StreamingWriter(tmp_path, audio_format, sample_rate, audio.shape[0])
+    try:
+        for start in range(0, audio.shape[1], WRITE_BLOCK_FRAMES):
+            writer.write(audio[:, start:start + WRITE_BLOCK_FRAMES].T)
+    finally:
+        writer.close()
+    os.replace(tmp_path, path)
+
+
+class Renderer:
+    """Renders manifest rows with one node instance per worker thread."""
+
+    def __init__(self, node_class, args):
+        self.node_class = node_class
+        self.args = args
+        self._local = threading.local()
+
+    def _node(self):
+        node = getattr(self._local, "node", None)
+        if node is None:
+            node = self._local.node = self.node_class()
+        return node
+
+    def _inputs(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        voice = row.get("voice", self.args.voice)
+        preset = self.node_class.VOICE_PRESETS.get(voice, self.node_class.VOICE_PRESETS["classic_robot"])
+        inputs = {
+            "text": row["text"],
+            "voice": voice,
+            "speed": int(row.get("speed", self.args.speed or preset["speed"])),
+            "pitch": int(row.get("pitch", self.args.pitch or preset["pitch"]))
+        }
+        if self.args.node == "v2":
+            inputs["effects"] = _parse_bool(row.get("effects", self.args.effects))
+            for field in V2_FLOAT_FIELDS:
+                if field in row:
+                    inputs[field] = float(row[field])
+            if "frequency_filter" in row:
+                inputs["frequency_filter"] = _parse_bool(row["frequency_filter"])
+            if "channel_layout" in row:
+                inputs["channel_layout"] = row["channel_layout"]
+        return inputs
+
+    def render(self, row: Dict[str, Any], out_dir: Path) -> Dict[str, Any]:
+        audio = self._node().synthesize(**self._inputs(row))[0]
+        waveform = audio["waveform"][0].cpu().numpy()
+        sample_rate = audio["sample_rate"]
+        path = out_dir / f"{row['id']}.{self.args.format}"
+        write_audio(path, waveform, sample_rate, self.args.format)
+        return {"id": row["id"], "file": path.name, "seconds": waveform.shape[1] / sample_rate}
+
+
+def _load_progress(out_dir: Path) -> Dict[str, Dict[str, Any]]:
+    done = {}
+    progress_path = out_dir / PROGRESS_FILE
+    if progress_path.exists():
+        with open(progress_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn write from an interrupted run
+                if (out_dir / entry.get("file", "")).exists():
+                    done[str(entry["id"])] = entry
+    return done
+
+
+def command_render(args) -> int:
+    package = load_package()
+    node_class = package.NODE_CLASS_MAPPINGS[f"DJZSpeak_{args.node}"]
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    rows = list(read_manifest(Path(args.manifest)))
+    done = {} if args.restart else _load_progress(out_dir)
+    pending = [row for row in rows if str(row["id"]) not in done]
+    print(f"DJZ-Speak: {len(rows)} lines, {len(rows) - len(pending)} already rendered, {len(pending)} to go", file=sys.stderr)
+
+    renderer = Renderer(node_class, args)
+    progress_lock = threading.Lock()
+    failures: List[str] = []
+    completed, audio_seconds = 0, 0.0
+    started = time.perf_counter()
+
+    stdout_target = open(os.devnull, 'w') if args.quiet else sys.stdout
+    with contextlib.redirect_stdout(stdout_target), open(out_dir / PROGRESS_FILE, 'a', encoding='utf-8') as progress:
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            futures = {pool.submit(renderer.render, row, out_dir): row for row in pending}
+            for future in as_completed(futures):
+                row = futures[future]
+                try:
+                    entry = future.result()
+                except Exception as e:
+                    failures.append(str(row["id"]))
+                    print(f"DJZ-Speak: line {row['id']} failed: {e}", file=sys.stderr)
+                    continue
+                with progress_lock:
+                    progress.write(json.dumps(entry) + "\n")
+                    progress.flush()
+                completed += 1
+                audio_seconds += entry["seconds"]
+                if completed % args.report_every == 0:
+                    elapsed = time.perf_counter() - started
+                    print(f"DJZ-Speak: {completed}/{len(pending)} lines, {completed / elapsed:.2f} lines/s, "
+                          f"{audio_seconds / elapsed:.2f} audio-s/s", file=sys.stderr)
+    if args.quiet:
+        stdout_target.close()
+
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    print(f"DJZ-Speak: rendered {completed} lines ({audio_seconds:.1f}s of audio) in {elapsed:.1f}s - "
+          f"{completed / elapsed:.2f} lines/s, {audio_seconds / elapsed:.2f} audio-s/s", file=sys.stderr)
+    if failures:
+        print(f"DJZ-Speak: {len(failures)} lines failed: {', '.join(failures[:20])}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def command_serve(args) -> int:
+    package = load_package()
+    server = importlib.import_module(f"{package.__name__}.djz_server")
+    server.run_server(package.NODE_CLASS_MAPPINGS, args.host, args.port, args.workers)
+    return 0
+
+
+def command_selfcheck(args) -> int:
+    # Offline: fake engine, memory-only cache, never the shared service
+    os.environ["DJZ_SPEAK_ENGINE"] = "fake"
+    os.environ["DJZ_SPEAK_CACHE"] = "0"
+    os.environ.pop("DJZ_SPEAK_SERVER", None)
+    package = load_package()
+    selfcheck = importlib.import_module(f"{package.__name__}.djz_selfcheck")
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        results = selfcheck.run_selfcheck(package.NODE_CLASS_MAPPINGS, args.workers, args.min_rate)
+
+    for name, passed, detail in results:
+        print(f"{'PASS' if passed else 'FAIL'}  {name}: {detail}", file=sys.stderr)
+    failed = sum(not passed for _, passed, _ in results)
+    print(f"DJZ-Speak selfcheck: {len(results) - failed} passed, {failed} failed", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def command_stress(args) -> int:
+    if args.engine == "fake":
+        os.environ["DJZ_SPEAK_ENGINE"] = "fake"
+    os.environ["DJZ_SPEAK_CACHE"] = "0"
+    os.environ.pop("DJZ_SPEAK_SERVER", None)
+    package = load_package()
+    selfcheck = importlib.import_module(f"{package.__name__}.djz_selfcheck")
+
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            results = selfcheck.run_stress(package.NODE_CLASS_MAPPINGS, args.calls, args.threads)
+    except AssertionError as e:
+        print(f"DJZ-Speak stress: FAIL - {e}", file=sys.stderr)
+        return 1
+
+    print(f"DJZ-Speak stress: {args.calls} calls on one shared node instance ({args.engine} engine)", file=sys.stderr)
+    for threads, rate, speedup in results:
+        print(f"  {threads:3d} threads: {rate:8.1f} lines/s  x{speedup:.2f}  ({speedup / threads:.0%} efficiency)", file=sys.stderr)
+    return 0
+
+
+def command_cache(args) -> int:
+    package = load_package()
+    cache = importlib.import_module(f"{package.__name__}.djz_cache").get_synthesis_cache()
+    if cache.store is None:
+        print("DJZ-Speak: the persistent cache is disabled (DJZ_SPEAK_CACHE=0)", file=sys.stderr)
+        return 1
+    if args.action == "verify":
+        checked, dropped = cache.store.verify()
+        print(f"DJZ-Speak cache: {checked} entries checked, {dropped} corrupt entries dropped", file=sys.stderr)
+    elif args.action == "compact":
+        cache.store.compact()
+    stats = cache.store.stats()
+    print(f"DJZ-Speak cache: {stats['entries']} entries, {stats['live_bytes'] / 2 ** 20:.1f} MB live in "
+          f"{stats['file_bytes'] / 2 ** 20:.1f} MB of {stats['segments']} segments "
+          f"(limit {stats['max_bytes'] / 2 ** 20:.0f} MB)", file=sys.stderr)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m djz_cli", description="Headless DJZ-Speak synthesis")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    render = commands.add_parser("render", help="Render a CSV/JSONL manifest to audio files")
+    render.add_argument("manifest", help="CSV (with header) or JSONL manifest")
+    render.add_argument("--out", required=True, help="Output folder")
+    render.add_argument("--node", choices=("v1", "v2"), default="v1", help="Node class to drive")
+    render.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Concurrent synthesis workers")
+    render.add_argument("--format", choices=("wav", "flac", "ogg", "raw"), default="wav", help="Output encoding")
+    render.add_argument("--voice", default="classic_robot", help="Voice for rows without a voice column")
+    render.add_argument("--speed", type=int, help="Speed for rows without a speed column (default: preset)")
+    render.add_argument("--pitch", type=int, help="Pitch for rows without a pitch column (default: preset)")
+    render.add_argument("--effects", action="store_true", help="Enable v2 effects for rows without an effects column")
+    render.add_argument("--restart", action="store_true", help="Ignore previous progress and render everything")
+    render.add_argument("--report-every", type=int, default=25, help="Print throughput every N lines")
+    render.add_argument("--quiet", action="store_true", help="Silence per-line node output")
+    render.set_defaults(handler=command_render)
+
+    serve = commands.add_parser("serve", help="Run the local HTTP synthesis service")
+    serve.add_argument("--host", default="127.0.0.1", help="Interface to bind (keep it local unless you trust the network)")
+    serve.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    serve.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Concurrent synthesis workers")
+    serve.set_defaults(handler=command_serve)
+
+    check = commands.add_parser("selfcheck", help="Smoke-test both nodes with the fake engine")
+    check.add_argument("--workers", type=int, default=min(os.cpu_count() or 1, 8), help="Threads for the concurrency checks")
+    check.add_argument("--min-rate", type=float, default=0.0, help="Fail if throughput is below this many lines/s")
+    check.set_defaults(handler=command_selfcheck)
+
+    stress = commands.add_parser("stress", help="Measure throughput scaling of concurrent calls on one node instance")
+    stress.add_argument("--calls", type=int, default=400, help="Distinct lines rendered at each thread count")
+    stress.add_argument("--threads", type=int, default=os.cpu_count() or 1, help="Highest thread count")
+    stress.add_argument("--engine", choices=("fake", "espeak"), default="fake", help="Synthesis engine to drive")
+    stress.set_defaults(handler=command_stress)
+
+    cache = commands.add_parser("cache", help="Inspect or maintain the on-disk audio cache")
+    cache.add_argument("action", choices=("stats", "verify", "compact"), help="Show usage, check every checksum, or compact now")
+    cache.set_defaults(handler=command_cache)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
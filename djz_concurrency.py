@@ -0,0 +1,51 @@
+"""
+DJZ-Speak concurrency helpers
+Node instances may be called from several threads at once (patched
+executors, the CLI worker pool, the synthesis service). Shared tables are
+frozen into read-only mappings so no call can mutate them under another,
+and effect stages borrow scratch buffers from a per-thread pool instead of
+allocating temporaries on every call.
+"""
+
+import threading
+import numpy as np
+from types import MappingProxyType
+from typing import Any, Mapping
+
+
+def freeze(value: Any) -> Any:
+    """Recursively turn dicts into read-only mappings and lists into tuples."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+# Samples per block for block-wise in-place stages (float32, comfortably inside L2)
+SCRATCH_BLOCK = 16384
+
+# Largest buffer a thread keeps between calls (1 MiB of float32); bigger requests get a throwaway array
+MAX_SCRATCH_ELEMENTS = 1 << 18
+
+_scratch = threading.local()
+
+
+def scratch(name: str, size: int, dtype=np.float32) -> np.ndarray:
+    """1-D scratch buffer of ``size`` elements owned by the calling thread.
+
+    Buffers grow to the largest size requested under ``name`` up to
+    ``MAX_SCRATCH_ELEMENTS`` and are reused afterwards; larger requests are
+    served by a fresh array that is dropped after use, so a thread never
+    pins more than that per name. The contents are undefined and only valid
+    until the same thread asks for ``name`` again, so results must never
+    alias them.
+    """
+    if size > MAX_SCRATCH_ELEMENTS:
+        return np.empty(size, dtype=dtype)
+    buffers = _scratch.__dict__.setdefault("buffers", {})
+    key = (name, np.dtype(dtype))
+    buffer = buffers.get(key)
+    if buffer is None or buffer.size < size:
+        buffer = buffers[key] = np.empty(max(size, 4096), dtype=dtype)
+    return buffer[:size]
@@ -0,0 +1,180 @@
+"""
+DJZ-Speak effect plans
+The v2 robotic chain (loudness gain, filter bank, tanh harmonics, quantization
+artifacts, look-ahead limiter) compiled once per unique (sample rate,
+settings) into a read-only plan: stage constants are derived up front, the
+filter spectrum comes from the filter engine's design cache, and the
+sample-wise stages run as one fused pass over cache-sized blocks (which also
+feeds an optional feature envelope tracker while each block is in cache). The
+same plan serves single-shot renders (``apply``) and chunked streaming
+(``stream``), so every entry point produces the same audio.
+"""
+
+import numpy as np
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from .djz_concurrency import SCRATCH_BLOCK, scratch
+from .djz_features import EnvelopeTracker
+from .djz_filters import FIRFilter, profile_key
+from .djz_loudness import MAX_GAIN_DB, LookaheadLimiter, measure_loudness
+
+# Typical speech crest factor; sets the tanh drive reference relative to the loudness target
+SPEECH_CREST_DB = 14.0
+
+LIMITER_CEILING = 0.95
+
+
+class EffectPlan:
+    """Precomputed robotic effect chain for one sample rate and settings.
+
+    Plans are shared between threads and never mutated after construction;
+    per-render state lives in the filter and limiter each call creates.
+    """
+
+    def __init__(self, sample_rate: int, intensity: float, frequency_filter: bool, harmonic_boost: float,
+                 target_loudness: float, filter_key: Tuple):
+        self.sample_rate = sample_rate
+        self.target_loudness = target_loudness
+        self.filter_key = filter_key
+
+        # Filter bank: intensity sets the wet mix (designs are cached by the filter engine)
+        self.filter_profile = None
+        if frequency_filter:
+            bands, taps = filter_key
+            self.filter_profile = {"bands": bands, "taps": taps}
+        self.wet = min(1.0, 0.5 * intensity)
+
+        # Harmonics: input is loudness-normalized, so a fixed reference level replaces a peak scan
+        self.harmonic = harmonic_boost > 1.0
+        reference = 10.0 ** ((target_loudness + SPEECH_CREST_DB) / 20.0)
+        self.drive = np.float32(harmonic_boost * intensity / reference)
+        self.harmonic_mix = np.float32(reference * 0.8 * 0.4)
+        self.harmonic_dry = np.float32(0.6)
+
+        # Quantization artifacts: more intensity = fewer levels, mixed in up to 60%
+        levels = max(16, min(256, int(256 / (intensity + 0.5))))
+        strength = min(0.3 * intensity, 0.6)
+        self.levels = np.float32(levels)
+        self.artifact_mix = np.float32(strength / levels)
+        self.artifact_dry = np.float32(1.0 - strength)
+
+    def gain_for(self, audio: np.ndarray) -> float:
+        """Gain that brings ``audio`` to the plan's loudness target, boosting by at most ``MAX_GAIN_DB``."""
+        loudness = measure_loudness(audio, self.sample_rate)
+        return 1.0 if loudness is None else 10.0 ** (min(self.target_loudness - loudness, MAX_GAIN_DB) / 20.0)
+
+    def _shape(self, audio: np.ndarray, tracker: Optional[EnvelopeTracker] = None) -> float:
+        """Harmonics and quantization in one pass, in place, block by block; returns the output peak.
+
+        ``tracker`` reduces each finished block into its feature envelope.
+        """
+        peak = 0.0
+        for start in range(0, len(audio), SCRATCH_BLOCK):
+            block = audio[start:start + SCRATCH_BLOCK]
+            work = scratch("effects", len(block))
+            if self.harmonic:
+                np.multiply(block, self.drive, out=work)
+                np.tanh(work, out=work)
+                work *= self.harmonic_mix
+                block *= self.harmonic_dry
+                block += work
+            np.multiply(block, self.levels, out=work)
+            np.round(work, out=work)
+            work *= self.artifact_mix
+            block *= self.artifact_dry
+            block += work
+            peak = max(peak, float(np.max(np.abs(block, out=work))))
+            if tracker is not None:
+                tracker.advance(audio, start + len(block))
+        return peak
+
+    def _filter(self) -> Optional[FIRFilter]:
+        return FIRFilter(self.sample_rate, self.filter_profile, self.wet) if self.filter_profile is not None else None
+
+    def apply(self, audio: np.ndarray, tracker: Optional[EnvelopeTracker] = None) -> np.ndarray:
+        """Run the chain over a complete signal; returns a new float32 array of the same length.
+
+        A ``tracker`` covering the signal is finished on the returned audio.
+        """
+        # Gain makes the chain's own buffer, so every later stage works in place
+        processed = audio.astype(np.float32) * np.float32(self.gain_for(audio))
+
+        fir = self._filter()
+        if fir is not None:
+            filtered = np.concatenate((fir.process(processed), fir.flush()))
+            processed = filtered[fir.delay:fir.delay + len(audio)]
+
+        peak = self._shape(processed, tracker)
+
+        # The limiter is exactly unity when nothing reaches the ceiling
+        if peak > LIMITER_CEILING:
+            limiter = LookaheadLimiter(self.sample_rate, ceiling=LIMITER_CEILING)
+            processed = np.concatenate((limiter.process(processed), limiter.flush()))
+            if tracker is not None:
+                tracker.reset()  # gain reduction changed the samples it has seen
+        if tracker is not None:
+            tracker.finish(processed)
+        return processed
+
+    def stream(self, gain: float = 1.0) -> "EffectStream":
+        """Chunked processor for this plan.
+
+        Loudness is not measured while streaming: ``gain`` must be computed up
+        front with ``gain_for`` on the whole signal (or a known loudness) for
+        the output to match ``apply``.
+        """
+        return EffectStream(self, gain)
+
+
+class EffectStream:
+    """Streaming form of an effect plan.
+
+    The filter's group delay is removed and the look-ahead is drained on
+    ``flush``, so the concatenated output lines up sample for sample with
+    ``EffectPlan.apply`` on the whole signal.
+    """
+
+    def __init__(self, plan: EffectPlan, gain: float = 1.0):
+        self.plan = plan
+        self.gain = np.float32(gain)
+        self.fir = plan._filter()
+        self.limiter = LookaheadLimiter(plan.sample_rate, ceiling=LIMITER_CEILING)
+        self._skip = self.fir.delay if self.fir is not None else 0
+        self._remaining = 0
+
+    def _finish(self, filtered: np.ndarray) -> np.ndarray:
+        # Drop the filter delay at the start and the convolution tail past the input
+        skip = min(self._skip, len(filtered))
+        self._skip -= skip
+        filtered = filtered[skip:skip + self._remaining]
+        self._remaining -= len(filtered)
+        self.plan._shape(filtered)
+        return self.limiter.process(filtered)
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        """Process one chunk, returning the samples that are now complete."""
+        processed = np.asarray(chunk, dtype=np.float32) * self.gain
+        self._remaining += len(processed)
+        if self.fir is not None:
+            processed = self.fir.process(processed)
+        return self._finish(processed)
+
+    def flush(self) -> np.ndarray:
+        """Drain the filter and limiter."""
+        tail = self.fir.flush() if self.fir is not None else np.zeros(0, dtype=np.float32)
+        return np.concatenate((self._finish(tail), self.limiter.flush()))
+
+
+@lru_cache(maxsize=128)
+def _compiled_plan(sample_rate: int, intensity: float, frequency_filter: bool, harmonic_boost: float,
+                   target_loudness: float, filter_key: Tuple) -> EffectPlan:
+    return EffectPlan(sample_rate, intensity, frequency_filter, harmonic_boost, target_loudness, filter_key)
+
+
+def effect_plan(sample_rate: int, intensity: float, frequency_filter: bool, harmonic_boost: float,
+                target_loudness: float = -20.0, filter_profile: Optional[Dict[str, Any]] = None) -> EffectPlan:
+    """Shared plan for these settings, compiled on first use."""
+    key = profile_key(filter_profile) if frequency_filter else ()
+    return _compiled_plan(int(sample_rate), round(float(intensity), 4), bool(frequency_filter),
+                          round(float(harmonic_boost), 4), round(float(target_loudness), 4), key)
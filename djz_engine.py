@@ -0,0 +1,177 @@
+"""
+DJZ-Speak synthesis engines
+The nodes render speech through an engine: ``EspeakEngine`` runs the
+eSpeak-NG executable under the resource governor, and ``FakeEngine``
+produces deterministic synthetic speech-like WAV output in-process, so the
+nodes, cache, CLI and service can be exercised offline without eSpeak-NG.
+
+Set ``DJZ_SPEAK_ENGINE=fake`` to use the fake engine everywhere.
+``render_cached`` is the one render path every node goes through: the
+synthesis cache, then the shared service, then the engine.
+"""
+
+import os
+import struct
+import threading
+import zlib
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .djz_cache import get_espeak_version, get_synthesis_cache
+from .djz_governor import get_governor
+from .djz_wav import decode_wav
+
+ENGINE_SAMPLE_RATE = 22050
+
+
+class EspeakEngine:
+    """eSpeak-NG subprocess synthesis, admitted and limited by the governor."""
+
+    name = "espeak"
+
+    def __init__(self, espeak_path: Optional[str]):
+        self.espeak_path = espeak_path
+
+    @property
+    def available(self) -> bool:
+        return bool(self.espeak_path)
+
+    def version(self) -> str:
+        # Chunking changes the audio of long texts, so it is part of the engine identity
+        return f"{get_espeak_version(self.espeak_path)}; {get_governor().signature()}"
+
+    def command(self, voice_settings: Dict[str, Any]) -> List[str]:
+        return [
+            self.espeak_path,
+            '-v', f"{voice_settings['espeak_voice']}+{voice_settings['variant']}",
+            '-s', str(voice_settings['speed']),
+            '-p', str(voice_settings['pitch']),
+            '-a', str(voice_settings['amplitude']),
+            '-g', str(voice_settings['gap']),
+            '--stdout'
+        ]
+
+    def render(self, voice_settings: Dict[str, Any], text: str, effects: bool = False) -> Tuple[bytes, bool]:
+        """WAV bytes for ``text`` and whether they are a partial result.
+
+        ``effects`` tells the scheduler that effects processing follows, which raises the job's cost.
+        """
+        return get_governor().run_espeak(self.command(voice_settings), text, voice_settings['speed'], effects)
+
+
+class FakeEngine:
+    """Deterministic stand-in for eSpeak-NG.
+
+    Each word becomes a voiced burst: harmonics of a fundamental set by
+    ``pitch`` under a Hann envelope, with two formant peaks picked from a
+    checksum of the word. Word length follows ``speed`` (words per minute),
+    silences follow ``gap`` (10 ms units) and level follows ``amplitude``.
+    Output uses the same streaming WAV header eSpeak-NG writes to a pipe.
+    """
+
+    name = "fake"
+    available = True
+
+    def __init__(self, sample_rate: int = ENGINE_SAMPLE_RATE):
+        self.sample_rate = sample_rate
+
+    def version(self) -> str:
+        return "fake-engine 1"
+
+    def synthesize(self, voice_settings: Dict[str, Any], text: str) -> np.ndarray:
+        """Float32 samples the engine renders for ``text``."""
+        sr = self.sample_rate
+        words = text.split()
+        word_seconds = 60.0 / max(int(voice_settings['speed']), 1)
+        gap = np.zeros(int(sr * (0.02 + 0.01 * int(voice_settings['gap']))), dtype=np.float32)
+        f0 = 60.0 + 2.0 * int(voice_settings['pitch'])
+        level = min(int(voice_settings['amplitude']), 200) / 400.0
+        variant = zlib.crc32(f"{voice_settings['espeak_voice']}+{voice_settings['variant']}".encode('utf-8'))
+
+        pieces = []
+        for word in words:
+            checksum = zlib.crc32(word.encode('utf-8')) ^ variant
+            length = int(sr * word_seconds * (0.5 + 0.1 * min(len(word), 10)))
+            t = np.arange(length, dtype=np.float32) / sr
+            formants = (300.0 + checksum % 600, 900.0 + (checksum >> 10) % 1600)
+            burst = np.zeros(length, dtype=np.float32)
+            for harmonic in range(1, int(4000 // f0) + 1):
+                frequency = f0 * harmonic
+                weight = sum(1.0 / (1.0 + ((frequency - f) / 150.0) ** 2) for f in formants) / harmonic
+                burst += np.float32(weight) * np.sin(np.float32(2 * np.pi * frequency) * t)
+            burst *= np.hanning(length).astype(np.float32)
+            peak = float(np.max(np.abs(burst))) or 1.0
+            pieces += [burst * np.float32(level / peak), gap]
+        return np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.float32)
+
+    def render(self, voice_settings: Dict[str, Any], text: str, effects: bool = False) -> Tuple[bytes, bool]:
+        pcm = (np.clip(self.synthesize(voice_settings, text), -1.0, 1.0) * 32767.0).astype('<i2').tobytes()
+        # Placeholder RIFF/data sizes, as eSpeak-NG writes when stdout is a pipe
+        header = (b'RIFF' + struct.pack('<I', 0x7ffff024) + b'WAVEfmt ' +
+                  struct.pack('<IHHIIHH', 16, 1, 1, self.sample_rate, self.sample_rate * 2, 2, 16) +
+                  b'data' + struct.pack('<I', 0x7ffff000))
+        return header + pcm, False
+
+
+_fake_engine = None
+_fake_engine_lock = threading.Lock()
+
+
+def get_engine(espeak_path: Optional[str]):
+    """Engine the nodes should render with: the fake engine when ``DJZ_SPEAK_ENGINE=fake``,
+    otherwise eSpeak-NG at ``espeak_path``."""
+    global _fake_engine
+    if os.environ.get("DJZ_SPEAK_ENGINE", "espeak").lower() != "fake":
+        return EspeakEngine(espeak_path)
+    if _fake_engine is not None:
+        return _fake_engine
+    with _fake_engine_lock:
+        if _fake_engine is None:
+            _fake_engine = FakeEngine()
+        return _fake_engine
+
+
+def render_cached(engine, cache_key: str, voice_settings: Dict[str, Any], text: str, effects: bool = False,
+                  remote: Optional[Callable[[], Optional[np.ndarray]]] = None,
+                  process: Optional[Callable[[np.ndarray], Tuple[np.ndarray, bool]]] = None,
+                  decode: Callable[[bytes], np.ndarray] = decode_wav, writable: bool = False,
+                  label: str = "DJZ-Speak") -> np.ndarray:
+    """Audio for one synthesis request: a cache hit, else the service, else the engine.
+
+    ``remote`` renders on the shared service and returns None when it is
+    unreachable; ``process`` post-processes a fresh engine render (the v2
+    effects) and returns the audio with whether it succeeded. Partial
+    renders and failed post-processing are returned but never cached. Cache
+    hits are read-only unless ``writable`` is set.
+    """
+    cache = get_synthesis_cache()
+    audio = cache.get(cache_key)
+    if audio is not None:
+        print(f"{label} cache hit.")
+        return audio.copy() if writable else audio
+
+    if remote is not None:
+        audio = remote()
+        if audio is not None:
+            cache.put(cache_key, audio)
+            return audio
+
+    if not engine.available:
+        raise ValueError("eSpeak-NG not found and the DJZ-Speak service is unreachable")
+
+    # eSpeak-NG runs under the resource governor, text via stdin
+    wav_bytes, partial = engine.render(voice_settings, text, effects)
+    if not wav_bytes:
+        raise ValueError("eSpeak-NG produced no audio output")
+
+    audio = decode(wav_bytes)
+    processed = True
+    if process is not None:
+        audio, processed = process(audio)
+
+    # Partial results depend on load and fallbacks on a one-off failure, so neither is cached
+    if partial:
+        print(f"Warning: {label} returned partial audio (deadline or text limit reached)")
+    elif processed:
+        cache.put(cache_key, audio)
+    return audio
@@ -0,0 +1,183 @@
+"""
+DJZ-Speak audio features
+Per-video-frame envelopes (RMS energy, peak amplitude, spectral centroid)
+computed from the rendered waveform through strided frame views, packaged
+as a FEATURE object that animation nodes expecting an audio feature
+(``get_value_at_frame``, ``frame_count``, ``frame_rate``) can consume
+directly. Only the selected envelope is computed, and only when a consumer
+first reads it; the v2 effects chain can fill the cheap envelopes with an
+``EnvelopeTracker`` while its blocks are still in cache.
+"""
+
+import numpy as np
+from typing import Callable, Optional, Tuple, Union
+
+FEATURE_TYPES = ["rms_energy", "amplitude_envelope", "spectral_centroid"]
+
+# Envelopes cheap enough to collect block by block inside the effects pass
+TRACKED_TYPES = ("rms_energy", "amplitude_envelope")
+
+
+def feature_frame_count(length: int, sample_rate: int, fps: float, frame_count: int = 0) -> int:
+    """Video frames the feature covers; ``frame_count=0`` covers the whole signal."""
+    return frame_count or max(1, int(np.ceil(length * fps / sample_rate)))
+
+
+def frame_layout(sample_rate: int, fps: float, frame_count: int) -> Tuple[np.ndarray, int]:
+    """Start sample of each video frame and the analysis window length."""
+    hop = sample_rate / fps
+    return np.round(np.arange(frame_count) * hop).astype(np.int64), int(np.ceil(hop))
+
+
+def frame_view(audio: np.ndarray, sample_rate: int, fps: float, frame_count: int) -> np.ndarray:
+    """[frame_count, window] view of the audio, one row per video frame."""
+    hop = sample_rate / fps
+    starts, window = frame_layout(sample_rate, fps, frame_count)
+    needed = int(starts[-1]) + window if frame_count else 0
+    if needed > len(audio):
+        audio = np.concatenate((audio, np.zeros(needed - len(audio), dtype=np.float32)))
+    windows = np.lib.stride_tricks.sliding_window_view(audio, window)
+    if float(hop).is_integer():
+        return windows[::int(hop)][:frame_count]  # still a view - no copy
+    return windows[starts]
+
+
+def frame_values(frames: np.ndarray, feature_type: str, sample_rate: int) -> np.ndarray:
+    """One envelope value per frame row."""
+    if feature_type == "rms_energy":
+        return np.sqrt(np.einsum('ij,ij->i', frames, frames, dtype=np.float64) / frames.shape[1]).astype(np.float32)
+    if feature_type == "amplitude_envelope":
+        return np.max(np.abs(frames), axis=1).astype(np.float32)
+    spectrum = np.abs(np.fft.rfft(frames * np.hanning(frames.shape[1]).astype(np.float32), axis=1))
+    frequencies = np.fft.rfftfreq(frames.shape[1], 1.0 / sample_rate)
+    energy = spectrum.sum(axis=1)
+    centroid = np.divide(spectrum @ frequencies, energy, out=np.zeros_like(energy), where=energy > 1e-9)
+    return centroid.astype(np.float32)
+
+
+def frame_envelope(audio: np.ndarray, sample_rate: int, fps: float, feature_type: str, frame_count: int = 0) -> np.ndarray:
+    """Raw per-frame envelope of one feature type."""
+    audio = np.asarray(audio, dtype=np.float32)
+    frame_count = feature_frame_count(len(audio), sample_rate, fps, frame_count)
+    return frame_values(frame_view(audio, sample_rate, fps, frame_count), feature_type, sample_rate)
+
+
+class EnvelopeTracker:
+    """Builds an envelope incrementally while a signal is written block by block.
+
+    ``advance`` is called with the signal and how much of it is final; it
+    reduces every frame that now lies entirely inside that prefix, so each
+    frame is read while its block is still in cache. The result matches
+    ``frame_envelope`` on the finished signal exactly.
+    """
+
+    def __init__(self, feature_type: str, length: int, sample_rate: int, fps: float, frame_count: int = 0):
+        self.feature_type = feature_type
+        self.sample_rate = sample_rate
+        self.frame_count = feature_frame_count(length, sample_rate, fps, frame_count)
+        self.starts, self.window = frame_layout(sample_rate, fps, self.frame_count)
+        self.values = np.zeros(self.frame_count, dtype=np.float32)
+        self._next = 0
+
+    @property
+    def complete(self) -> bool:
+        return self._next == self.frame_count
+
+    def reset(self):
+        """Forget the reduced frames, e.g. when the signal changed after they were read."""
+        self._next = 0
+
+    def advance(self, audio: np.ndarray, end: int):
+        ready = int(np.searchsorted(self.starts, end - self.window, side='right'))
+        if ready > self._next:
+            windows = np.lib.stride_tricks.sliding_window_view(audio[:end], self.window)
+            self.values[self._next:ready] = frame_values(windows[self.starts[self._next:ready]], self.feature_type, self.sample_rate)
+            self._next = ready
+
+    def finish(self, audio: np.ndarray) -> np.ndarray:
+        """Reduce the frames that run past the end of the signal (zero padded) and return the envelope."""
+        self.advance(audio, len(audio))
+        if self._next < self.frame_count:
+            first = int(self.starts[self._next])
+            tail = np.zeros(int(self.starts[-1]) + self.window - first, dtype=np.float32)
+            tail[:max(0, len(audio) - first)] = audio[first:]
+            windows = np.lib.stride_tricks.sliding_window_view(tail, self.window)
+            self.values[self._next:] = frame_values(windows[self.starts[self._next:] - first], self.feature_type, self.sample_rate)
+            self._next = self.frame_count
+        return self.values
+
+
+def envelope_tracker(feature_type: str, length: int, sample_rate: int, fps: float,
+                     frame_count: int = 0) -> Optional[EnvelopeTracker]:
+    """Tracker for ``feature_type`` if it is cheap enough to collect inside an effects pass, else None."""
+    if feature_type not in TRACKED_TYPES:
+        return None
+    return EnvelopeTracker(feature_type, length, sample_rate, fps, frame_count)
+
+
+class AudioEnvelopeFeature:
+    """Per-frame audio feature compatible with FEATURE consumers.
+
+    ``data`` is normalized to [0, 1]; ``raw_data`` keeps the original units
+    (linear amplitude, or Hz for the spectral centroid). ``raw_data`` may be
+    given as a callable, in which case the envelope is only computed when a
+    consumer first reads the feature; ``frame_count`` is known up front.
+    """
+
+    def __init__(self, name: str, raw_data: Union[np.ndarray, Callable[[], np.ndarray]], frame_rate: float,
+                 width: int = 512, height: int = 512, frame_count: Optional[int] = None):
+        self.name = name
+        self.type = "audio"
+        self.frame_rate = frame_rate
+        self.width = width
+        self.height = height
+        self._source = raw_data if callable(raw_data) else None
+        self._raw_data = None if callable(raw_data) else raw_data
+        self.frame_count = frame_count if frame_count is not None else len(raw_data)
+        self._data = None
+
+    @property
+    def raw_data(self) -> np.ndarray:
+        if self._raw_data is None:
+            self._raw_data = self._source()
+            self._source = None
+        return self._raw_data
+
+    @property
+    def data(self) -> np.ndarray:
+        if self._data is None:
+            self.normalize()
+        return self._data
+
+    def extract(self):
+        return self
+
+    def normalize(self):
+        low, high = float(np.min(self.raw_data)), float(np.max(self.raw_data))
+        self.min_value, self.max_value = low, high
+        if high > low:
+            self._data = (self.raw_data - low) / (high - low)
+        else:
+            self._data = np.zeros_like(self.raw_data)
+        return self
+
+    def get_value_at_frame(self, frame_index: int) -> float:
+        if self.frame_count == 0:
+            return 0.0
+        return float(self.data[min(max(int(frame_index), 0), self.frame_count - 1)])
+
+
+def extract_feature(audio: np.ndarray, sample_rate: int, feature_type: str = "rms_energy", fps: float = 30.0,
+                    frame_count: int = 0, width: int = 512, height: int = 512,
+                    envelope: Optional[np.ndarray] = None) -> AudioEnvelopeFeature:
+    """Build the FEATURE output of a synthesis node from its final waveform.
+
+    ``envelope`` is the already computed envelope (from an ``EnvelopeTracker``);
+    without it the envelope is computed from ``audio`` on first use.
+    """
+    if feature_type not in FEATURE_TYPES:
+        raise ValueError(f"Unknown feature type: {feature_type}")
+    frames = feature_frame_count(len(audio), sample_rate, fps, frame_count)
+    if envelope is None:
+        envelope = lambda: frame_envelope(audio, sample_rate, fps, feature_type, frames)
+    return AudioEnvelopeFeature(feature_type, envelope, fps, width, height, frames)
@@ -0,0 +1,133 @@
+"""
+DJZ-Speak filter engine
+Linear-phase FIR filter banks designed once per (sample rate, profile) and
+applied with FFT overlap-add in fixed blocks with carried state, so the same
+filter serves single-shot, batched and streaming processing.
+"""
+
+import numpy as np
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+
+# Band-limited "vintage computer" sound: 300Hz-3kHz speech band
+DEFAULT_FILTER_PROFILE = {
+    "bands": [(300.0, 3000.0, 1.0)],
+    "taps": 255
+}
+
+DEFAULT_BLOCK_SIZE = 4096
+
+
+def profile_key(profile: Optional[Dict[str, Any]]) -> Tuple:
+    """Hashable form of a filter profile from the voice preset table."""
+    profile = profile or DEFAULT_FILTER_PROFILE
+    bands = tuple((float(low), float(high), float(gain)) for low, high, gain in profile.get("bands", DEFAULT_FILTER_PROFILE["bands"]))
+    taps = int(profile.get("taps", DEFAULT_FILTER_PROFILE["taps"])) | 1  # odd length keeps the delay integral
+    return bands, taps
+
+
+def _windowed_lowpass(cutoff: float, sample_rate: int, taps: int) -> np.ndarray:
+    """Windowed-sinc low-pass kernel with unity DC gain."""
+    nyquist = sample_rate / 2.0
+    if cutoff >= nyquist:
+        kernel = np.zeros(taps)
+        kernel[taps // 2] = 1.0
+        return kernel
+    n = np.arange(taps) - (taps - 1) / 2.0
+    kernel = np.sinc(2.0 * cutoff / sample_rate * n) * np.blackman(taps)
+    return kernel / np.sum(kernel)
+
+
+@lru_cache(maxsize=64)
+def design_filter_bank(sample_rate: int, key: Tuple) -> np.ndarray:
+    """Sum of band-pass kernels for a profile key; cached per (sample rate, profile)."""
+    bands, taps = key
+    kernel = np.zeros(taps)
+    for low, high, gain in bands:
+        band = _windowed_lowpass(high, sample_rate, taps)
+        if low > 0:
+            band = band - _windowed_lowpass(low, sample_rate, taps)
+        kernel += gain * band
+    kernel.setflags(write=False)
+    return kernel
+
+
+@lru_cache(maxsize=128)
+def _mixed_kernel(sample_rate: int, key: Tuple, wet: float) -> np.ndarray:
+    """Filter bank blended with a delayed dry path, folded into a single kernel."""
+    kernel = design_filter_bank(sample_rate, key) * wet
+    kernel[len(kernel) // 2] += 1.0 - wet
+    kernel = kernel.astype(np.float32)
+    kernel.setflags(write=False)
+    return kernel
+
+
+@lru_cache(maxsize=128)
+def _kernel_spectrum(sample_rate: int, key: Tuple, wet: float, fft_size: int) -> np.ndarray:
+    spectrum = np.fft.rfft(_mixed_kernel(sample_rate, key, wet), n=fft_size)
+    spectrum.setflags(write=False)
+    return spectrum
+
+
+class FIRFilter:
+    """Streaming FFT overlap-add FIR filter.
+
+    Input is consumed in fixed blocks; partial blocks and the convolution
+    tail are carried between ``process`` calls. Output lags input by
+    ``delay`` samples (the linear-phase group delay).
+    """
+
+    def __init__(self, sample_rate: int, profile: Optional[Dict[str, Any]] = None, wet: float = 1.0,
+                 block_size: int = DEFAULT_BLOCK_SIZE):
+        self.key = profile_key(profile)
+        self.wet = round(float(np.clip(wet, 0.0, 1.0)), 3)
+        self.kernel = _mixed_kernel(int(sample_rate), self.key, self.wet)
+        taps = len(self.kernel)
+        self.block_size = max(int(block_size), taps)
+        self.fft_size = 1 << int(np.ceil(np.log2(self.block_size + taps - 1)))
+        self.spectrum = _kernel_spectrum(int(sample_rate), self.key, self.wet, self.fft_size)
+        self.reset()
+
+    @property
+    def delay(self) -> int:
+        return (len(self.kernel) - 1) // 2
+
+    def reset(self):
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._tail = np.zeros(len(self.kernel) - 1, dtype=np.float32)
+
+    def _convolve_blocks(self, samples: np.ndarray) -> np.ndarray:
+        """Overlap-add convolution of whole blocks, including the carried tail."""
+        n_blocks = len(samples) // self.block_size
+        block, overlap = self.block_size, len(self.kernel) - 1
+        blocks = samples.reshape(n_blocks, block)
+        convolved = np.fft.irfft(np.fft.rfft(blocks, n=self.fft_size, axis=1) * self.spectrum, n=self.fft_size, axis=1)
+
+        out = np.zeros((n_blocks + 1) * block, dtype=np.float32)
+        out[:n_blocks * block] = convolved[:, :block].ravel()
+        tails = np.zeros((n_blocks, block), dtype=np.float32)
+        tails[:, :overlap] = convolved[:, block:block + overlap]
+        out[block:] += tails.ravel()
+        out[:overlap] += self._tail
+        return out[:n_blocks * block + overlap]
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        """Filter one chunk, returning every whole block that is now complete."""
+        samples = np.concatenate((self._pending, np.asarray(chunk, dtype=np.float32)))
+        n_ready = (len(samples) // self.block_size) * self.block_size
+        self._pending = samples[n_ready:]
+        if n_ready == 0:
+            return np.zeros(0, dtype=np.float32)
+        out = self._convolve_blocks(samples[:n_ready])
+        self._tail = out[n_ready:].copy()
+        return out[:n_ready]
+
+    def flush(self) -> np.ndarray:
+        """Drain the partial block and the convolution tail."""
+        n_pending = len(self._pending)
+        padded = np.zeros(self.block_size, dtype=np.float32)
+        padded[:n_pending] = self._pending
+        out = self._convolve_blocks(padded)
+        self.reset()
+        return out[:n_pending + len(self.kernel) - 1]
@@ -0,0 +1,174 @@
+"""
+DJZ-Speak resource governor
+Bounds what a single synthesis request can consume on a shared server:
+text-length-aware deadlines, text passed on stdin instead of argv, per-job
+CPU/memory rlimits on the eSpeak-NG process, and a global concurrency cap
+with a bounded queue wait. Slots are handed out shortest-job-first with
+aging (``djz_scheduler``), and long texts run as chunks, split at
+punctuation, that each queue for a slot; by default the chunks render
+concurrently, and they are joined with seamless splices (``djz_splice``). In
+partial-result mode a job that hits its deadline or the text limit returns
+the audio produced so far instead of failing the whole prompt.
+"""
+
+import os
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from .djz_scheduler import SJFScheduler, estimate_cost
+from .djz_splice import splice_wav
+from .djz_text import chunk_text
+
+try:
+    import resource
+except ImportError:  # Windows - deadlines and the concurrency cap still apply
+    resource = None
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+class SynthesisGovernor:
+    """Admission control and resource limits around eSpeak-NG processes."""
+
+    def __init__(self, max_concurrent: Optional[int] = None, queue_timeout: float = 60.0,
+                 base_timeout: float = 5.0, seconds_per_char: float = 0.01, max_timeout: float = 300.0,
+                 max_chars: int = 100000, memory_limit_mb: int = 512, partial_results: bool = False,
+                 chunk_chars: int = 600, aging_rate: float = 0.25, parallel_chunks: bool = True):
+        self.max_concurrent = max(1, max_concurrent or os.cpu_count() or 1)
+        self.queue_timeout = queue_timeout
+        self.base_timeout = base_timeout
+        self.seconds_per_char = seconds_per_char
+        self.max_timeout = max_timeout
+        self.max_chars = max_chars
+        self.memory_limit_mb = memory_limit_mb
+        self.partial_results = partial_results
+        self.chunk_chars = chunk_chars
+        self.parallel_chunks = parallel_chunks
+        self.scheduler = SJFScheduler(self.max_concurrent, aging_rate)
+
+    def signature(self) -> str:
+        """Settings that shape the rendered audio, for cache fingerprints."""
+        return f"chunks={self.chunk_chars}; parallel={int(self.parallel_chunks)}"
+
+    def deadline_for(self, text: str) -> float:
+        """Wall-clock budget for synthesizing ``text``."""
+        return min(self.base_timeout + self.seconds_per_char * len(text), self.max_timeout)
+
+    def _apply_rlimits(self, pid: int, deadline: float):
+        """Cap CPU time and address space of a running worker (Linux prlimit)."""
+        if resource is None or not hasattr(resource, 'prlimit'):
+            return
+        try:
+            cpu_seconds = int(deadline) + 1
+            resource.prlimit(pid, resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+            if self.memory_limit_mb:
+                memory_bytes = self.memory_limit_mb * 1024 * 1024
+                resource.prlimit(pid, resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+        except (OSError, ValueError) as e:
+            # The process may already have exited; limits are best effort
+            print(f"Warning: Could not apply resource limits to eSpeak-NG: {e}")
+
+    def run_espeak(self, cmd: List[str], text: str, speed: Optional[int] = None, effects: bool = False) -> Tuple[bytes, bool]:
+        """Run an eSpeak-NG command with ``text`` on stdin.
+
+        Returns the WAV bytes and whether they are a partial result. Raises
+        ``subprocess.TimeoutExpired`` / ``subprocess.CalledProcessError`` like
+        ``subprocess.run`` so callers keep their existing error handling.
+        ``speed`` and ``effects`` feed the scheduler's cost estimate.
+        """
+        partial = False
+        if len(text) > self.max_chars:
+            if not self.partial_results:
+                raise ValueError(f"Text too long for synthesis ({len(text)} > {self.max_chars} characters)")
+            cut = text.rfind(' ', 0, self.max_chars)
+            text = text[:cut if cut > 0 else self.max_chars]
+            partial = True
+
+        # Long texts run as chunks that each queue for a slot, so short jobs can get in between
+        if self.chunk_chars and len(text) > self.chunk_chars:
+            chunks = chunk_text(text, self.chunk_chars)
+        else:
+            chunks = [text]
+        costs = [estimate_cost(chunk, speed, effects) for chunk in chunks]
+        if len(chunks) > 1 and self.parallel_chunks:
+            # Chunks end at punctuation, so they can render side by side; the slots still cap processes
+            with ThreadPoolExecutor(max_workers=min(len(chunks), self.max_concurrent)) as pool:
+                results = list(pool.map(self._run_chunk, [cmd] * len(chunks), chunks, costs))
+        else:
+            results = []
+            for chunk, cost in zip(chunks, costs):
+                results.append(self._run_chunk(cmd, chunk, cost))
+                if results[-1][1]:
+                    break
+
+        # Keep the audio up to the first chunk that was cut short
+        outputs = []
+        for wav_bytes, chunk_partial in results:
+            outputs.append(wav_bytes)
+            if chunk_partial:
+                partial = True
+                break
+        return (outputs[0] if len(outputs) == 1 else splice_wav(outputs)), partial
+
+    def _run_chunk(self, cmd: List[str], text: str, cost: float) -> Tuple[bytes, bool]:
+        if not self.scheduler.acquire(cost, timeout=self.queue_timeout):
+            raise ValueError(f"Synthesis queue is full ({self.max_concurrent} jobs running); try again later")
+        try:
+            deadline = self.deadline_for(text)
+            full_cmd = list(cmd) + ['--stdin']
+            process = subprocess.Popen(full_cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            self._apply_rlimits(process.pid, deadline)
+            try:
+                stdout, stderr = process.communicate(text.encode('utf-8'), timeout=deadline)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                stdout, stderr = process.communicate()
+                # 44-byte RIFF header plus at least some PCM
+                if self.partial_results and stdout and len(stdout) > 44:
+                    print(f"Warning: eSpeak-NG hit its {deadline:.1f}s deadline, returning partial audio")
+                    return stdout, True
+                raise subprocess.TimeoutExpired(full_cmd, deadline, output=stdout, stderr=stderr)
+
+            if process.returncode != 0:
+                raise subprocess.CalledProcessError(process.returncode, full_cmd, output=stdout, stderr=stderr)
+            return stdout, False
+        finally:
+            self.scheduler.release()
+
+
+_shared_governor = None
+_shared_governor_lock = threading.Lock()
+
+
+def get_governor() -> SynthesisGovernor:
+    """Process-wide governor shared by all node instances.
+
+    Configured from ``DJZ_SPEAK_MAX_CONCURRENT``, ``DJZ_SPEAK_QUEUE_TIMEOUT``,
+    ``DJZ_SPEAK_MAX_CHARS``, ``DJZ_SPEAK_MEMORY_LIMIT_MB``,
+    ``DJZ_SPEAK_PARTIAL=1`` (partial-result mode), ``DJZ_SPEAK_CHUNK_CHARS``
+    (0 disables chunking), ``DJZ_SPEAK_AGING_RATE`` and
+    ``DJZ_SPEAK_PARALLEL_CHUNKS=0`` (render chunks one after another).
+    """
+    global _shared_governor
+    if _shared_governor is not None:
+        return _shared_governor
+    with _shared_governor_lock:
+        if _shared_governor is None:
+            _shared_governor = SynthesisGovernor(
+                max_concurrent=int(_env_float("DJZ_SPEAK_MAX_CONCURRENT", 0)) or None,
+                queue_timeout=_env_float("DJZ_SPEAK_QUEUE_TIMEOUT", 60.0),
+                max_chars=int(_env_float("DJZ_SPEAK_MAX_CHARS", 100000)),
+                memory_limit_mb=int(_env_float("DJZ_SPEAK_MEMORY_LIMIT_MB", 512)),
+                partial_results=os.environ.get("DJZ_SPEAK_PARTIAL", "0") == "1",
+                chunk_chars=int(_env_float("DJZ_SPEAK_CHUNK_CHARS", 600)),
+                aging_rate=_env_float("DJZ_SPEAK_AGING_RATE", 0.25),
+                parallel_chunks=os.environ.get("DJZ_SPEAK_PARALLEL_CHUNKS", "1") != "0"
+            )
+        return _shared_governor
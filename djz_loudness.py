@@ -0,0 +1,129 @@
+"""
+DJZ-Speak loudness processing
+Gated block RMS loudness measurement and a look-ahead peak limiter that
+works on chunks with carried state. Loudness is measured once over the
+whole signal and turned into one constant gain (see
+``djz_effects.EffectPlan.gain_for``); streaming renders take that gain up
+front, so single-shot, batched and streaming renders all land at the same
+loudness.
+"""
+
+import numpy as np
+from typing import Optional
+
+
+# Gating constants follow the ITU-R BS.1770 scheme (applied to plain RMS, no K-weighting)
+ABSOLUTE_GATE_DB = -70.0
+RELATIVE_GATE_DB = -10.0
+
+# Most gain normalization may apply; quiet or near-silent renders are not pushed up into noise
+MAX_GAIN_DB = 24.0
+
+
+def _mean_square_to_db(mean_square: float) -> float:
+    return float(10.0 * np.log10(max(mean_square, 1e-12)))
+
+
+def _block_mean_squares(audio: np.ndarray, block_size: int) -> np.ndarray:
+    """Mean square of each complete block of audio (trailing partial block is ignored)."""
+    n_blocks = len(audio) // block_size
+    if n_blocks == 0:
+        return np.zeros(0, dtype=np.float64)
+    blocks = audio[:n_blocks * block_size].reshape(n_blocks, block_size)
+    return np.einsum('ij,ij->i', blocks, blocks, dtype=np.float64) / block_size
+
+
+def _gated_loudness_db(block_energies: np.ndarray) -> Optional[float]:
+    """Integrated loudness of gated block energies, or None if everything is below the gate."""
+    if len(block_energies) == 0:
+        return None
+    absolute = block_energies[block_energies > 10.0 ** (ABSOLUTE_GATE_DB / 10.0)]
+    if len(absolute) == 0:
+        return None
+    relative_gate = np.mean(absolute) * 10.0 ** (RELATIVE_GATE_DB / 10.0)
+    gated = absolute[absolute > relative_gate]
+    if len(gated) == 0:
+        gated = absolute
+    return _mean_square_to_db(float(np.mean(gated)))
+
+
+def measure_loudness(audio: np.ndarray, sample_rate: int, block_ms: float = 100.0) -> Optional[float]:
+    """Gated RMS loudness of a whole signal in dBFS (None for silence)."""
+    block_size = max(1, int(sample_rate * block_ms / 1000.0))
+    energies = _block_mean_squares(np.asarray(audio, dtype=np.float32), block_size)
+    if len(energies) == 0 and len(audio) > 0:
+        # Shorter than one block - measure what we have
+        energies = np.array([float(np.mean(np.square(audio, dtype=np.float64)))])
+    return _gated_loudness_db(energies)
+
+
+def _sliding_min(values: np.ndarray, window: int) -> np.ndarray:
+    """Forward sliding minimum (van Herk/Gil-Werman), out[i] = min(values[i:i+window])."""
+    n_out = len(values) - window + 1
+    if window <= 1 or n_out <= 0:
+        return values[:max(n_out, 0)].copy()
+    n_blocks = -(-len(values) // window)
+    padded = np.full(n_blocks * window, np.inf, dtype=values.dtype)
+    padded[:len(values)] = values
+    blocks = padded.reshape(n_blocks, window)
+    prefix = np.minimum.accumulate(blocks, axis=1).ravel()
+    suffix = np.minimum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+    return np.minimum(suffix[:n_out], prefix[window - 1:window - 1 + n_out])
+
+
+class LookaheadLimiter:
+    """Streaming look-ahead peak limiter.
+
+    The gain curve is the sliding minimum of the required gain over the
+    look-ahead window, smoothed by a box filter of the same length, which
+    guarantees the ceiling is never exceeded. Output lags input by
+    ``lookahead - 1`` samples; call ``flush`` to drain the tail.
+    """
+
+    def __init__(self, sample_rate: int, ceiling: float = 0.95, lookahead_ms: float = 5.0):
+        self.ceiling = float(ceiling)
+        self.lookahead = max(1, int(sample_rate * lookahead_ms / 1000.0))
+        self.reset()
+
+    def reset(self):
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._gain_history = None
+
+    @property
+    def latency(self) -> int:
+        return self.lookahead - 1
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        """Limit one chunk, returning the samples that are now fully resolved."""
+        samples = np.concatenate((self._pending, np.asarray(chunk, dtype=np.float32)))
+        if len(samples) < self.lookahead:
+            self._pending = samples
+            return np.zeros(0, dtype=np.float32)
+
+        magnitude = np.abs(samples)
+        required = np.ones_like(magnitude)
+        over = magnitude > self.ceiling
+        required[over] = self.ceiling / magnitude[over]
+
+        held = _sliding_min(required, self.lookahead)
+        if self._gain_history is None:
+            # Nothing came before: hold the first gain so the opening samples are limited too
+            self._gain_history = np.full(self.lookahead - 1, held[0], dtype=np.float32)
+        history = np.concatenate((self._gain_history, held))
+        cumulative = np.concatenate(([0.0], np.cumsum(history, dtype=np.float64)))
+        smoothed = (cumulative[self.lookahead:] - cumulative[:-self.lookahead]) / self.lookahead
+
+        n_ready = len(held)
+        self._gain_history = history[len(history) - (self.lookahead - 1):] if self.lookahead > 1 else history[:0]
+        self._pending = samples[n_ready:]
+        return (samples[:n_ready] * smoothed).astype(np.float32)
+
+    def flush(self) -> np.ndarray:
+        """Drain the look-ahead buffer."""
+        if self.lookahead <= 1 or len(self._pending) == 0:
+            tail, self._pending = self._pending, np.zeros(0, dtype=np.float32)
+            return np.clip(tail, -self.ceiling, self.ceiling)
+        n_tail = len(self._pending)
+        out = self.process(np.zeros(self.lookahead - 1, dtype=np.float32))
+        self.reset()
+        return out[:n_tail]
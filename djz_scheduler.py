@@ -0,0 +1,124 @@
+"""
+DJZ-Speak job scheduler
+Shortest-job-first admission for synthesis slots. Each job carries a cost
+estimate (from text length, speaking rate and whether effects run after
+synthesis); when a slot frees up it goes to the waiting job with the lowest
+cost, less an aging credit for the time it has waited, so a three-word alert
+does not sit behind a long narration while long renders still progress. The
+governor splits long texts into chunks that are admitted one at a time, so a
+narration yields the slot between chunks.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+# Rough eSpeak-NG cost model, in seconds: process start-up plus a real-time factor
+PROCESS_OVERHEAD = 0.02
+SYNTHESIS_RTF = 0.05
+EFFECTS_FACTOR = 3.0
+CHARS_PER_WORD = 6.0
+
+
+def estimate_cost(text: str, speed: Optional[int] = None, effects: bool = False) -> float:
+    """Estimated seconds of work to synthesize ``text`` at ``speed`` words per minute."""
+    words = max(1.0, len(text) / CHARS_PER_WORD)
+    audio_seconds = words * 60.0 / max(int(speed or 140), 1)
+    return PROCESS_OVERHEAD + audio_seconds * SYNTHESIS_RTF * (EFFECTS_FACTOR if effects else 1.0)
+
+
+class _Waiter:
+    __slots__ = ("cost", "enqueued", "event", "granted")
+
+    def __init__(self, cost: float, enqueued: float):
+        self.cost = cost
+        self.enqueued = enqueued
+        self.event = threading.Event()
+        self.granted = False
+
+
+class SJFScheduler:
+    """Fixed number of slots handed out shortest-job-first with linear aging.
+
+    A waiting job's priority is ``cost - aging_rate * waited``; since every
+    job ages at the same rate this orders the same as the static key
+    ``cost + aging_rate * enqueued``, so the queue is a plain heap.
+    """
+
+    def __init__(self, slots: int, aging_rate: float = 0.25, window: int = 1024,
+                 clock: Callable[[], float] = time.monotonic):
+        self.slots = max(1, slots)
+        self.aging_rate = aging_rate
+        self.clock = clock
+        self._free = self.slots
+        self._queue = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=window)
+        self.admitted = 0
+        self.timed_out = 0
+
+    def acquire(self, cost: float, timeout: Optional[float] = None) -> bool:
+        """Wait for a slot; False if ``timeout`` seconds pass first."""
+        enqueued = self.clock()
+        with self._lock:
+            if self._free and not self._queue:
+                self._free -= 1
+                self._record(0.0)
+                return True
+            waiter = _Waiter(cost, enqueued)
+            entry = (cost + self.aging_rate * enqueued, next(self._sequence), waiter)
+            heapq.heappush(self._queue, entry)
+
+        waiter.event.wait(timeout)
+        with self._lock:
+            if not waiter.granted:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                self.timed_out += 1
+                return False
+            self._record(self.clock() - enqueued)
+            return True
+
+    def release(self):
+        with self._lock:
+            if self._queue:
+                _, _, waiter = heapq.heappop(self._queue)
+                waiter.granted = True  # the slot passes straight to the next job
+                waiter.event.set()
+            else:
+                self._free += 1
+
+    def _record(self, wait: float):
+        self.admitted += 1
+        self._waits.append(wait)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, slot use and wait times over the recent admission window."""
+        now = self.clock()
+        with self._lock:
+            waits = sorted(self._waits)
+            depth = len(self._queue)
+            queued_cost = sum(waiter.cost for _, _, waiter in self._queue)
+            oldest = max((now - waiter.enqueued for _, _, waiter in self._queue), default=0.0)
+            running = self.slots - self._free
+
+        def percentile(q: float) -> float:
+            return waits[min(len(waits) - 1, int(q * len(waits)))] if waits else 0.0
+
+        return {
+            "slots": self.slots,
+            "running": running,
+            "queue_depth": depth,
+            "queued_cost": round(queued_cost, 3),
+            "oldest_wait": round(oldest, 3),
+            "admitted": self.admitted,
+            "timed_out": self.timed_out,
+            "wait_mean": round(sum(waits) / len(waits), 4) if waits else 0.0,
+            "wait_p50": round(percentile(0.5), 4),
+            "wait_p95": round(percentile(0.95), 4),
+            "wait_max": round(waits[-1], 4) if waits else 0.0,
+        }
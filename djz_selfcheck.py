@@ -0,0 +1,106 @@
+"""
+DJZ-Speak offline self-check
+Smoke check for an installed node folder that runs without eSpeak-NG,
+driven through the real node classes with the deterministic fake engine
+(``DJZ_SPEAK_ENGINE=fake``) and an in-memory cache:
+
+    python -m djz_cli selfcheck --workers 4 --min-rate 20
+
+Renders one line through each node and checks a throughput floor. The
+regression suite (outputs, parity, caching, store, splicing) lives in
+``tests/`` and runs with ``python -m pytest tests``.
+``run_stress`` drives one shared node instance from a growing number of
+threads to show how throughput scales (``python -m djz_cli stress``).
+"""
+
+import hashlib
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+from .djz_cache import get_synthesis_cache
+
+CHECK_VOICES = ("classic_robot", "hal9000", "countdown", "binary_whisper", "space_station")
+CHECK_TEXT = "Warning. Reactor core at 97 percent, Dr. Chandra requests 3 technicians."
+
+
+def _waveform(output) -> np.ndarray:
+    return output[0]["waveform"][0].cpu().numpy()
+
+
+def check_smoke(nodes: Dict[str, Any], workers: int) -> str:
+    """One line through each node; the full regression suite lives in tests/."""
+    for node_class, args in ((nodes["DJZSpeak_v1"], (CHECK_TEXT, "classic_robot", 140, 35)),
+                             (nodes["DJZSpeak_v2"], (CHECK_TEXT, "classic_robot", 140, 35, True))):
+        audio, feature, frame_count = node_class().synthesize(*args)
+        samples = audio["waveform"][0, 0].numpy()
+        assert len(samples) and np.all(np.isfinite(samples)), f"{node_class.__name__} rendered no usable audio"
+        assert frame_count == feature.frame_count, f"{node_class.__name__} reported the wrong feature frame count"
+    return "v1 and v2 render"
+
+
+def check_throughput(nodes: Dict[str, Any], workers: int, min_rate: float = 0.0) -> str:
+    node_class = nodes["DJZSpeak_v2"]
+    get_synthesis_cache().clear()
+    texts = [f"Throughput line {i}: {CHECK_TEXT}" for i in range(workers * 8)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda text: node_class().synthesize(text, "modern_ai", 160, 45, True), texts))
+    rate = len(texts) / max(time.perf_counter() - started, 1e-9)
+    assert rate >= min_rate, f"{rate:.1f} lines/s is below the {min_rate:.1f} lines/s floor"
+    return f"{rate:.1f} lines/s"
+
+
+CHECKS: List[Tuple[str, Callable]] = [
+    ("smoke", check_smoke),
+    ("throughput", check_throughput),
+]
+
+
+def run_selfcheck(nodes: Dict[str, Any], workers: int = 4, min_rate: float = 0.0) -> List[Tuple[str, bool, str]]:
+    """Run every check; returns (name, passed, detail) per check."""
+    results = []
+    for name, check in CHECKS:
+        try:
+            detail = check(nodes, workers, min_rate) if check is check_throughput else check(nodes, workers)
+            results.append((name, True, detail))
+        except Exception as e:
+            results.append((name, False, str(e) or type(e).__name__))
+    return results
+
+
+def run_stress(nodes: Dict[str, Any], calls: int = 400, max_threads: int = 8) -> List[Tuple[int, float, float]]:
+    """Render ``calls`` distinct lines through one shared v2 instance at 1, 2, 4 ... ``max_threads`` threads.
+
+    Every level must reproduce the single-threaded audio exactly. Returns
+    (threads, lines/s, speedup over one thread) per level.
+    """
+    node = nodes["DJZSpeak_v2"]()
+    cache = get_synthesis_cache()
+    texts = [f"Stress line {i}. {CHECK_TEXT}" for i in range(calls)]
+
+    def render(text):
+        audio = _waveform(node.synthesize(text, "hal9000", 120, 30, True))
+        return hashlib.sha256(audio.tobytes()).digest()
+
+    levels, threads = [], 1
+    while threads < max_threads:
+        levels.append(threads)
+        threads *= 2
+    levels.append(max_threads)
+
+    results, reference = [], None
+    for threads in levels:
+        cache.clear()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            digests = list(pool.map(render, texts))
+        rate = calls / max(time.perf_counter() - started, 1e-9)
+        if reference is None:
+            reference = digests
+        mismatched = sum(a != b for a, b in zip(reference, digests))
+        assert not mismatched, f"{mismatched} of {calls} renders differ at {threads} threads"
+        results.append((threads, rate, rate / results[0][1] if results else 1.0))
+    return results
+
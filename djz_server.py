@@ -0,0 +1,280 @@
+"""
+DJZ-Speak synthesis service
+A small asyncio HTTP/1.1 server around the node classes so several ComfyUI
+instances and other frontends can share one set of eSpeak-NG workers.
+Identical in-flight requests are coalesced into a single synthesis
+(single-flight). ``SpeakClient`` keeps a pool of keep-alive connections,
+and the nodes delegate to the service when ``DJZ_SPEAK_SERVER`` is set.
+
+    python -m djz_cli serve --port 8765
+
+POST /synthesize with a JSON body of node inputs (plus ``"node": "v1"|"v2"``)
+returns ``audio/wav``, or raw little-endian float32 PCM with ``?format=pcm``
+(``X-Sample-Rate`` and ``X-Channels`` headers describe it).
+"""
+
+import asyncio
+import http.client
+import io
+import json
+import os
+import queue
+import threading
+import wave
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .djz_governor import get_governor
+
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 1024 * 1024
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+# Set inside the server process so its own nodes never delegate back to it
+_serving = False
+
+
+def _encode_wav(audio: np.ndarray, sample_rate: int) -> bytes:
+    """[channels, samples] float audio as 16-bit PCM WAV bytes."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav_file:
+        wav_file.setnchannels(audio.shape[0])
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes((np.clip(audio.T, -1.0, 1.0) * 32767.0).astype('<i2').tobytes())
+    return buffer.getvalue()
+
+
+class SynthesisService:
+    """Runs node synthesis on a thread pool with single-flight request coalescing."""
+
+    def __init__(self, node_classes: Dict[str, Any], workers: Optional[int] = None):
+        self.node_classes = node_classes
+        self.executor = ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1)
+        self._local = threading.local()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.requests = 0
+        self.coalesced = 0
+
+    def _node(self, name: str):
+        nodes = self._local.__dict__.setdefault("nodes", {})
+        if name not in nodes:
+            nodes[name] = self.node_classes[name]()
+        return nodes[name]
+
+    def _inputs(self, node_class, payload: Dict[str, Any]) -> Dict[str, Any]:
+        spec = node_class.INPUT_TYPES()
+        names = list(spec["required"]) + list(spec.get("optional", {}))
+        missing = [name for name in spec["required"] if name not in payload]
+        if missing:
+            raise ValueError(f"Missing inputs: {', '.join(missing)}")
+        return {name: payload[name] for name in names if name in payload}
+
+    def _render(self, name: str, inputs: Dict[str, Any]) -> Tuple[np.ndarray, int]:
+        audio = self._node(name).synthesize(**inputs)[0]
+        return audio["waveform"][0].cpu().numpy(), audio["sample_rate"]
+
+    async def synthesize(self, payload: Dict[str, Any]) -> Tuple[np.ndarray, int]:
+        if not isinstance(payload, dict):
+            raise ValueError("Request body must be a JSON object")
+        name = f"DJZSpeak_{payload.get('node', 'v1')}"
+        if name not in self.node_classes:
+            raise ValueError(f"Unknown node: {payload.get('node')}")
+        node_class = self.node_classes[name]
+        inputs = self._inputs(node_class, payload)
+        loop = asyncio.get_running_loop()
+        # Text normalization and the executable lookup stay off the event loop
+        key = f"{name}:{await loop.run_in_executor(self.executor, partial(node_class.IS_CHANGED, **inputs))}"
+        self.requests += 1
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        future = loop.run_in_executor(self.executor, self._render, name, inputs)
+        self._inflight[key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            self._inflight.pop(key, None)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve HTTP/1.1 requests on one keep-alive connection."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode('latin-1').rstrip('\r\n').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length', 0))
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"error": "Request body too large"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                await self._dispatch(writer, method, target, body, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, writer, method: str, target: str, body: bytes, keep_alive: bool):
+        url = urlsplit(target)
+        if url.path == '/health':
+            stats = {"status": "ok", "requests": self.requests, "coalesced": self.coalesced, "inflight": len(self._inflight),
+                     "scheduler": get_governor().scheduler.metrics()}
+            await self._respond(writer, 200, stats, keep_alive=keep_alive)
+            return
+        if url.path != '/synthesize':
+            await self._respond(writer, 404, {"error": "Not found"}, keep_alive=keep_alive)
+            return
+        if method != 'POST':
+            await self._respond(writer, 405, {"error": "Use POST"}, keep_alive=keep_alive)
+            return
+
+        try:
+            payload = json.loads(body or b'{}')
+            audio, sample_rate = await self.synthesize(payload)
+        except ValueError as e:
+            await self._respond(writer, 400, {"error": str(e)}, keep_alive=keep_alive)
+            return
+        except Exception as e:
+            await self._respond(writer, 500, {"error": str(e)}, keep_alive=keep_alive)
+            return
+
+        audio_format = parse_qs(url.query).get('format', [payload.get('format', 'wav')])[0]
+        if audio_format == 'pcm':
+            data = np.ascontiguousarray(audio.T, dtype='<f4').tobytes()
+            extra = {"Content-Type": "application/octet-stream", "X-Sample-Rate": str(sample_rate), "X-Channels": str(audio.shape[0])}
+        else:
+            data = _encode_wav(audio, sample_rate)
+            extra = {"Content-Type": "audio/wav"}
+        await self._respond(writer, 200, data, extra, keep_alive)
+
+    async def _respond(self, writer, status: int, body, extra_headers: Optional[Dict[str, str]] = None, keep_alive: bool = True):
+        if isinstance(body, dict):
+            body = json.dumps(body).encode('utf-8')
+            extra_headers = {"Content-Type": "application/json"}
+        headers = {"Content-Length": str(len(body)), "Connection": "keep-alive" if keep_alive else "close"}
+        headers.update(extra_headers or {})
+        head = f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n" + "".join(f"{k}: {v}\r\n" for k, v in headers.items()) + "\r\n"
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+
+async def _serve(service: SynthesisService, host: str, port: int):
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    print(f"DJZ-Speak service listening on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def run_server(node_classes: Dict[str, Any], host: str = "127.0.0.1", port: int = DEFAULT_PORT, workers: Optional[int] = None):
+    """Serve synthesis requests until interrupted."""
+    global _serving
+    _serving = True
+    service = SynthesisService(node_classes, workers)
+    try:
+        asyncio.run(_serve(service, host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.executor.shutdown(wait=False)
+
+
+# Errors a keep-alive connection the server already closed raises before any response arrives
+STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, ConnectionAbortedError, BrokenPipeError)
+
+
+class SpeakClient:
+    """Client for the synthesis service with a pool of keep-alive connections."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, pool_size: int = 4, timeout: float = 330.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+
+    def _connection(self) -> Tuple[http.client.HTTPConnection, bool]:
+        """A pooled keep-alive connection (and True), or a new one (and False)."""
+        try:
+            return self._pool.get_nowait(), True
+        except queue.Empty:
+            return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout), False
+
+    def _release(self, connection: http.client.HTTPConnection):
+        try:
+            self._pool.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def synthesize(self, node: str, **inputs) -> Tuple[np.ndarray, int]:
+        """Render on the service; returns [channels, samples] float32 audio and the sample rate.
+
+        A request is only sent again when a pooled connection turns out to be
+        stale, i.e. it is reset or closed before any response bytes arrive.
+        Timeouts and failures after the response has started are never
+        retried, since the server may still be rendering the first request.
+        """
+        body = json.dumps(dict(inputs, node=node)).encode('utf-8')
+        while True:
+            connection, reused = self._connection()
+            try:
+                connection.request('POST', '/synthesize?format=pcm', body, {"Content-Type": "application/json"})
+                response = connection.getresponse()
+            except STALE_CONNECTION_ERRORS as e:
+                connection.close()
+                if reused:
+                    continue
+                raise ConnectionError(f"DJZ-Speak service unreachable: {e}") from e
+            except (http.client.HTTPException, OSError) as e:
+                connection.close()
+                raise ConnectionError(f"DJZ-Speak service unreachable: {e}") from e
+            try:
+                data = response.read()
+            except (http.client.HTTPException, OSError) as e:
+                connection.close()
+                raise ConnectionError(f"DJZ-Speak service response failed: {e}") from e
+            if response.getheader('Connection', '').lower() == 'close':
+                connection.close()
+            else:
+                self._release(connection)
+            if response.status != 200:
+                raise ValueError(f"DJZ-Speak service error {response.status}: {json.loads(data).get('error', '')}")
+            channels = int(response.getheader('X-Channels', 1))
+            audio = np.frombuffer(data, dtype='<f4').reshape(-1, channels).T
+            return audio, int(response.getheader('X-Sample-Rate', 22050))
+
+
+_shared_client = None
+_shared_client_lock = threading.Lock()
+
+
+def get_client() -> Optional[SpeakClient]:
+    """Client for ``DJZ_SPEAK_SERVER`` (host:port), or None when nodes should synthesize locally."""
+    global _shared_client
+    address = os.environ.get("DJZ_SPEAK_SERVER")
+    if not address or _serving:
+        return None
+    if _shared_client is not None:
+        return _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            host, _, port = address.partition(':')
+            _shared_client = SpeakClient(host or "127.0.0.1", int(port or DEFAULT_PORT))
+        return _shared_client
@@ -0,0 +1,111 @@
+"""
+DJZ-Speak spatial placement
+Places mono voices in a stereo or 5.1 field. Gains follow a constant-power
+law (pairwise between adjacent speakers for 5.1) and are computed for every
+channel at once; voices are accumulated straight into the channel rows of a
+caller-allocated [channels, samples] buffer, so no per-voice multichannel
+array or tensor is ever built. Scene scripts place several voices, one
+line each, in the same buffer.
+"""
+
+import re
+import numpy as np
+from functools import lru_cache
+from typing import Collection, List, Optional, Sequence, Tuple
+
+from .djz_concurrency import SCRATCH_BLOCK, scratch
+
+# Speaker azimuths in degrees (negative = left) in WAV/SMPTE channel order; None is the LFE
+CHANNEL_LAYOUTS = {
+    "mono": (0.0,),
+    "stereo": (-30.0, 30.0),
+    "5.1": (-30.0, 30.0, 0.0, None, -110.0, 110.0),
+}
+
+
+_SCENE_LINE = re.compile(r'^\s*(\w+)\s*(?:@\s*([-+]?\d+(?:\.\d+)?))?\s*:\s*(.*)$')
+
+
+def parse_scene(script: str, voices: Collection[str], default_voice: str) -> List[Tuple[str, float, str]]:
+    """(voice, azimuth, text) per non-empty script line.
+
+    Lines read ``voice @ azimuth: text``, ``voice: text`` or just ``text``;
+    a prefix that is not a known voice is kept as part of the text.
+    """
+    lines = []
+    for line in script.splitlines():
+        match = _SCENE_LINE.match(line)
+        if match and match.group(1) in voices:
+            voice, azimuth, text = match.group(1), float(match.group(2) or 0.0), match.group(3)
+        else:
+            voice, azimuth, text = default_voice, 0.0, line
+        if text.strip():
+            lines.append((voice, azimuth, text.strip()))
+    return lines
+
+
+def scene_offsets(lengths: Sequence[int], gap: int) -> List[int]:
+    """Start sample of each line played back to back with ``gap`` samples between (negative overlaps)."""
+    offsets, position = [], 0
+    for length in lengths:
+        offsets.append(position)
+        position = max(0, position + length + gap)
+    return offsets
+
+
+def channel_count(layout: str) -> int:
+    return len(CHANNEL_LAYOUTS[layout])
+
+
+@lru_cache(maxsize=1024)
+def pan_gains(layout: str, azimuth: float) -> np.ndarray:
+    """Per-channel gains (unit power) for a source at ``azimuth`` degrees.
+
+    Stereo maps -90..90 degrees onto hard left..hard right. 5.1 pans between
+    the two adjacent full-range speakers around the source; the LFE gets none.
+    """
+    speakers = CHANNEL_LAYOUTS[layout]
+    gains = np.zeros(len(speakers), dtype=np.float32)
+    if len(speakers) == 1:
+        gains[0] = 1.0
+    elif layout == "stereo":
+        theta = (np.clip(azimuth / 90.0, -1.0, 1.0) + 1.0) * np.pi / 4.0
+        gains[:] = np.cos(theta), np.sin(theta)
+    else:
+        channels = np.array([i for i, a in enumerate(speakers) if a is not None])
+        angles = np.array([speakers[i] for i in channels]) % 360.0
+        order = np.argsort(angles)
+        channels, angles = channels[order], angles[order]
+        arcs = (np.roll(angles, -1) - angles) % 360.0
+        offsets = (azimuth % 360.0 - angles) % 360.0
+        pair = int(np.flatnonzero(offsets < arcs)[0])
+        fraction = offsets[pair] / arcs[pair]
+        gains[channels[pair]] = np.cos(fraction * np.pi / 2.0)
+        gains[channels[(pair + 1) % len(channels)]] = np.sin(fraction * np.pi / 2.0)
+    gains.setflags(write=False)
+    return gains
+
+
+def place(out: np.ndarray, audio: np.ndarray, gains: Sequence[float], offset: int = 0) -> np.ndarray:
+    """Mix mono ``audio`` into ``out`` ([channels, samples]) starting at ``offset``.
+
+    Each channel row is updated in place, block by block, through one
+    scratch buffer; samples past the end of ``out`` are dropped.
+    """
+    length = max(0, min(len(audio), out.shape[1] - offset))
+    for start in range(0, length, SCRATCH_BLOCK):
+        block = audio[start:min(start + SCRATCH_BLOCK, length)]
+        scaled = scratch("pan", len(block))
+        for channel, gain in enumerate(gains):
+            if gain:
+                np.multiply(block, np.float32(gain), out=scaled)
+                row = out[channel, offset + start:offset + start + len(block)]
+                np.add(row, scaled, out=row)
+    return out
+
+
+def spatialize(audio: np.ndarray, layout: str, azimuth: float, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """One mono voice placed in ``layout``; writes into ``out`` ([channels, samples], zeroed) when given."""
+    if out is None:
+        out = np.zeros((channel_count(layout), len(audio)), dtype=np.float32)
+    return place(out, audio, pan_gains(layout, float(azimuth)))
@@ -0,0 +1,87 @@
+"""
+DJZ-Speak chunk splicing
+Joins separately synthesized chunks of one long text. Chunks are cut at
+punctuation, where eSpeak-NG ends an intonation phrase anyway, so a seam
+only needs to hide level and waveform discontinuities: each chunk gets a
+capped gain toward the loudness of the whole text, both sides of a join are
+trimmed to the nearest zero crossing inside the pause, and a few
+milliseconds of equal-power crossfade cover what remains.
+"""
+
+import numpy as np
+from typing import List, Sequence
+
+from .djz_loudness import measure_loudness
+from .djz_morph import crossfade_join
+from .djz_wav import decode_wav, encode_wav, parse_wav_header
+
+# A join never moves by more than this, so cuts stay inside the pause
+SEARCH_MS = 10.0
+CROSSFADE_MS = 2.0
+MAX_MATCH_DB = 3.0
+
+# Samples at or below one 16-bit step count as crossings
+_ZERO = 1.0 / 32768.0
+
+
+def _crossings(window: np.ndarray) -> np.ndarray:
+    """Indices in ``window`` where the waveform crosses or touches zero."""
+    near_zero = np.abs(window) <= _ZERO
+    signs = np.signbit(window)
+    near_zero[:-1] |= signs[:-1] != signs[1:]
+    return np.flatnonzero(near_zero)
+
+
+def trim_to_crossings(audio: np.ndarray, search: int, head: bool = True, tail: bool = True) -> np.ndarray:
+    """View of ``audio`` starting and ending at the zero crossings nearest its edges.
+
+    Only the outer ``search`` samples are examined; if they hold no
+    crossing the quietest sample is used instead.
+    """
+    start, end = 0, len(audio)
+    search = min(search, len(audio) // 2)
+    if not search:
+        return audio
+    if head:
+        window = audio[:search]
+        crossings = _crossings(window)
+        start = int(crossings[0]) if crossings.size else int(np.argmin(np.abs(window)))
+    if tail:
+        window = audio[end - search:]
+        crossings = _crossings(window)
+        last = int(crossings[-1]) if crossings.size else search - 1 - int(np.argmin(np.abs(window[::-1])))
+        end = end - search + last + 1
+    return audio[start:end]
+
+
+def match_gains(segments: Sequence[np.ndarray], sample_rate: int, max_db: float = MAX_MATCH_DB) -> List[float]:
+    """Per-segment gains toward the median segment loudness, limited to ``max_db``."""
+    loudness = [measure_loudness(segment, sample_rate) for segment in segments]
+    measured = [value for value in loudness if value is not None]
+    if len(measured) < 2:
+        return [1.0] * len(segments)
+    target = float(np.median(measured))
+    return [1.0 if value is None else 10.0 ** (float(np.clip(target - value, -max_db, max_db)) / 20.0)
+            for value in loudness]
+
+
+def splice(segments: Sequence[np.ndarray], sample_rate: int, crossfade_ms: float = CROSSFADE_MS,
+           search_ms: float = SEARCH_MS, max_match_db: float = MAX_MATCH_DB) -> np.ndarray:
+    """Join consecutive chunks of one utterance with energy-matched, zero-crossing-aligned splices."""
+    segments = [np.asarray(segment, dtype=np.float32) for segment in segments if len(segment)]
+    if len(segments) < 2:
+        return segments[0].copy() if segments else np.zeros(0, dtype=np.float32)
+
+    search = int(sample_rate * search_ms / 1000.0)
+    trimmed = []
+    for i, (segment, gain) in enumerate(zip(segments, match_gains(segments, sample_rate, max_match_db))):
+        # The outer edges of the utterance are left alone
+        segment = trim_to_crossings(segment, search, head=i > 0, tail=i < len(segments) - 1)
+        trimmed.append(segment * np.float32(gain) if gain != 1.0 else segment)
+    return crossfade_join(trimmed, int(sample_rate * crossfade_ms / 1000.0))
+
+
+def splice_wav(buffers: Sequence[bytes]) -> bytes:
+    """``splice`` for eSpeak-NG WAV output; returns one 16-bit PCM WAV buffer."""
+    sample_rate = parse_wav_header(buffers[0]).sample_rate
+    return encode_wav(splice([decode_wav(buffer) for buffer in buffers], sample_rate), sample_rate)
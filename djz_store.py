@@ -0,0 +1,402 @@
+"""
+DJZ-Speak audio store
+Persistent storage for rendered audio shared by every ComfyUI process on a
+machine. Audio is appended to packed segment files; an append-only journal
+(``index.journal``) records where each entry lives, and every process keeps
+an in-memory index of it, so lookups are a dict hit and reads are
+zero-copy views of memory-mapped segments. Each record carries a CRC32 that
+is checked on first read. The store is bounded by size with LRU eviction,
+and segments left mostly dead by eviction are compacted in a background
+thread. Writers serialize on an exclusive lock of ``store.lock`` (``fcntl``
+on POSIX, ``msvcrt`` on Windows); readers catch up on the journal under a
+shared lock.
+"""
+
+import contextlib
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import zlib
+import numpy as np
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+STORE_VERSION = 1
+RECORD_MAGIC = b'DJZA'
+JOURNAL_MAGIC = b'DJZI'
+
+# magic, version, ndim, key, dim0, dim1, payload crc - 64 bytes keeps payloads aligned
+_RECORD_HEADER = struct.Struct('<4sBB2x32sQQI4x')
+# magic, generation (changes whenever the journal is rewritten)
+_JOURNAL_HEADER = struct.Struct('<4sQ')
+# op (P = put, D = delete), key, segment, payload offset, ndim, dim0, dim1, payload crc, record crc
+_JOURNAL_ENTRY = struct.Struct('<c32sIQBQQII')
+
+
+class Entry(NamedTuple):
+    segment: int
+    offset: int
+    ndim: int
+    dim0: int
+    dim1: int
+    crc: int
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return (self.dim0,) if self.ndim == 1 else (self.dim0, self.dim1)
+
+    @property
+    def nbytes(self) -> int:
+        return self.dim0 * (self.dim1 if self.ndim == 2 else 1) * 4
+
+
+def _digest(key: str) -> bytes:
+    """32-byte key: the fingerprint itself when it is a sha256 hex digest."""
+    if len(key) == 64:
+        try:
+            return bytes.fromhex(key)
+        except ValueError:
+            pass
+    return hashlib.sha256(key.encode('utf-8')).digest()
+
+
+class _FileLock:
+    """Advisory inter-process lock on a file (shared or exclusive)."""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    @contextmanager
+    def hold(self, exclusive: bool = True):
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            elif msvcrt is not None:
+                # msvcrt has no shared mode; LK_LOCK gives up after ~10s, so keep trying
+                while True:
+                    try:
+                        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue
+            yield
+        finally:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                elif msvcrt is not None:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            finally:
+                os.close(fd)
+
+
+class AudioStore:
+    """Size-bounded, multi-process safe store of float32 audio arrays keyed by fingerprint."""
+
+    def __init__(self, root: Path, max_bytes: int = 2 * 1024 ** 3, segment_bytes: int = 64 * 1024 ** 2,
+                 compact_ratio: float = 0.5, compact_min_bytes: int = 16 * 1024 ** 2):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.segment_bytes = segment_bytes
+        self.compact_ratio = compact_ratio
+        self.compact_min_bytes = compact_min_bytes
+        self._journal_path = self.root / "index.journal"
+        self._file_lock = _FileLock(self.root / "store.lock")
+        self._lock = threading.RLock()
+        self._index: "OrderedDict[bytes, Entry]" = OrderedDict()
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._verified = set()
+        self._generation: Optional[int] = None
+        self._journal_pos = 0
+        self._journal_records = 0
+        self._compactor: Optional[threading.Thread] = None
+
+    # -- files -------------------------------------------------------------
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.root / f"segment-{segment:06d}.dat"
+
+    def _segments(self) -> Dict[int, int]:
+        """Segment id -> file size for every segment on disk."""
+        sizes = {}
+        for path in self.root.glob("segment-*.dat"):
+            try:
+                sizes[int(path.stem.split("-")[1])] = path.stat().st_size
+            except (ValueError, OSError):
+                continue
+        return sizes
+
+    @contextmanager
+    def _exclusive(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._file_lock.hold(exclusive=True):
+            yield
+
+    # -- journal -----------------------------------------------------------
+
+    def _refresh(self, locked: bool = False):
+        """Apply journal records written since the last call (by any process).
+
+        ``locked`` means the caller already holds the exclusive lock.
+        """
+        if not self._journal_path.exists():
+            if self._generation is not None:
+                self._reset(None)
+            return
+        with contextlib.nullcontext() if locked else self._file_lock.hold(exclusive=False):
+            with open(self._journal_path, 'rb') as f:
+                header = f.read(_JOURNAL_HEADER.size)
+                if len(header) < _JOURNAL_HEADER.size:
+                    return
+                magic, generation = _JOURNAL_HEADER.unpack(header)
+                if magic != JOURNAL_MAGIC:
+                    raise ValueError(f"{self._journal_path} is not a DJZ-Speak store journal")
+                if generation != self._generation:
+                    # Rewritten by compaction - start over from the new snapshot
+                    self._reset(generation)
+                f.seek(self._journal_pos)
+                data = f.read()
+        self._apply(data)
+
+    def _reset(self, generation: Optional[int]):
+        self._index.clear()
+        self._verified.clear()
+        self._maps.clear()  # arrays handed out keep their own mapping alive
+        self._generation = generation
+        self._journal_pos = _JOURNAL_HEADER.size
+        self._journal_records = 0
+
+    def _apply(self, data: bytes):
+        size = _JOURNAL_ENTRY.size
+        for start in range(0, len(data) - size + 1, size):
+            record = data[start:start + size]
+            op, key, segment, offset, ndim, dim0, dim1, crc, record_crc = _JOURNAL_ENTRY.unpack(record)
+            if zlib.crc32(record[:-4]) != record_crc:
+                break  # torn tail of an interrupted append; the next writer truncates it
+            if op == b'P':
+                self._index[key] = Entry(segment, offset, ndim, dim0, dim1, crc)
+                self._index.move_to_end(key)
+                self._verified.discard(key)
+            else:
+                self._index.pop(key, None)
+            self._journal_pos += size
+            self._journal_records += 1
+
+    @staticmethod
+    def _encode(op: bytes, key: bytes, entry: Entry) -> bytes:
+        record = _JOURNAL_ENTRY.pack(op, key, entry.segment, entry.offset, entry.ndim, entry.dim0, entry.dim1, entry.crc, 0)
+        return record[:-4] + struct.pack('<I', zlib.crc32(record[:-4]))
+
+    def _write_journal(self, records: Iterable[Tuple[bytes, bytes, Entry]]):
+        """Append records (caller holds the exclusive lock and has refreshed)."""
+        data = b''.join(self._encode(op, key, entry) for op, key, entry in records)
+        if not data:
+            return
+        if not self._journal_path.exists():
+            self._create_journal(b'')
+        with open(self._journal_path, 'r+b') as f:
+            # Drop a torn tail left by a writer that died mid-append
+            f.truncate(self._journal_pos)
+            f.seek(self._journal_pos)
+            f.write(data)
+        self._apply(data)
+
+    def _create_journal(self, body: bytes):
+        generation = int.from_bytes(os.urandom(8), 'little')
+        tmp_path = self._journal_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(_JOURNAL_HEADER.pack(JOURNAL_MAGIC, generation) + body)
+        os.replace(tmp_path, self._journal_path)
+        self._reset(generation)
+        self._apply(body)
+
+    # -- records -----------------------------------------------------------
+
+    def _append_record(self, key: bytes, audio: np.ndarray, crc: int) -> Entry:
+        """Append one record to the open segment (caller holds the exclusive lock)."""
+        segments = self._segments()
+        segment = max(segments, default=1)
+        if segments.get(segment, 0) + audio.nbytes > self.segment_bytes and segments.get(segment, 0):
+            segment += 1
+        dim0, dim1 = (audio.shape[0], 0) if audio.ndim == 1 else audio.shape
+        with open(self._segment_path(segment), 'ab') as f:
+            position = f.tell()
+            f.write(_RECORD_HEADER.pack(RECORD_MAGIC, STORE_VERSION, audio.ndim, key, dim0, dim1, crc))
+            f.write(memoryview(audio).cast('B'))
+        return Entry(segment, position + _RECORD_HEADER.size, audio.ndim, dim0, dim1, crc)
+
+    def _map(self, entry: Entry) -> mmap.mmap:
+        mapped = self._maps.get(entry.segment)
+        if mapped is None or len(mapped) < entry.offset + entry.nbytes:
+            with open(self._segment_path(entry.segment), 'rb') as f:
+                mapped = self._maps[entry.segment] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return mapped
+
+    def _read(self, key: bytes, entry: Entry) -> Optional[np.ndarray]:
+        """Read-only view of a record, or None if it is missing or fails its checks."""
+        try:
+            mapped = self._map(entry)
+            header = _RECORD_HEADER.unpack_from(mapped, entry.offset - _RECORD_HEADER.size)
+        except (OSError, ValueError, struct.error):
+            return None
+        if header[0] != RECORD_MAGIC or header[3] != key:
+            return None
+        audio = np.frombuffer(mapped, dtype='<f4', count=entry.nbytes // 4, offset=entry.offset).reshape(entry.shape)
+        if key not in self._verified:
+            if zlib.crc32(audio) != entry.crc:
+                return None
+            self._verified.add(key)
+        return audio
+
+    # -- public API --------------------------------------------------------
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Stored audio for ``key`` as a read-only memory-mapped array, or None."""
+        digest = _digest(key)
+        with self._lock:
+            entry = self._index.get(digest)
+            if entry is None:
+                self._refresh()  # another process may have stored it
+                entry = self._index.get(digest)
+                if entry is None:
+                    return None
+            self._index.move_to_end(digest)
+            audio = self._read(digest, entry)
+            if audio is None:
+                with self._exclusive():
+                    self._refresh(locked=True)
+                    current = self._index.get(digest)
+                    if current is not None and current != entry:
+                        # Moved by another process's compaction
+                        entry, audio = current, self._read(digest, current)
+                    if audio is None and current is not None:
+                        print(f"Warning: Discarding corrupt audio store entry {key[:12]}")
+                        self._write_journal([(b'D', digest, entry)])
+            return audio
+
+    def put(self, key: str, audio: np.ndarray):
+        """Store audio under ``key``, evicting least recently used entries past ``max_bytes``."""
+        audio = np.ascontiguousarray(audio, dtype='<f4')
+        if audio.ndim not in (1, 2):
+            raise ValueError(f"Cannot store audio with {audio.ndim} dimensions")
+        digest = _digest(key)
+        crc = zlib.crc32(audio)
+        with self._lock, self._exclusive():
+            self._refresh(locked=True)
+            entry = self._append_record(digest, audio, crc)
+            records = [(b'P', digest, entry)]
+            self._index[digest] = entry
+            self._index.move_to_end(digest)
+            records += self._eviction_records()
+            self._index.pop(digest)
+            self._write_journal(records)
+            self._verified.add(digest)
+        self._maybe_compact()
+
+    def _eviction_records(self) -> List[Tuple[bytes, bytes, Entry]]:
+        total = sum(entry.nbytes for entry in self._index.values())
+        if total <= self.max_bytes:
+            return []
+        records = []
+        for key, entry in list(self._index.items()):
+            if total <= self.max_bytes * 0.9 or len(self._index) - len(records) <= 1:
+                break
+            records.append((b'D', key, entry))
+            total -= entry.nbytes
+        return records
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refresh()
+            segments = self._segments()
+            live = sum(entry.nbytes + _RECORD_HEADER.size for entry in self._index.values())
+            return {
+                "entries": len(self._index),
+                "live_bytes": live,
+                "file_bytes": sum(segments.values()),
+                "segments": len(segments),
+                "journal_records": self._journal_records,
+                "max_bytes": self.max_bytes,
+            }
+
+    def verify(self) -> Tuple[int, int]:
+        """Check every entry's checksum; corrupt entries are dropped. Returns (checked, dropped)."""
+        with self._lock, self._exclusive():
+            self._refresh(locked=True)
+            self._verified.clear()
+            bad = [(b'D', key, entry) for key, entry in list(self._index.items()) if self._read(key, entry) is None]
+            checked = len(self._index)
+            self._write_journal(bad)
+        return checked, len(bad)
+
+    # -- compaction --------------------------------------------------------
+
+    def _dead_bytes(self) -> Tuple[Dict[int, int], Dict[int, int]]:
+        segments = self._segments()
+        live = dict.fromkeys(segments, 0)
+        for entry in self._index.values():
+            live[entry.segment] = live.get(entry.segment, 0) + entry.nbytes + _RECORD_HEADER.size
+        return segments, live
+
+    def _maybe_compact(self):
+        with self._lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+            segments, live = self._dead_bytes()
+            total = sum(segments.values())
+            dead = total - sum(live.values())
+            needs_journal = self._journal_records > 2 * len(self._index) + 1024
+            if not needs_journal and (dead < self.compact_min_bytes or dead < total * self.compact_ratio):
+                return
+            self._compactor = threading.Thread(target=self.compact, name="djz-store-compact", daemon=True)
+            self._compactor.start()
+
+    def compact(self):
+        """Move live records out of mostly-dead sealed segments, delete them and rewrite the journal."""
+        with self._lock, self._exclusive():
+            self._refresh(locked=True)
+            segments, live = self._dead_bytes()
+            current = max(segments, default=0)
+            victims = {segment for segment, size in segments.items()
+                       if segment != current and live.get(segment, 0) <= size * (1.0 - self.compact_ratio)}
+
+            order, records = list(self._index), []
+            for key, entry in list(self._index.items()):
+                if entry.segment in victims:
+                    audio = self._read(key, entry)
+                    if audio is None:
+                        records.append((b'D', key, entry))
+                    else:
+                        records.append((b'P', key, self._append_record(key, audio, entry.crc)))
+            self._write_journal(records)
+
+            for segment in victims:
+                self._maps.pop(segment, None)
+                try:
+                    self._segment_path(segment).unlink()
+                except OSError:
+                    pass  # still mapped by another process on Windows - retried next compaction
+
+            # Moving a record must not make it look recently used
+            for key in order:
+                if key in self._index:
+                    self._index.move_to_end(key)
+
+            # Snapshot the live index as a fresh journal so it stops growing
+            if self._journal_records > len(self._index):
+                self._create_journal(b''.join(self._encode(b'P', key, entry) for key, entry in self._index.items()))
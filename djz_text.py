@@ -0,0 +1,283 @@
+"""
+DJZ-Speak text normalization
+Expands numbers, dates, times, currency, units and abbreviations into words
+before the text reaches eSpeak-NG. Rules are compiled regular expressions
+applied in order; expansions of individual tokens are memoized. Voice
+presets can name extra rules in ``text_rules`` which run before the
+defaults (e.g. ``countdown`` reads digits one at a time). ``chunk_text``
+splits long normalized text at sentence, then clause boundaries.
+"""
+
+import re
+from datetime import date
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+ONES = [
+    "zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine",
+    "ten", "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen",
+    "seventeen", "eighteen", "nineteen"
+]
+TENS = ["", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety"]
+SCALES = [(10 ** 12, "trillion"), (10 ** 9, "billion"), (10 ** 6, "million"), (10 ** 3, "thousand")]
+IRREGULAR_ORDINALS = {
+    "one": "first", "two": "second", "three": "third", "five": "fifth",
+    "eight": "eighth", "nine": "ninth", "twelve": "twelfth"
+}
+MONTHS = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+]
+
+# Only unambiguous abbreviations are defaults ("No.", "St." and "min." depend on context)
+ABBREVIATIONS = {
+    "Dr.": "Doctor", "Mr.": "Mister", "Mrs.": "Missus", "Ms.": "Miz", "Prof.": "Professor",
+    "Sr.": "Senior", "Jr.": "Junior", "Mt.": "Mount",
+    "vs.": "versus", "etc.": "et cetera", "e.g.": "for example", "i.e.": "that is",
+    "approx.": "approximately", "dept.": "department"
+}
+
+# Abbreviations that lead into the next word and so never end a sentence
+LEADING_ABBREVIATIONS = {"Dr.", "Mr.", "Mrs.", "Ms.", "Prof.", "Mt.", "vs.", "e.g.", "i.e.", "approx."}
+
+# Words after which a four-digit number is read as a year
+YEAR_CONTEXT = ("in", "since", "by", "until", "before", "after")
+
+# (singular, plural)
+UNITS = {
+    "km": ("kilometer", "kilometers"), "m": ("meter", "meters"), "cm": ("centimeter", "centimeters"),
+    "mm": ("millimeter", "millimeters"), "kg": ("kilogram", "kilograms"), "g": ("gram", "grams"),
+    "mph": ("mile per hour", "miles per hour"), "km/h": ("kilometer per hour", "kilometers per hour"),
+    "Hz": ("hertz", "hertz"), "kHz": ("kilohertz", "kilohertz"), "MHz": ("megahertz", "megahertz"),
+    "GHz": ("gigahertz", "gigahertz"), "KB": ("kilobyte", "kilobytes"), "MB": ("megabyte", "megabytes"),
+    "GB": ("gigabyte", "gigabytes"), "TB": ("terabyte", "terabytes"), "ms": ("millisecond", "milliseconds"),
+    "°C": ("degree Celsius", "degrees Celsius"), "°F": ("degree Fahrenheit", "degrees Fahrenheit"),
+    "min": ("minute", "minutes"), "sec": ("second", "seconds"), "%": ("percent", "percent")
+}
+
+# Numbers at least this long are read digit by digit (serials, phone numbers)
+DIGIT_RUN_LENGTH = 7
+
+
+@lru_cache(maxsize=4096)
+def number_to_words(n: int) -> str:
+    """Cardinal number in English words."""
+    if n < 0:
+        return "minus " + number_to_words(-n)
+    if n < 20:
+        return ONES[n]
+    if n < 100:
+        tens, ones = divmod(n, 10)
+        return TENS[tens] + ("-" + ONES[ones] if ones else "")
+    if n < 1000:
+        hundreds, rest = divmod(n, 100)
+        return ONES[hundreds] + " hundred" + (" " + number_to_words(rest) if rest else "")
+    if n >= 10 ** 15:
+        return digits_to_words(str(n))
+    for scale, name in SCALES:
+        if n >= scale:
+            head, rest = divmod(n, scale)
+            return number_to_words(head) + " " + name + (" " + number_to_words(rest) if rest else "")
+    return str(n)
+
+
+@lru_cache(maxsize=1024)
+def ordinal_to_words(n: int) -> str:
+    """Ordinal number in English words."""
+    words = number_to_words(n)
+    head, sep, last = words.rpartition(" " if "-" not in words.rsplit(" ", 1)[-1] else "-")
+    if last in IRREGULAR_ORDINALS:
+        last = IRREGULAR_ORDINALS[last]
+    elif last.endswith("y"):
+        last = last[:-1] + "ieth"
+    else:
+        last += "th"
+    return head + sep + last
+
+
+@lru_cache(maxsize=1024)
+def year_to_words(year: int) -> str:
+    """Year read the conventional way ("nineteen eighty-four", "two thousand five")."""
+    if 2000 <= year < 2010 or year < 1000 or year >= 10000:
+        return number_to_words(year)
+    century, rest = divmod(year, 100)
+    if rest == 0:
+        return number_to_words(century) + " hundred"
+    if rest < 10:
+        return number_to_words(century) + " oh " + ONES[rest]
+    return number_to_words(century) + " " + number_to_words(rest)
+
+
+@lru_cache(maxsize=4096)
+def digits_to_words(digits: str) -> str:
+    """Read a digit string one digit at a time."""
+    return " ".join(ONES[int(d)] for d in digits if d.isdigit())
+
+
+@lru_cache(maxsize=4096)
+def decimal_to_words(token: str) -> str:
+    whole, _, fraction = token.partition(".")
+    return number_to_words(int(whole)) + " point " + digits_to_words(fraction)
+
+
+def _number_token_to_words(token: str) -> str:
+    return decimal_to_words(token) if "." in token else number_to_words(int(token))
+
+
+def _expand_currency(match: re.Match) -> str:
+    dollars = int(match.group(1).replace(",", ""))
+    words = number_to_words(dollars) + (" dollar" if dollars == 1 else " dollars")
+    if match.group(2) and int(match.group(2)):
+        cents = int(match.group(2))
+        words += " and " + number_to_words(cents) + (" cent" if cents == 1 else " cents")
+    return words
+
+
+def _expand_iso_date(match: re.Match) -> str:
+    try:
+        day = date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+    except ValueError:
+        # Not a real date: read it digit by digit so the number rules leave it alone
+        return " ".join(digits_to_words(group) for group in match.groups())
+    return f"{MONTHS[day.month - 1]} {ordinal_to_words(day.day)}, {year_to_words(day.year)}"
+
+
+def _expand_time(match: re.Match) -> str:
+    hours, minutes = int(match.group(1)), int(match.group(2))
+    if hours > 23 or minutes > 59:
+        return match.group(0)
+    if minutes == 0:
+        return number_to_words(hours) + " o'clock"
+    if minutes < 10:
+        return number_to_words(hours) + " oh " + ONES[minutes]
+    return number_to_words(hours) + " " + number_to_words(minutes)
+
+
+def _expand_unit(match: re.Match) -> str:
+    value = match.group(1)
+    singular, plural = UNITS[match.group(2)]
+    return _number_token_to_words(value) + " " + (singular if value == "1" else plural)
+
+
+def _expand_abbreviation(match: re.Match) -> str:
+    abbreviation = match.group(0)
+    words = ABBREVIATIONS[abbreviation]
+    # The abbreviation's period may also end the sentence; keep it for chunking and intonation
+    if abbreviation not in LEADING_ABBREVIATIONS and _SENTENCE_END.match(match.string, match.end()):
+        return words + "."
+    return words
+
+
+def _expand_year(match: re.Match) -> str:
+    return match.group(1) + year_to_words(int(match.group(2)))
+
+
+def _expand_decade(match: re.Match) -> str:
+    decade = match.group(1)
+    words = year_to_words(int(decade)) if len(decade) == 4 else number_to_words(int(decade))
+    return words[:-1] + "ies" if words.endswith("y") else words + "s"
+
+
+def _alternation(words: Iterable[str]) -> str:
+    # Longest first so "kHz" wins over "Hz" and "km/h" over "km"
+    return "|".join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+
+
+Rule = Tuple[re.Pattern, Callable[[re.Match], str]]
+
+RULES: Dict[str, Rule] = {}
+
+# Applied in this order unless a preset puts its own rules in front
+DEFAULT_RULES: List[str] = []
+
+
+def register_rule(name: str, pattern: str, replacement: Callable[[re.Match], str], default: bool = False, flags: int = 0):
+    """Register a normalization rule; ``default`` rules run for every voice."""
+    RULES[name] = (re.compile(pattern, flags), replacement)
+    if default and name not in DEFAULT_RULES:
+        DEFAULT_RULES.append(name)
+    get_normalizer.cache_clear()
+
+
+class TextNormalizer:
+    """Ordered set of compiled rules applied to text before synthesis."""
+
+    def __init__(self, rule_names: Tuple[str, ...]):
+        unknown = [name for name in rule_names if name not in RULES]
+        if unknown:
+            raise ValueError(f"Unknown text normalization rules: {', '.join(unknown)}")
+        self.rule_names = rule_names
+        self.rules = [RULES[name] for name in rule_names]
+
+    def __call__(self, text: str) -> str:
+        text = " ".join(text.split())
+        for pattern, replacement in self.rules:
+            text = pattern.sub(replacement, text)
+        return text
+
+
+@lru_cache(maxsize=32)
+def get_normalizer(preset_rules: Tuple[str, ...] = ()) -> TextNormalizer:
+    """Normalizer with preset rules in front of the defaults (built once per rule set)."""
+    names = tuple(preset_rules) + tuple(name for name in DEFAULT_RULES if name not in preset_rules)
+    return TextNormalizer(names)
+
+
+def normalize_text(text: str, preset_rules: Optional[Iterable[str]] = None) -> str:
+    """Text as it will be spoken; also the text that synthesis fingerprints are built from."""
+    return get_normalizer(tuple(preset_rules or ()))(text)
+
+
+_SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+')
+_SENTENCE_END = re.compile(r'\s*$|\s+["\'(]?[A-Z]')
+_CLAUSE_BREAK = re.compile(r'(?<=[,;:])\s+')
+
+
+def _pack(pieces: Iterable[str], max_chars: int) -> List[str]:
+    """Greedily join pieces with spaces into runs of at most ``max_chars``."""
+    chunks, current = [], ""
+    for piece in pieces:
+        if current and len(current) + 1 + len(piece) > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current} {piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def chunk_text(text: str, max_chars: int) -> List[str]:
+    """Split text into chunks of about ``max_chars``, preferring sentence, then clause breaks.
+
+    Chunks only end at punctuation, where eSpeak-NG closes an intonation
+    phrase and pauses anyway, so every join falls in a pause; a clause
+    longer than ``max_chars`` is kept whole rather than broken between words.
+    """
+    pieces = []
+    for sentence in _SENTENCE_BREAK.split(text.strip()):
+        pieces.extend([sentence] if len(sentence) <= max_chars else _CLAUSE_BREAK.split(sentence))
+    return _pack(pieces, max_chars)
+
+
+# Default rules - most specific first
+register_rule("sign", r"(?<![\w.\-−])[-−](?=\d)", lambda m: "minus ", default=True)
+register_rule("currency", r"\$(\d{1,3}(?:,\d{3})+|\d+)(?:\.(\d{2}))?\b", _expand_currency, default=True)
+register_rule("iso_date", r"\b(\d{4})-(\d{2})-(\d{2})\b", _expand_iso_date, default=True)
+register_rule("time", r"\b(\d{1,2}):(\d{2})\b", _expand_time, default=True)
+register_rule("ordinal", r"\b(\d+)(?:st|nd|rd|th)\b", lambda m: ordinal_to_words(int(m.group(1))), default=True)
+register_rule("unit", r"\b(\d+(?:\.\d+)?)\s?(" + _alternation(UNITS) + r")(?![\w/])", _expand_unit, default=True)
+register_rule("number_sign", r"\bNo\.(?=\s?\d)", lambda m: "number", default=True)
+register_rule("abbreviation", r"(?<!\w)(?:" + _alternation(ABBREVIATIONS) + r")", _expand_abbreviation, default=True)
+register_rule("decade", r"(?<![\w.'])'?(\d{1,3}0)s\b", _expand_decade, default=True)
+register_rule("year", r"\b((?:(?:" + "|".join(YEAR_CONTEXT) + r")\s+)|(?:" + "|".join(MONTHS) + r")\s+(?:\d{1,2},?\s+)?)"
+              r"(1[1-9]\d\d|20\d\d)\b(?![.,]\d)", _expand_year, default=True, flags=re.IGNORECASE)
+register_rule("digit_run", r"\b\d{%d,}\b" % DIGIT_RUN_LENGTH, lambda m: digits_to_words(m.group(0)), default=True)
+register_rule("grouped_number", r"\b\d{1,3}(?:,\d{3})+\b", lambda m: number_to_words(int(m.group(0).replace(",", ""))), default=True)
+# Dotted runs such as version strings and addresses ("1.2.3") and digits inside words
+# ("R2D2", "MP3", "3D") are left for eSpeak-NG
+register_rule("number", r"(?<![\w.])\d+(?:\.\d+)?(?![A-Za-z]|\.?\d)", lambda m: _number_token_to_words(m.group(0)), default=True)
+
+# Preset-only rules
+register_rule("digits_individual", r"(?<![A-Za-z])\d+(?![A-Za-z])", lambda m: digits_to_words(m.group(0)))
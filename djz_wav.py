@@ -0,0 +1,128 @@
+"""
+DJZ-Speak WAV decoding
+Parses RIFF/WAVE headers straight out of the eSpeak-NG stdout buffer and
+exposes the PCM as a zero-copy ``np.frombuffer`` view. eSpeak-NG writes a
+streaming header when its output is a pipe, so RIFF and data chunk sizes
+are placeholders; the data chunk is taken to run to the end of the buffer
+whenever its declared size does not fit. ``encode_wav`` writes float
+audio back out as 16-bit PCM.
+"""
+
+import struct
+import numpy as np
+from typing import NamedTuple, Optional
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# (format tag, bytes per sample) -> (numpy dtype, offset, scale)
+_SAMPLE_FORMATS = {
+    (WAVE_FORMAT_PCM, 1): (np.dtype('u1'), -128.0, 1.0 / 128.0),
+    (WAVE_FORMAT_PCM, 2): (np.dtype('<i2'), 0.0, 1.0 / 32768.0),
+    (WAVE_FORMAT_PCM, 4): (np.dtype('<i4'), 0.0, 1.0 / 2147483648.0),
+    (WAVE_FORMAT_IEEE_FLOAT, 4): (np.dtype('<f4'), 0.0, 1.0),
+}
+
+
+class WavInfo(NamedTuple):
+    format_tag: int
+    channels: int
+    sample_rate: int
+    sample_width: int
+    data_offset: int
+    frames: int
+
+
+def parse_wav_header(buffer: bytes) -> WavInfo:
+    """Locate the fmt and data chunks of a RIFF/WAVE buffer."""
+    if len(buffer) < 12 or buffer[:4] != b'RIFF' or buffer[8:12] != b'WAVE':
+        raise ValueError("Not a RIFF/WAVE buffer")
+
+    fmt = None
+    offset = 12
+    while offset + 8 <= len(buffer):
+        chunk_id = buffer[offset:offset + 4]
+        (chunk_size,) = struct.unpack_from('<I', buffer, offset + 4)
+        body = offset + 8
+        if chunk_id == b'fmt ':
+            if chunk_size < 16:
+                raise ValueError("Truncated fmt chunk")
+            format_tag, channels, sample_rate, _, block_align, bits = struct.unpack_from('<HHIIHH', buffer, body)
+            if format_tag == WAVE_FORMAT_EXTENSIBLE and chunk_size >= 26:
+                (format_tag,) = struct.unpack_from('<H', buffer, body + 24)
+            fmt = (format_tag, channels, sample_rate, bits // 8, block_align)
+        elif chunk_id == b'data':
+            if fmt is None:
+                raise ValueError("data chunk before fmt chunk")
+            format_tag, channels, sample_rate, sample_width, block_align = fmt
+            available = len(buffer) - body
+            # Streaming headers carry placeholder sizes - trust the buffer instead
+            size = chunk_size if chunk_size <= available else available
+            frame_bytes = block_align or channels * sample_width
+            return WavInfo(format_tag, channels, sample_rate, sample_width, body, size // frame_bytes)
+        offset = body + chunk_size + (chunk_size & 1)
+
+    raise ValueError("No data chunk in WAV buffer")
+
+
+def pcm_view(buffer: bytes, info: Optional[WavInfo] = None) -> np.ndarray:
+    """Zero-copy [frames, channels] view of the PCM samples in ``buffer``."""
+    info = info or parse_wav_header(buffer)
+    spec = _SAMPLE_FORMATS.get((info.format_tag, info.sample_width))
+    if spec is None:
+        raise ValueError(f"Unsupported WAV sample format: tag {info.format_tag}, width {info.sample_width}")
+    dtype = spec[0]
+    samples = np.frombuffer(buffer, dtype=dtype, count=info.frames * info.channels, offset=info.data_offset)
+    return samples.reshape(info.frames, info.channels)
+
+
+def decode_wav(buffer: bytes, out: Optional[np.ndarray] = None, mono: bool = True) -> np.ndarray:
+    """Decode WAV bytes to float32 in [-1, 1) with a single vectorized conversion.
+
+    Mono output is 1-D (multi-channel input is averaged); otherwise the
+    result is [frames, channels]. If ``out`` is given and large enough the
+    samples are written into it and a view of it is returned.
+    """
+    info = parse_wav_header(buffer)
+    view = pcm_view(buffer, info)
+    dtype, bias, scale = _SAMPLE_FORMATS[(info.format_tag, info.sample_width)]
+
+    if mono and info.channels > 1:
+        view = view.mean(axis=1, dtype=np.float32)
+    elif mono:
+        view = view[:, 0]
+    shape = view.shape
+
+    if out is not None and out.dtype == np.float32 and out.size >= view.size:
+        result = out.reshape(-1)[:view.size].reshape(shape)
+    else:
+        result = np.empty(shape, dtype=np.float32)
+
+    if bias:
+        np.add(view, np.float32(bias), out=result, dtype=np.float32)
+        np.multiply(result, np.float32(scale), out=result)
+    elif scale != 1.0:
+        np.multiply(view, np.float32(scale), out=result, dtype=np.float32)
+    else:
+        np.copyto(result, view, casting='unsafe')
+    return result
+
+
+def _wav_header(format_tag: int, channels: int, sample_rate: int, sample_width: int, data_bytes: int) -> bytes:
+    block_align = channels * sample_width
+    return (b'RIFF' + struct.pack('<I', 36 + data_bytes) + b'WAVEfmt ' +
+            struct.pack('<IHHIIHH', 16, format_tag, channels, sample_rate,
+                        sample_rate * block_align, block_align, sample_width * 8) +
+            b'data' + struct.pack('<I', data_bytes))
+
+
+def encode_wav(audio: np.ndarray, sample_rate: int) -> bytes:
+    """16-bit PCM WAV bytes for float audio in [-1, 1] (1-D mono or [frames, channels]).
+
+    Uses the same scale as ``decode_wav``, so 16-bit input round-trips exactly.
+    """
+    audio = np.asarray(audio, dtype=np.float32)
+    channels = 1 if audio.ndim == 1 else audio.shape[1]
+    pcm = np.clip(np.rint(audio * np.float32(32768.0)), -32768, 32767).astype('<i2').tobytes()
+    return _wav_header(WAVE_FORMAT_PCM, channels, sample_rate, 2, len(pcm)) + pcm
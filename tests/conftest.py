@@ -0,0 +1,39 @@
+"""
+Shared fixtures for the DJZ-Speak test suite. Runs without eSpeak-NG or
+ComfyUI: the nodes render with the deterministic fake engine, the synthesis
+cache stays in memory and the shared service is never contacted.
+
+    python -m pytest tests
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Must be set before the package creates its engine and cache
+os.environ["DJZ_SPEAK_ENGINE"] = "fake"
+os.environ["DJZ_SPEAK_CACHE"] = "0"
+os.environ.pop("DJZ_SPEAK_SERVER", None)
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from djz_cli import load_package  # noqa: E402
+
+# Registers the node folder as the ``djz_speak`` package for the test modules
+PACKAGE = load_package()
+
+
+@pytest.fixture(scope="session")
+def nodes():
+    return PACKAGE.NODE_CLASS_MAPPINGS
+
+
+@pytest.fixture
+def cache():
+    """The shared synthesis cache, emptied before and after the test."""
+    from djz_speak.djz_cache import get_synthesis_cache
+    shared = get_synthesis_cache()
+    shared.clear()
+    yield shared
+    shared.clear()
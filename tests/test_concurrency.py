@@ -0,0 +1,28 @@
+import numpy as np
+
+from djz_speak.djz_cache import SynthesisCache
+from djz_speak.djz_concurrency import MAX_SCRATCH_ELEMENTS, scratch
+from djz_speak.djz_spatial import place
+
+
+def test_scratch_reuses_small_buffers_and_drops_large_ones():
+    small = scratch("test", 1000)
+    assert np.shares_memory(small, scratch("test", 500))
+    large = scratch("test", MAX_SCRATCH_ELEMENTS + 1)
+    assert not np.shares_memory(large, scratch("test", 1000))
+    assert np.shares_memory(small, scratch("test", 1000))
+
+
+def test_place_mixes_long_audio_in_blocks():
+    audio = np.random.default_rng(0).standard_normal(MAX_SCRATCH_ELEMENTS + 12345).astype(np.float32)
+    out = place(np.zeros((2, len(audio) + 10), dtype=np.float32), audio, (0.5, 0.25), offset=10)
+    np.testing.assert_array_equal(out[0, 10:], audio * np.float32(0.5))
+    np.testing.assert_array_equal(out[1, 10:], audio * np.float32(0.25))
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = SynthesisCache(persist=False, max_entries=2)
+    for key in "abc":
+        cache.put(key, np.zeros(4, dtype=np.float32))
+        cache.get("a")
+    assert cache.get("a") is not None and cache.get("b") is None and cache.get("c") is not None
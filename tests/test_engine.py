@@ -0,0 +1,22 @@
+import numpy as np
+
+from djz_speak.djz_engine import FakeEngine
+from djz_speak.djz_selfcheck import CHECK_TEXT
+from djz_speak.djz_wav import decode_wav
+
+SETTINGS = {"espeak_voice": "en", "variant": "m3", "speed": 140, "pitch": 35, "amplitude": 100, "gap": 8}
+
+
+def test_fake_engine_is_deterministic():
+    engine = FakeEngine()
+    assert engine.render(SETTINGS, CHECK_TEXT) == engine.render(SETTINGS, CHECK_TEXT)
+
+
+def test_fake_engine_decodes_to_unit_range():
+    audio = decode_wav(FakeEngine().render(SETTINGS, CHECK_TEXT)[0])
+    assert len(audio) and np.all(np.abs(audio) <= 1.0)
+
+
+def test_fake_engine_follows_pitch():
+    engine = FakeEngine()
+    assert engine.render(dict(SETTINGS, pitch=60), CHECK_TEXT)[0] != engine.render(SETTINGS, CHECK_TEXT)[0]
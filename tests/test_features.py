@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from djz_speak.djz_effects import effect_plan
+from djz_speak.djz_features import envelope_tracker, extract_feature, frame_envelope
+
+
+@pytest.mark.parametrize("feature_type", ["rms_energy", "amplitude_envelope"])
+@pytest.mark.parametrize("fps, frame_count", [(30.0, 0), (29.97, 500), (30.0, 10)])
+@pytest.mark.parametrize("level", [0.05, 3.0])  # the louder input drives the limiter
+def test_tracker_matches_envelope_of_final_audio(feature_type, fps, frame_count, level):
+    audio = (np.random.default_rng(0).standard_normal(70001) * level).astype(np.float32)
+    plan = effect_plan(22050, 1.0, True, 1.2)
+    tracker = envelope_tracker(feature_type, len(audio), 22050, fps, frame_count)
+    processed = plan.apply(audio, tracker)
+    assert np.array_equal(processed, plan.apply(audio))
+    assert tracker.complete
+    np.testing.assert_allclose(tracker.values, frame_envelope(processed, 22050, fps, feature_type, frame_count), atol=1e-6)
+
+
+def test_feature_is_computed_on_first_read():
+    audio = np.sin(np.arange(22050, dtype=np.float32) * 0.05)
+    feature = extract_feature(audio, 22050, "spectral_centroid", fps=25.0)
+    assert feature.frame_count == 25 and feature._raw_data is None
+    assert 0.0 <= feature.get_value_at_frame(3) <= 1.0
+    assert len(feature.raw_data) == 25
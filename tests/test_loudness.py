@@ -0,0 +1,34 @@
+import numpy as np
+
+from djz_speak.djz_effects import effect_plan
+from djz_speak.djz_loudness import MAX_GAIN_DB, LookaheadLimiter, measure_loudness
+
+
+def _speechlike(level: float, length: int = 44100) -> np.ndarray:
+    t = np.arange(length) / 22050.0
+    return (level * np.sin(2 * np.pi * 180.0 * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 3.0 * t))).astype(np.float32)
+
+
+def test_limiter_holds_ceiling_and_streams_like_one_call():
+    audio = _speechlike(2.0)
+    whole = LookaheadLimiter(22050, ceiling=0.95)
+    expected = np.concatenate((whole.process(audio), whole.flush()))
+    chunked = LookaheadLimiter(22050, ceiling=0.95)
+    streamed = np.concatenate([chunked.process(audio[i:i + 777]) for i in range(0, len(audio), 777)] + [chunked.flush()])
+    assert len(expected) == len(audio) and np.max(np.abs(expected)) <= 0.95 + 1e-6
+    np.testing.assert_allclose(streamed, expected, atol=1e-6)
+
+
+def test_gain_reaches_target_and_is_capped():
+    plan = effect_plan(22050, 1.0, False, 1.0, target_loudness=-20.0)
+    audio = _speechlike(0.05)
+    assert abs(measure_loudness(audio * np.float32(plan.gain_for(audio)), 22050) + 20.0) < 0.01
+    assert plan.gain_for(_speechlike(1e-3)) == 10.0 ** (MAX_GAIN_DB / 20.0)
+
+
+def test_stream_with_precomputed_gain_matches_apply():
+    plan = effect_plan(22050, 1.5, True, 1.4, target_loudness=-18.0)
+    audio = _speechlike(0.3)
+    stream = plan.stream(plan.gain_for(audio))
+    streamed = np.concatenate([stream.process(audio[i:i + 1000]) for i in range(0, len(audio), 1000)] + [stream.flush()])
+    np.testing.assert_allclose(streamed, plan.apply(audio), atol=1e-6)
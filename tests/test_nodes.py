@@ -0,0 +1,120 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from djz_speak.djz_effects import effect_plan
+from djz_speak.djz_selfcheck import CHECK_TEXT, CHECK_VOICES
+
+
+def _waveform(output) -> np.ndarray:
+    return output[0]["waveform"][0].cpu().numpy()
+
+
+@pytest.mark.parametrize("voice", CHECK_VOICES)
+@pytest.mark.parametrize("node_name", ["DJZSpeak_v1", "DJZSpeak_v2"])
+def test_node_outputs(nodes, cache, node_name, voice):
+    node = nodes[node_name]()
+    preset = node.VOICE_PRESETS[voice]
+    args = (CHECK_TEXT, voice, preset["speed"], preset["pitch"]) + ((True,) if node_name == "DJZSpeak_v2" else ())
+    audio, feature, frame_count = node.synthesize(*args)
+
+    waveform = audio["waveform"]
+    assert waveform.ndim == 3 and waveform.shape[:2] == (1, 1)
+    assert audio["sample_rate"] == 22050
+    samples = waveform[0, 0].numpy()
+    assert np.all(np.isfinite(samples)) and np.max(np.abs(samples)) <= 1.0
+    assert frame_count == feature.frame_count == int(np.ceil(len(samples) * 30.0 / 22050))
+    assert len(feature.data) == frame_count and 0.0 <= feature.get_value_at_frame(0) <= 1.0
+
+
+@pytest.mark.parametrize("voice", CHECK_VOICES)
+def test_v2_without_effects_matches_v1(nodes, cache, voice):
+    v1, v2 = nodes["DJZSpeak_v1"](), nodes["DJZSpeak_v2"]()
+    preset = v1.VOICE_PRESETS[voice]
+    plain = _waveform(v1.synthesize(CHECK_TEXT, voice, preset["speed"], preset["pitch"]))
+    dry = _waveform(v2.synthesize(CHECK_TEXT, voice, preset["speed"], preset["pitch"], False))
+    assert np.array_equal(plain, dry)
+
+
+@pytest.mark.parametrize("voice", CHECK_VOICES)
+def test_effects_are_deterministic_cached_and_streamable(nodes, cache, voice):
+    v2 = nodes["DJZSpeak_v2"]()
+    preset = v2.VOICE_PRESETS[voice]
+    args = (CHECK_TEXT, voice, preset["speed"], preset["pitch"], True, 1.5, True, 1.4, -18.0)
+    fresh = _waveform(v2.synthesize(*args))
+    cache.clear()
+    again = _waveform(v2.synthesize(*args))
+    hit = _waveform(v2.synthesize(*args))
+    assert np.array_equal(fresh, again)
+    assert np.array_equal(again, hit)
+
+    # The plan behind the node must stream to the same samples in uneven chunks
+    dry = _waveform(v2.synthesize(*args[:4], False))[0]
+    plan = effect_plan(22050, *args[5:], filter_profile=preset.get("filter_profile"))
+    stream = plan.stream(plan.gain_for(dry))
+    streamed = np.concatenate([stream.process(dry[i:i + 1000]) for i in range(0, len(dry), 1000)] + [stream.flush()])
+    assert len(streamed) == fresh.shape[1]
+    assert np.max(np.abs(fresh[0] - streamed)) <= 1e-6
+
+
+def test_cache_is_consistent_under_concurrent_requests(nodes, cache):
+    node_class = nodes["DJZSpeak_v2"]
+    texts = [f"Unit {i} reporting. {CHECK_TEXT}" for i in range(8)]
+    requests = [text for text in texts for _ in range(4)]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda text: (text, _waveform(node_class().synthesize(text, "robocop", 110, 25, True))),
+                                requests))
+
+    by_text = {}
+    for text, audio in results:
+        by_text.setdefault(text, []).append(audio)
+    for text, renders in by_text.items():
+        assert all(np.array_equal(renders[0], audio) for audio in renders), text
+        key = node_class._fingerprint(node_class().engine, text, "robocop", 110, 25, True, 1.0, True, 1.2, -20.0)
+        cached = cache.get(key)
+        assert cached is not None and np.array_equal(cached, renders[0][0]), text
+    assert len({renders[0].tobytes() for renders in by_text.values()}) == len(texts)
+
+
+def test_scene_fingerprint_keeps_line_breaks(nodes):
+    scene = nodes["DJZSpeak_Scene"]
+    one_line = scene.IS_CHANGED(script="hal9000: Open the pod bay doors. c3po: Oh my.",
+                                default_voice="classic_robot", channel_layout="stereo")
+    two_lines = scene.IS_CHANGED(script="hal9000: Open the pod bay doors.\nc3po: Oh my.",
+                                 default_voice="classic_robot", channel_layout="stereo")
+    assert one_line != two_lines
+
+
+def test_scene_and_morph_render(nodes, cache):
+    scene = nodes["DJZSpeak_Scene"]().render_scene("hal9000 @ -45: I'm sorry Dave.\nc3po @ 45: Oh my.",
+                                                   "classic_robot", "stereo")[0]
+    assert scene["waveform"].shape[:2] == (1, 2)
+    morph = nodes["DJZSpeak_Morph"]().morph(CHECK_TEXT, "hal9000", "c3po", 4, "linear", "words")[0]
+    assert morph["waveform"].shape[:2] == (1, 1) and morph["waveform"].shape[2] > 0
+
+
+@pytest.mark.parametrize("node_name, widgets", [
+    ("DJZSpeak_v1", {"voice": "hal9000", "speed": 120, "pitch": 30}),
+    ("DJZSpeak_v2", {"voice": "hal9000", "speed": 120, "pitch": 30, "effects": True}),
+    ("DJZSpeak_Morph", {"voice_from": "hal9000", "voice_to": "c3po", "segments": 4, "curve": "linear", "morph_by": "words"}),
+    ("DJZSpeak_Scene", {"default_voice": "hal9000", "channel_layout": "stereo"}),
+])
+def test_is_changed_without_linked_text(nodes, node_name, widgets):
+    # ComfyUI leaves linked inputs (here the text) out of IS_CHANGED
+    node_class = nodes[node_name]
+    first = node_class.IS_CHANGED(**widgets)
+    assert first == node_class.IS_CHANGED(**widgets)
+    assert first != node_class.IS_CHANGED(**dict(widgets, **{next(iter(widgets)): "c3po"}))
+
+
+def test_failed_effects_are_not_cached(nodes, cache, monkeypatch):
+    node_class = nodes["DJZSpeak_v2"]
+    broken = lambda *args, **kwargs: (_ for _ in ()).throw(MemoryError())
+    monkeypatch.setattr(sys.modules[node_class.__module__], "effect_plan", broken)
+    dry = _waveform(node_class().synthesize(CHECK_TEXT, "hal9000", 120, 30, True))
+    monkeypatch.undo()
+    wet = _waveform(node_class().synthesize(CHECK_TEXT, "hal9000", 120, 30, True))
+    assert not np.array_equal(dry, wet)
@@ -0,0 +1,158 @@
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from djz_speak.djz_governor import SynthesisGovernor
+from djz_speak.djz_scheduler import SJFScheduler
+from djz_speak.djz_splice import splice_wav
+from djz_speak.djz_text import chunk_text
+from djz_speak.djz_wav import decode_wav, encode_wav
+
+
+class Clock:
+    """Manually advanced stand-in for ``time.monotonic``."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for the scheduler"
+        time.sleep(0.001)
+
+
+class Waiters:
+    """Jobs that queue on a busy scheduler one at a time and record the order they are admitted in."""
+
+    def __init__(self, scheduler: SJFScheduler, clock: Clock):
+        self.scheduler = scheduler
+        self.clock = clock
+        self.admitted = []
+        self.threads = []
+
+    def add(self, name: str, cost: float, at: float):
+        self.clock.now = at
+        depth = self.scheduler.metrics()["queue_depth"]
+        thread = threading.Thread(target=lambda: self.scheduler.acquire(cost, timeout=5.0) and self.admitted.append(name))
+        thread.start()
+        self.threads.append(thread)
+        _wait_for(lambda: self.scheduler.metrics()["queue_depth"] == depth + 1)
+
+    def drain(self):
+        for count in range(1, len(self.threads) + 1):
+            self.scheduler.release()
+            _wait_for(lambda: len(self.admitted) == count)
+        for thread in self.threads:
+            thread.join()
+        return self.admitted
+
+
+def test_cheapest_job_goes_first():
+    clock = Clock()
+    scheduler = SJFScheduler(1, aging_rate=0.25, clock=clock)
+    assert scheduler.acquire(1.0)
+    waiters = Waiters(scheduler, clock)
+    for name, cost in (("long", 5.0), ("short", 1.0), ("medium", 3.0)):
+        waiters.add(name, cost, at=0.0)
+    assert waiters.drain() == ["short", "medium", "long"]
+
+
+def test_aging_lets_an_old_long_job_overtake():
+    clock = Clock()
+    scheduler = SJFScheduler(1, aging_rate=0.25, clock=clock)
+    assert scheduler.acquire(1.0)
+    waiters = Waiters(scheduler, clock)
+    waiters.add("narration", 10.0, at=0.0)
+    # 100 s later the narration has earned 25 s of credit, more than the cost gap
+    waiters.add("alert", 1.0, at=100.0)
+    assert waiters.drain() == ["narration", "alert"]
+
+
+def test_timed_out_waiter_leaves_the_queue():
+    scheduler = SJFScheduler(1)
+    assert scheduler.acquire(1.0)
+    assert not scheduler.acquire(1.0, timeout=0.01)
+    metrics = scheduler.metrics()
+    assert metrics["queue_depth"] == 0 and metrics["timed_out"] == 1
+    scheduler.release()
+    assert scheduler.metrics()["running"] == 0
+    assert scheduler.acquire(1.0, timeout=0.01)
+
+
+def test_released_slot_passes_to_the_next_waiter():
+    clock = Clock()
+    scheduler = SJFScheduler(1, clock=clock)
+    assert scheduler.acquire(1.0)
+    waiters = Waiters(scheduler, clock)
+    waiters.add("next", 1.0, at=0.0)
+    assert waiters.drain() == ["next"]
+    # The slot went straight to the waiter instead of back to the free pool
+    assert scheduler.metrics()["running"] == 1
+    assert not scheduler.acquire(1.0, timeout=0.01)
+
+
+def _tone(seconds: float) -> bytes:
+    return encode_wav(np.sin(np.arange(int(22050 * seconds)) * 0.1).astype(np.float32) * 0.5, 22050)
+
+
+TEXT = " ".join(f"Sentence {i} of the narration, with a clause." for i in range(12))
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_long_text_runs_as_punctuation_chunks(monkeypatch, parallel):
+    governor = SynthesisGovernor(max_concurrent=2, chunk_chars=100, parallel_chunks=parallel)
+    seen = []
+    monkeypatch.setattr(governor, "_run_chunk", lambda cmd, text, cost: seen.append(text) or (_tone(0.2), False))
+    wav, partial = governor.run_espeak(["espeak-ng"], TEXT)
+    assert not partial and len(seen) > 1
+    assert all(len(text) <= 100 and text[-1] in ".," for text in seen)
+    assert " ".join(sorted(seen, key=TEXT.index)) == TEXT
+    assert np.array_equal(decode_wav(wav), decode_wav(splice_wav([_tone(0.2)] * len(seen))))
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_audio_stops_at_the_first_partial_chunk(monkeypatch, parallel):
+    governor = SynthesisGovernor(max_concurrent=2, chunk_chars=100, parallel_chunks=parallel)
+    chunks, calls = chunk_text(TEXT, 100), []
+
+    def run_chunk(cmd, text, cost):
+        calls.append(text)
+        return _tone(0.2), text == chunks[1]  # the second chunk hits its deadline
+
+    monkeypatch.setattr(governor, "_run_chunk", run_chunk)
+    wav, partial = governor.run_espeak(["espeak-ng"], TEXT)
+    assert partial
+    assert np.array_equal(decode_wav(wav), decode_wav(splice_wav([_tone(0.2)] * 2)))
+    if not parallel:
+        assert len(calls) == 2  # nothing after the cut is rendered
+
+
+def test_text_limit_cuts_at_a_word_in_partial_mode(monkeypatch):
+    strict = SynthesisGovernor(max_chars=30)
+    with pytest.raises(ValueError):
+        strict.run_espeak(["espeak-ng"], TEXT)
+
+    lenient = SynthesisGovernor(max_chars=30, partial_results=True)
+    seen = []
+    monkeypatch.setattr(lenient, "_run_chunk", lambda cmd, text, cost: seen.append(text) or (_tone(0.1), False))
+    _, partial = lenient.run_espeak(["espeak-ng"], TEXT)
+    assert partial and seen == [TEXT[:TEXT.rfind(" ", 0, 30)]]
+
+
+def test_deadline_returns_audio_so_far_in_partial_mode():
+    # Stands in for eSpeak-NG: writes a header's worth of output and then hangs
+    hang = [sys.executable, "-c", "import sys, time; sys.stdout.buffer.write(b'R' * 100); sys.stdout.flush(); time.sleep(30)"]
+    options = dict(base_timeout=0.5, seconds_per_char=0.0, memory_limit_mb=0)
+    stdout, partial = SynthesisGovernor(partial_results=True, **options).run_espeak(hang, "hello")
+    assert partial and stdout == b'R' * 100
+    with pytest.raises(subprocess.TimeoutExpired):
+        SynthesisGovernor(**options).run_espeak(hang, "hello")
@@ -0,0 +1,38 @@
+import asyncio
+import time
+
+import pytest
+
+from djz_speak.djz_server import SynthesisService
+
+
+@pytest.fixture
+def service(nodes):
+    service = SynthesisService(nodes, workers=2)
+    yield service
+    service.executor.shutdown()
+
+
+@pytest.mark.parametrize("payload", [[1], "text", None])
+def test_non_object_body_is_a_client_error(service, payload):
+    with pytest.raises(ValueError):
+        asyncio.run(service.synthesize(payload))
+
+
+def test_missing_inputs_are_a_client_error(service):
+    with pytest.raises(ValueError, match="Missing inputs"):
+        asyncio.run(service.synthesize({"node": "v1", "text": "Hello"}))
+
+
+def test_identical_requests_are_coalesced(service, cache, monkeypatch):
+    render = service._render
+    # Slow enough that every duplicate arrives while the first render is still in flight
+    monkeypatch.setattr(service, "_render", lambda *args: time.sleep(0.2) or render(*args))
+    payload = {"node": "v1", "text": "Coalesce me.", "voice": "hal9000", "speed": 120, "pitch": 30}
+
+    async def burst():
+        return await asyncio.gather(*(service.synthesize(dict(payload)) for _ in range(4)))
+
+    results = asyncio.run(burst())
+    assert service.requests == 4 and service.coalesced == 3
+    assert all((audio == results[0][0]).all() for audio, _ in results)
@@ -0,0 +1,33 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from djz_speak.djz_engine import FakeEngine
+from djz_speak.djz_selfcheck import CHECK_TEXT
+from djz_speak.djz_splice import MAX_MATCH_DB, SEARCH_MS, splice_wav
+from djz_speak.djz_text import chunk_text
+from djz_speak.djz_wav import decode_wav
+
+TEXT = " ".join(f"Station {i} reports nominal readings, all decks sealed; {CHECK_TEXT}" for i in range(8))
+
+
+def test_chunks_end_at_punctuation():
+    chunks = chunk_text(TEXT, 160)
+    assert len(chunks) > 1 and all(chunk[-1] in ".,;:!?" for chunk in chunks)
+
+
+def test_spliced_chunks_are_continuous(nodes):
+    engine = FakeEngine()
+    settings = nodes["DJZSpeak_v1"]._voice_settings("hal9000", 120, 30)
+    chunks = chunk_text(TEXT, 160)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        buffers = [wav for wav, _ in pool.map(lambda chunk: engine.render(settings, chunk), chunks)]
+    pieces = [decode_wav(buffer) for buffer in buffers]
+    spliced = decode_wav(splice_wav(buffers))
+    assert np.array_equal(spliced, decode_wav(splice_wav([engine.render(settings, chunk)[0] for chunk in chunks])))
+
+    # Trims stay inside the search window and no join steps harder than the chunks themselves
+    slack = len(chunks) * 2 * int(engine.sample_rate * SEARCH_MS / 1000.0)
+    assert abs(len(spliced) - sum(len(piece) for piece in pieces)) <= slack
+    inner = max(float(np.max(np.abs(np.diff(piece)))) for piece in pieces) * 10.0 ** (MAX_MATCH_DB / 20.0)
+    assert float(np.max(np.abs(np.diff(spliced)))) <= inner + 2.0 / 32768.0
@@ -0,0 +1,39 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from djz_speak.djz_store import AudioStore
+
+KEYS = [hashlib.sha256(f"entry {i}".encode()).hexdigest() for i in range(64)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = AudioStore(tmp_path, max_bytes=2 * 1024 ** 2, segment_bytes=256 * 1024, compact_min_bytes=128 * 1024)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda i: store.put(KEYS[i], np.full(16384, i, dtype=np.float32)), range(len(KEYS))))
+    if store._compactor is not None:
+        store._compactor.join()
+    return store
+
+
+def test_store_stays_within_bound(store):
+    assert store.stats()["live_bytes"] <= store.max_bytes
+
+
+def test_second_handle_sees_same_entries(store, tmp_path):
+    reader = AudioStore(tmp_path)
+    present = [i for i, key in enumerate(KEYS) if reader.get(key) is not None]
+    assert present and all(reader.get(KEYS[i])[0] == i for i in present)
+    assert len(present) == store.stats()["entries"]
+
+
+def test_corrupt_record_is_not_served(store, tmp_path):
+    victim = next(key for key in reversed(KEYS) if store.get(key) is not None)
+    entry = store._index[bytes.fromhex(victim)]
+    with open(store._segment_path(entry.segment), 'r+b') as f:
+        f.seek(entry.offset + 16)
+        f.write(b'\xff' * 8)
+    assert AudioStore(tmp_path).get(victim) is None
@@ -0,0 +1,47 @@
+import pytest
+
+from djz_speak.djz_text import chunk_text, normalize_text
+
+
+@pytest.mark.parametrize("text, spoken", [
+    # Digits inside words are left for eSpeak-NG
+    ("R2D2 and C3PO", "R2D2 and C3PO"),
+    ("MP3", "MP3"),
+    ("3D", "3D"),
+    ("B52", "B52"),
+    # Decades and signs
+    ("the 1990s", "the nineteen nineties"),
+    ("the 80s", "the eighties"),
+    ("the '60s", "the sixties"),
+    ("-5 degrees", "minus five degrees"),
+    ("−3 volts", "minus three volts"),
+    ("pages 5-10", "pages five-ten"),
+    # Dates and years
+    ("2024-02-30", "two zero two four zero two three zero"),
+    ("2024-02-29", "February twenty-ninth, twenty twenty-four"),
+    ("Built in 1984.", "Built in nineteen eighty-four."),
+    ("2048 bytes", "two thousand forty-eight bytes"),
+    ("March 3, 1999", "March three, nineteen ninety-nine"),
+    # Abbreviations
+    ("No. I will not.", "No. I will not."),
+    ("Room No. 5", "Room number five"),
+    ("Wait 5 min. Then go.", "Wait five minutes. Then go."),
+    ("Tools, parts, etc. Then more.", "Tools, parts, et cetera. Then more."),
+    ("Dr. Chandra", "Doctor Chandra"),
+    # Dotted runs and decimals
+    ("Version 1.2.3", "Version 1.2.3"),
+    ("3.14 volts", "three point one four volts"),
+])
+def test_default_rules(text, spoken):
+    assert normalize_text(text) == spoken
+
+
+def test_preset_rules_run_first():
+    assert normalize_text("T minus 10, R2D2", ["digits_individual"]) == "T minus one zero, R2D2"
+
+
+def test_chunks_never_split_inside_a_clause():
+    text = "First sentence here. " + "A very long clause without any breaks at all " * 3 + "ends, then more."
+    chunks = chunk_text(text, 40)
+    assert " ".join(chunks) == text.strip()
+    assert all(chunk[-1] in ".,;:!?" for chunk in chunks)